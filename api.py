@@ -0,0 +1,232 @@
+# api.py - 읽기 전용 JSON API (ASGI)
+"""
+관객용 조회를 Streamlit 세션 없이 처리하는 경량 ASGI 앱.
+모바일 앱이나 공연장 QR 페이지가 웹소켓 세션·스크립트 실행 없이 같은 데이터를 읽는다.
+
+    uvicorn api:app --host 0.0.0.0 --port 8000 --workers 4
+
+    GET /api/concerts?sort=date_desc&limit=20&after_value=...&after_id=...
+    GET /api/concerts/<concert_id>          공연 + 곡 + 곡별 AI 설명
+    GET /api/search?q=...&page=1            AI 설명 전문 검색
+
+데이터는 Streamlit 페이지와 같은 utils.concerts / utils.search 와 공용 캐시를 거친다.
+목록·상세 응답은 직렬화된 본문과 ETag(본문 해시)·Last-Modified 를 공연 캐시 키 아래에
+함께 저장하므로, 관리자 저장 시 invalidate_concert() 등으로 함께 갱신되고
+If-None-Match / If-Modified-Since 요청에는 본문 없이 304 로 응답한다.
+anon 키로 조회하므로 노출 범위는 Supabase REST 와 같다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import parse_qs
+from utils.cache import cached
+from utils.concerts import (
+    LIST_TTL, DETAIL_TTL, CONCERT_PAGE_SIZE,
+    list_concerts_page, is_concert_id,
+)
+from utils.repository import get_concert_with_tracks, get_descriptions_by_track
+from utils.search import CONCERT_SORTS, DEFAULT_PAGE_SIZE, search_descriptions
+from utils.warmup import warm_cache
+
+logger = logging.getLogger(__name__)
+
+# 목록 API 의 페이지 크기 상한
+MAX_PAGE_SIZE = 100
+
+# 클라이언트는 매번 조건부 요청으로 재검증한다 (변경 없으면 304)
+CACHE_CONTROL = "public, no-cache"
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _representation(payload) -> dict:
+    """응답 본문과 검증자(ETag, Last-Modified). 캐시에 그대로 저장된다."""
+    body = json.dumps(payload, ensure_ascii=False, default=str, separators=(",", ":"))
+    return {
+        "body": body,
+        "etag": f'"{hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]}"',
+        "last_modified": formatdate(time.time(), usegmt=True),
+    }
+
+def _query_value(query: dict, name: str, default: str | None = None) -> str | None:
+    values = query.get(name)
+    return values[0] if values else default
+
+def _query_int(query: dict, name: str, default: int, low: int, high: int) -> int:
+    raw = _query_value(query, name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise HTTPError(400, f"{name} 는 정수여야 합니다.")
+    if not low <= value <= high:
+        raise HTTPError(400, f"{name} 는 {low}~{high} 사이여야 합니다.")
+    return value
+
+# ──────────────────────────
+# 엔드포인트
+# ──────────────────────────
+def concert_list(query: dict) -> dict:
+    sort = _query_value(query, "sort", "date_desc")
+    if sort not in CONCERT_SORTS:
+        raise HTTPError(400, f"sort 는 {', '.join(CONCERT_SORTS)} 중 하나여야 합니다.")
+    limit = _query_int(query, "limit", CONCERT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+    after_value = _query_value(query, "after_value")
+    after_id = _query_value(query, "after_id")
+    if after_id and not is_concert_id(after_id):
+        raise HTTPError(400, "after_id 가 올바르지 않습니다.")
+    # 정렬 값이 비어 있는 공연(NULL)에서 끊긴 커서는 after_value 가 "" 이다
+    cursor = (after_value or "", after_id) if after_id else None
+
+    def build():
+        rows, next_cursor = list_concerts_page(sort, cursor, limit)
+        return _representation({
+            "concerts": rows,
+            "next_cursor": (
+                {"after_value": next_cursor[0], "after_id": next_cursor[1]}
+                if next_cursor else None
+            ),
+        })
+
+    # "concerts" 하위 키이므로 공연 추가·삭제 시 함께 무효화된다
+    return cached(
+        f"concerts:api:{sort}:{after_value}:{after_id}:{limit}",
+        build,
+        ttl=LIST_TTL,
+        swr=True,
+    )
+
+def concert_detail(concert_id: str) -> dict:
+    # 형식이 틀린 id 는 백엔드마다 오류가 달라지므로(Supabase 22P02, Postgres DataError 등)
+    # 캐시·백엔드에 닿기 전에 404 로 끝낸다
+    if not is_concert_id(concert_id):
+        raise HTTPError(404, "공연을 찾을 수 없습니다.")
+
+    def build():
+        concert, tracks = get_concert_with_tracks(concert_id)
+        if not concert:
+            raise HTTPError(404, "공연을 찾을 수 없습니다.")
+        descriptions = get_descriptions_by_track(concert_id, [t["id"] for t in tracks])
+        tracks = [{**track, "descriptions": descriptions[track["id"]]} for track in tracks]
+        return _representation({"concert": concert, "tracks": tracks})
+
+    # 곡·설명 변경 시 invalidate_track / invalidate_descriptions 가 지우는 키들과 같은 공연 키 아래
+    return cached(f"concert:{concert_id}:api", build, ttl=DETAIL_TTL, swr=True)
+
+def description_search(query: dict) -> dict:
+    search_term = (_query_value(query, "q") or "").strip()
+    if not search_term:
+        raise HTTPError(400, "q 를 입력하세요.")
+    page = _query_int(query, "page", 1, 1, 1000)
+    page_size = _query_int(query, "page_size", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+
+    # 검색은 캐시하지 않으므로 본문 해시로만 검증한다
+    hits, total = search_descriptions(search_term, page, page_size)
+    representation = _representation({"hits": hits, "total": total, "page": page})
+    representation.pop("last_modified")
+    return representation
+
+def route(path: str, query: dict) -> dict:
+    parts = [p for p in path.split("/") if p]
+    if parts == ["api", "concerts"]:
+        return concert_list(query)
+    if len(parts) == 3 and parts[:2] == ["api", "concerts"]:
+        return concert_detail(parts[2])
+    if parts == ["api", "search"]:
+        return description_search(query)
+    raise HTTPError(404, "없는 경로입니다.")
+
+# ──────────────────────────
+# ASGI
+# ──────────────────────────
+def _not_modified(headers: dict, representation: dict) -> bool:
+    """RFC 9110 조건부 GET. If-None-Match 가 있으면 If-Modified-Since 는 무시한다."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # 약한 비교: W/ 접두어를 무시
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return representation["etag"] in tags
+
+    if_modified_since = headers.get("if-modified-since")
+    last_modified = representation.get("last_modified")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+async def _send(send, status: int, headers: dict, body: bytes = b"") -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            # 첫 요청들이 빈 캐시를 만나지 않도록 백그라운드에서 데운다
+            threading.Thread(target=warm_cache, name="cache-warmup", daemon=True).start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    method = scope["method"]
+    base_headers = {
+        "content-type": "application/json; charset=utf-8",
+        "access-control-allow-origin": "*",
+    }
+    if method not in ("GET", "HEAD"):
+        body = json.dumps({"error": "GET 만 지원합니다."}, ensure_ascii=False).encode("utf-8")
+        await _send(send, 405, {**base_headers, "allow": "GET, HEAD"}, body)
+        return
+
+    request_headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+    query = parse_qs(scope.get("query_string", b"").decode("utf-8"))
+
+    try:
+        # 조회는 동기 코드이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        representation = await asyncio.to_thread(route, scope["path"], query)
+    except HTTPError as e:
+        body = json.dumps({"error": e.message}, ensure_ascii=False).encode("utf-8")
+        await _send(send, e.status, base_headers, b"" if method == "HEAD" else body)
+        return
+    except Exception as e:
+        logger.error(f"API 조회 실패 - {scope['path']}: {str(e)}")
+        body = json.dumps({"error": "일시적으로 데이터를 불러올 수 없습니다."}, ensure_ascii=False).encode("utf-8")
+        await _send(send, 503, base_headers, b"" if method == "HEAD" else body)
+        return
+
+    headers = {**base_headers, "etag": representation["etag"], "cache-control": CACHE_CONTROL}
+    if representation.get("last_modified"):
+        headers["last-modified"] = representation["last_modified"]
+
+    if _not_modified(request_headers, representation):
+        del headers["content-type"]
+        await _send(send, 304, headers)
+        return
+
+    body = representation["body"].encode("utf-8")
+    headers["content-length"] = str(len(body))
+    await _send(send, 200, headers, b"" if method == "HEAD" else body)
@@ -3,8 +3,12 @@
 import streamlit as st
 st.set_page_config(page_title="클래식 곡 설명 생성기", layout="wide")
 
-from utils.supabase_client import get_sb_client
 from utils.auth import get_current_user, get_role
+from utils.concerts import get_paged_concerts, load_more_concerts
+from utils.warmup import start_warmup
+
+# 프로세스 첫 요청 시 캐시 워밍업 (최대 WARMUP_BUDGET_SECONDS 까지만 대기)
+start_warmup()
 
 # CSS 스타일 로드
 try:
@@ -13,8 +17,6 @@ try:
 except FileNotFoundError:
     st.warning("CSS 파일을 찾을 수 없습니다. static/classical_styles.css 파일을 생성해주세요.")
 
-sb = get_sb_client()
-
 # ──────────────────────────
 # 1) 로그인‧권한 확인
 # ──────────────────────────
@@ -109,13 +111,9 @@ st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
 # ──────────────────────────
 # 3) 공연 목록 (전체 공개)
 # ──────────────────────────
-concerts = (
-    sb.table("concerts")
-      .select("id,title,venue,date")
-      .order("date", desc=False)
-      .execute()
-      .data
-)
+# 키셋 페이지네이션: 첫 화면은 첫 페이지만, "더 보기"로 다음 페이지를 이어 붙임
+concert_pages = get_paged_concerts("home", sort="date_asc")
+concerts = concert_pages["rows"]
 
 st.markdown(
     """
@@ -179,6 +177,14 @@ else:
                         st.query_params["concert_id"] = concert["id"]
                         st.switch_page("pages/concert_view.py")
 
+    # 다음 페이지 이어 붙이기
+    if concert_pages["cursor"] is not None:
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col2:
+            if st.button("⬇️ 공연 더 보기", key="home_more", use_container_width=True):
+                load_more_concerts("home")
+                st.rerun()
+
 st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
 
 # ──────────────────────────
@@ -0,0 +1,39 @@
+-- 000_base_schema.sql
+-- 기본 테이블 (Supabase 대시보드에서 처음 만든 형태)
+--
+-- 이후 마이그레이션이 이 위에 컬럼·제약·함수를 더한다:
+--   001 설명 전문 검색, 002 공연 키셋 페이지, 003 ON DELETE CASCADE,
+--   004 템플릿 버전, 005 설명 본문 분리, 006 조회·검색 색인,
+--   007 키셋 NULL 정렬, 008 설명 검색어·정렬 보정, 009 설명 검색 결과 id.
+-- 이미 테이블이 있는 DB 에서는 아무것도 바꾸지 않는다.
+-- 외래 키 이름(<테이블>_<컬럼>_fkey)은 003 이 그대로 찾아 교체한다.
+
+create table if not exists concerts (
+    id          uuid primary key default gen_random_uuid(),
+    title       text not null,
+    venue       text,
+    date        text,
+    description text,
+    created_by  uuid,
+    created_at  timestamptz default now()
+);
+
+create table if not exists concert_tracks (
+    id          uuid primary key default gen_random_uuid(),
+    concert_id  uuid references concerts(id),
+    track_title text,
+    composer    text
+);
+
+create table if not exists track_descriptions (
+    id          uuid primary key default gen_random_uuid(),
+    track_id    uuid references concert_tracks(id),
+    prompt_type text,
+    description text
+);
+
+create table if not exists prompt_templates (
+    id       uuid primary key default gen_random_uuid(),
+    name     text,
+    template text
+);
@@ -0,0 +1,95 @@
+-- 001_description_search.sql
+-- track_descriptions.description 전문 검색 (분위기 단어 검색용)
+--
+-- search_vector 는 STORED 생성 컬럼이므로 설명이 INSERT 되거나
+-- 재생성(UPDATE)될 때 해당 행만 자동으로 다시 색인된다.
+
+alter table track_descriptions
+    add column if not exists search_vector tsvector
+    generated always as (to_tsvector('simple', coalesce(description, ''))) stored;
+
+create index if not exists track_descriptions_search_idx
+    on track_descriptions using gin (search_vector);
+
+-- 검색어를 접두사 tsquery 로 변환 ("잔잔한 선율" → '잔잔한':* & '선율':*)
+-- 한국어는 조사가 붙어 색인되는 경우가 많아 접두사 일치를 사용한다.
+create or replace function description_tsquery(q text)
+returns tsquery
+language sql
+immutable
+as $$
+    select to_tsquery(
+        'simple',
+        coalesce(
+            string_agg(quote_literal(word) || ':*', ' & '),
+            ''
+        )
+    )
+    from regexp_split_to_table(trim(coalesce(q, '')), '\s+') as word
+    where word <> ''
+$$;
+
+-- (공연, 곡, 발췌문) 검색 결과를 관련도순으로 페이지 단위 반환
+create or replace function search_track_descriptions(
+    q text,
+    page_limit integer default 10,
+    page_offset integer default 0
+)
+returns table (
+    concert_id    uuid,
+    concert_title text,
+    concert_date  text,
+    track_id      uuid,
+    track_title   text,
+    composer      text,
+    prompt_type   text,
+    snippet       text,
+    rank          real,
+    total_count   bigint
+)
+language sql
+stable
+as $$
+    with query as (
+        select description_tsquery(q) as tsq
+    ),
+    page as (
+        select
+            c.id          as concert_id,
+            c.title       as concert_title,
+            c.date        as concert_date,
+            t.id          as track_id,
+            t.track_title,
+            t.composer,
+            d.prompt_type,
+            d.description,
+            ts_rank(d.search_vector, query.tsq) as rank,
+            count(*) over () as total_count
+        from track_descriptions d
+        cross join query
+        join concert_tracks t on t.id = d.track_id
+        join concerts c on c.id = t.concert_id
+        where d.search_vector @@ query.tsq
+        order by rank desc, c.date desc, t.id
+        limit greatest(page_limit, 1)
+        offset greatest(page_offset, 0)
+    )
+    -- 발췌문(ts_headline)은 비용이 크므로 현재 페이지 행에만 계산한다
+    select
+        p.concert_id,
+        p.concert_title,
+        p.concert_date,
+        p.track_id,
+        p.track_title,
+        p.composer,
+        p.prompt_type,
+        ts_headline(
+            'simple', p.description, query.tsq,
+            'StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8, MaxFragments=1'
+        ),
+        p.rank,
+        p.total_count
+    from page p
+    cross join query
+    order by p.rank desc, p.concert_date desc, p.track_id
+$$;
@@ -0,0 +1,41 @@
+-- 002_concert_keyset.sql
+-- 공연 목록 키셋(커서) 페이지네이션
+--
+-- (정렬 컬럼, id) 행 비교로 다음 페이지를 찾으므로 OFFSET 처럼 앞 페이지를
+-- 다시 읽지 않는다. postgrest-py 에는 or 필터가 없어 RPC 로 제공한다.
+
+create or replace function list_concerts_page(
+    sort_column text default 'date',
+    descending  boolean default true,
+    after_value text default null,
+    after_id    uuid default null,
+    page_limit  integer default 20
+)
+returns table (
+    id          uuid,
+    title       text,
+    venue       text,
+    date        text,
+    description text
+)
+language plpgsql
+stable
+as $$
+begin
+    if sort_column not in ('date', 'title', 'venue') then
+        raise exception 'unsupported sort column: %', sort_column;
+    end if;
+
+    return query execute format(
+        'select c.id, c.title, c.venue, c.date, c.description
+           from concerts c
+          where $1 is null or (c.%1$I, c.id) %2$s ($1, $2)
+          order by c.%1$I %3$s, c.id %3$s
+          limit $3',
+        sort_column,
+        case when descending then '<' else '>' end,
+        case when descending then 'desc' else 'asc' end
+    )
+    using after_value, after_id, greatest(page_limit, 1);
+end;
+$$;
@@ -0,0 +1,42 @@
+-- 003_cascade_delete.sql
+-- 공연 삭제를 서버에서 한 번에 (곡·설명까지 연쇄 삭제)
+--
+-- 외래 키에 ON DELETE CASCADE 를 걸어 concerts 행만 지우면 곡과 설명이
+-- 같은 트랜잭션에서 함께 지워지게 하고, 여러 공연을 한 번의 RPC 로 지운다.
+
+alter table concert_tracks
+    drop constraint if exists concert_tracks_concert_id_fkey,
+    add constraint concert_tracks_concert_id_fkey
+        foreign key (concert_id) references concerts(id) on delete cascade;
+
+alter table track_descriptions
+    drop constraint if exists track_descriptions_track_id_fkey,
+    add constraint track_descriptions_track_id_fkey
+        foreign key (track_id) references concert_tracks(id) on delete cascade;
+
+-- 연쇄 삭제 시 자식 행을 순차 탐색하지 않도록
+create index if not exists concert_tracks_concert_id_idx on concert_tracks (concert_id);
+create index if not exists track_descriptions_track_id_idx on track_descriptions (track_id);
+
+-- 공연 여러 개를 한 트랜잭션에서 삭제하고 삭제된 공연 수를 반환
+create or replace function delete_concerts(concert_ids uuid[])
+returns integer
+language sql
+volatile
+as $$
+    with deleted as (
+        delete from concerts where id = any(concert_ids) returning 1
+    )
+    select count(*)::integer from deleted
+$$;
+
+-- 관리자(service 키)만 호출
+revoke execute on function delete_concerts(uuid[]) from public;
+do $$
+begin
+    if exists (select 1 from pg_roles where rolname = 'anon') then
+        revoke execute on function delete_concerts(uuid[]) from anon, authenticated;
+        grant execute on function delete_concerts(uuid[]) to service_role;
+    end if;
+end;
+$$;
@@ -0,0 +1,58 @@
+-- 004_template_versions.sql
+-- 프롬프트 템플릿 저장을 차이 기반 upsert 로 (한 트랜잭션, id 유지)
+--
+-- 템플릿은 이름으로 식별하고 id 는 바뀌지 않는다. 내용이 바뀔 때만 version 이
+-- 올라가며, 설명(track_descriptions)은 생성에 쓴 템플릿 id·version 을 기록한다.
+
+-- 이름 중복 정리 후 이름을 유일 키로. prompt_templates 에는 생성 시각 컬럼이 없어
+-- 만들어진 순서를 알 수 없으므로, 이름마다 물리 위치(ctid)가 가장 앞인 임의의 한 행만 남긴다.
+delete from prompt_templates p
+ using prompt_templates q
+ where p.name = q.name
+   and p.ctid > q.ctid;
+
+create unique index if not exists prompt_templates_name_key on prompt_templates (name);
+
+alter table prompt_templates
+    add column if not exists version    integer not null default 1,
+    add column if not exists updated_at timestamptz not null default now();
+
+alter table track_descriptions
+    add column if not exists template_id      uuid references prompt_templates(id) on delete set null,
+    add column if not exists template_version integer;
+
+-- templates: [{"name": ..., "template": ...}, ...] 를 현재 템플릿 전체로 만든다.
+-- 목록에 없는 이름은 삭제하고, 새 이름은 추가하고, 내용이 바뀐 템플릿만 version 을 올린다.
+-- 함수 호출 하나가 한 트랜잭션이므로 템플릿이 비어 있는 순간이 없다. 바뀐 행을 반환.
+create or replace function save_prompt_templates(templates jsonb)
+returns setof prompt_templates
+language plpgsql
+volatile
+as $$
+begin
+    delete from prompt_templates
+     where name not in (select t->>'name' from jsonb_array_elements(templates) t);
+
+    return query
+    insert into prompt_templates as p (name, template)
+    select t->>'name', t->>'template'
+      from jsonb_array_elements(templates) t
+    on conflict (name) do update
+       set template   = excluded.template,
+           version    = p.version + 1,
+           updated_at = now()
+     where p.template is distinct from excluded.template
+    returning p.*;
+end;
+$$;
+
+-- 관리자(service 키)만 호출
+revoke execute on function save_prompt_templates(jsonb) from public;
+do $$
+begin
+    if exists (select 1 from pg_roles where rolname = 'anon') then
+        revoke execute on function save_prompt_templates(jsonb) from anon, authenticated;
+        grant execute on function save_prompt_templates(jsonb) to service_role;
+    end if;
+end;
+$$;
@@ -0,0 +1,192 @@
+-- 005_description_bodies.sql
+-- 설명 본문을 내용 주소(sha256) 테이블에 한 번만 저장
+--
+-- 같은 설명(특히 생성 실패 시의 기본 문구)이 곡마다 통째로 복사되던 것을
+-- description_bodies(hash, body) 한 행으로 모으고 track_descriptions 는 body_hash 로 가리킨다.
+-- 같은 본문을 다른 공연에서 다시 쓰면 행 하나의 해시만 추가된다.
+-- 설명이 삭제되어도 본문은 남겨 두어 같은 문구가 다시 생성되면 재사용한다.
+--
+-- 앱은 여전히 {"description": ...} 형태로 읽고 쓴다 (utils/data_backends.py 에서 조인·분리).
+
+-- 본문 해시: UTF-8 바이트의 sha256 hex (utils/data_backends.py description_hash 와 같은 값)
+create or replace function description_hash(body text)
+returns text
+language sql
+immutable
+strict
+as $$
+    select encode(sha256(convert_to(body, 'UTF8')), 'hex')
+$$;
+
+create table if not exists description_bodies (
+    hash          text primary key,
+    body          text not null,
+    search_vector tsvector generated always as (to_tsvector('simple', body)) stored,
+    created_at    timestamptz not null default now()
+);
+
+-- 전문 검색 색인은 서로 다른 본문마다 한 번만
+create index if not exists description_bodies_search_idx
+    on description_bodies using gin (search_vector);
+
+alter table track_descriptions
+    add column if not exists body_hash text references description_bodies(hash);
+
+create index if not exists track_descriptions_body_hash_idx on track_descriptions (body_hash);
+
+-- 기존 행 이전: 서로 다른 본문만 옮기고 해시로 연결한 뒤 본문 컬럼을 지운다.
+-- description 컬럼이 있을 때만 실행되므로 다시 실행해도 안전하다.
+do $$
+begin
+    if exists (
+        select 1 from information_schema.columns
+         where table_schema = current_schema()
+           and table_name = 'track_descriptions'
+           and column_name = 'description'
+    ) then
+        insert into description_bodies (hash, body)
+        select distinct description_hash(description), description
+          from track_descriptions
+         where description is not null
+        on conflict (hash) do nothing;
+
+        update track_descriptions
+           set body_hash = description_hash(description)
+         where body_hash is null
+           and description is not null;
+
+        drop index if exists track_descriptions_search_idx;
+        alter table track_descriptions
+            drop column if exists search_vector,
+            drop column description;
+    end if;
+end;
+$$;
+
+-- track_descriptions 에 RLS 가 켜져 있으면 본문도 같은 조건으로 읽을 수 있게 한다
+do $$
+begin
+    if (select relrowsecurity from pg_class where oid = 'track_descriptions'::regclass) then
+        alter table description_bodies enable row level security;
+        if not exists (
+            select 1 from pg_policies where tablename = 'description_bodies' and policyname = 'description_bodies_read'
+        ) then
+            create policy description_bodies_read on description_bodies for select using (true);
+        end if;
+    end if;
+end;
+$$;
+
+-- rows: [{"id"?, "track_id", "prompt_type", "description", "template_id"?, "template_version"?}, ...]
+-- 본문을 (없으면) 저장하고 설명 행을 해시로 연결해 넣는다. 한 트랜잭션.
+-- 이미 있는 id 는 건너뛰므로 백업 복원에도 쓴다. 새로 들어간 설명 수를 반환.
+create or replace function insert_track_descriptions(rows jsonb)
+returns integer
+language plpgsql
+volatile
+as $$
+declare
+    inserted integer;
+begin
+    insert into description_bodies (hash, body)
+    select distinct description_hash(r->>'description'), r->>'description'
+      from jsonb_array_elements(rows) r
+     where r->>'description' is not null
+    on conflict (hash) do nothing;
+
+    insert into track_descriptions (id, track_id, prompt_type, body_hash, template_id, template_version)
+    select coalesce((r->>'id')::uuid, gen_random_uuid()),
+           (r->>'track_id')::uuid,
+           r->>'prompt_type',
+           description_hash(r->>'description'),
+           (r->>'template_id')::uuid,
+           (r->>'template_version')::integer
+      from jsonb_array_elements(rows) r
+    on conflict (id) do nothing;
+
+    get diagnostics inserted = row_count;
+    return inserted;
+end;
+$$;
+
+-- 관리자(service 키)만 호출
+revoke execute on function insert_track_descriptions(jsonb) from public;
+do $$
+begin
+    if exists (select 1 from pg_roles where rolname = 'anon') then
+        revoke execute on function insert_track_descriptions(jsonb) from anon, authenticated;
+        grant execute on function insert_track_descriptions(jsonb) to service_role;
+    end if;
+end;
+$$;
+
+-- 전문 검색을 본문 테이블로: 일치하는 본문을 먼저 찾고 그 본문을 쓰는 설명으로 펼친다.
+-- 반환 형태는 001_description_search.sql 과 같다.
+create or replace function search_track_descriptions(
+    q text,
+    page_limit integer default 10,
+    page_offset integer default 0
+)
+returns table (
+    concert_id    uuid,
+    concert_title text,
+    concert_date  text,
+    track_id      uuid,
+    track_title   text,
+    composer      text,
+    prompt_type   text,
+    snippet       text,
+    rank          real,
+    total_count   bigint
+)
+language sql
+stable
+as $$
+    with query as (
+        select description_tsquery(q) as tsq
+    ),
+    matches as (
+        select b.hash, b.body, ts_rank(b.search_vector, query.tsq) as rank
+        from description_bodies b
+        cross join query
+        where b.search_vector @@ query.tsq
+    ),
+    page as (
+        select
+            c.id          as concert_id,
+            c.title       as concert_title,
+            c.date        as concert_date,
+            t.id          as track_id,
+            t.track_title,
+            t.composer,
+            d.prompt_type,
+            m.body,
+            m.rank,
+            count(*) over () as total_count
+        from matches m
+        join track_descriptions d on d.body_hash = m.hash
+        join concert_tracks t on t.id = d.track_id
+        join concerts c on c.id = t.concert_id
+        order by m.rank desc, c.date desc, t.id
+        limit greatest(page_limit, 1)
+        offset greatest(page_offset, 0)
+    )
+    -- 발췌문(ts_headline)은 비용이 크므로 현재 페이지 행에만 계산한다
+    select
+        p.concert_id,
+        p.concert_title,
+        p.concert_date,
+        p.track_id,
+        p.track_title,
+        p.composer,
+        p.prompt_type,
+        ts_headline(
+            'simple', p.body, query.tsq,
+            'StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8, MaxFragments=1'
+        ),
+        p.rank,
+        p.total_count
+    from page p
+    cross join query
+    order by p.rank desc, p.concert_date desc, p.track_id
+$$;
@@ -0,0 +1,45 @@
+-- 006_query_indexes.sql
+-- 앱이 보내는 조회마다 색인을 둔다 (utils/data_backends.py 기준)
+--
+--   곡 목록               concert_tracks.concert_id = ?          → 003 concert_tracks_concert_id_idx
+--   곡 설명               track_descriptions.track_id = ?        → 003 track_descriptions_track_id_idx
+--   설명 본문 조인        track_descriptions.body_hash           → 005 track_descriptions_body_hash_idx
+--   설명 전문 검색        description_bodies.search_vector @@ ?  → 005 description_bodies_search_idx
+--   템플릿 이름 upsert    prompt_templates.name                  → 004 prompt_templates_name_key
+--   공연 목록·키셋·검색   order by date | title | venue, id       → 아래 (정렬 컬럼, id)
+--   관리 화면 공연 목록   order by created_at desc, id            → 아래
+--   다가오는 공연         date >= ? order by date                 → 아래 (date, id)
+--   부분 일치 검색        title | venue | description | composer ilike '%x%' → 아래 pg_trgm GIN
+--   템플릿 삭제 시 SET NULL   track_descriptions.template_id      → 아래
+--
+-- pg_trgm 은 세 글자 단위로 색인하므로 두 글자 이하 검색어는 색인 대신 순차 검색이 될 수 있다.
+-- pg_trgm 이 없는 Postgres(contrib 미설치 로컬 서버 등)에서는 GIN 색인만 건너뛴다.
+
+-- 정렬 + 키셋 페이지 ((정렬 컬럼, id) 행 비교, 역방향 스캔으로 내림차순도 처리)
+create index if not exists concerts_date_id_idx  on concerts (date, id);
+create index if not exists concerts_title_id_idx on concerts (title, id);
+create index if not exists concerts_venue_id_idx on concerts (venue, id);
+create index if not exists concerts_created_at_id_idx on concerts (created_at desc, id);
+
+create index if not exists track_descriptions_template_id_idx on track_descriptions (template_id);
+
+-- ilike '%검색어%'
+do $$
+begin
+    if not exists (select 1 from pg_available_extensions where name = 'pg_trgm') then
+        raise notice 'pg_trgm 을 사용할 수 없어 부분 일치 검색 색인을 만들지 않습니다.';
+        return;
+    end if;
+
+    create extension if not exists pg_trgm;
+
+    create index if not exists concerts_title_trgm_idx
+        on concerts using gin (title gin_trgm_ops);
+    create index if not exists concerts_venue_trgm_idx
+        on concerts using gin (venue gin_trgm_ops);
+    create index if not exists concerts_description_trgm_idx
+        on concerts using gin (description gin_trgm_ops);
+    create index if not exists concert_tracks_composer_trgm_idx
+        on concert_tracks using gin (composer gin_trgm_ops);
+end;
+$$;
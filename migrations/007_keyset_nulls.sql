@@ -0,0 +1,48 @@
+-- 007_keyset_nulls.sql
+-- 공연 키셋 페이지에서 NULL 정렬 값 처리
+--
+-- venue·date 는 NULL 일 수 있다. 002 는 after_value 가 NULL 이면 첫 페이지로 보고,
+-- NULL 행은 행 비교로 넘어갈 수 없어 "더 보기" 가 첫 페이지를 반복했다.
+-- 정렬·비교 모두 coalesce(컬럼, '') 로 하고 첫 페이지 여부는 after_id 로만 판단한다
+-- (NULL 은 빈 문자열과 같은 자리, 오름차순 맨 앞 / 내림차순 맨 뒤).
+
+create or replace function list_concerts_page(
+    sort_column text default 'date',
+    descending  boolean default true,
+    after_value text default null,
+    after_id    uuid default null,
+    page_limit  integer default 20
+)
+returns table (
+    id          uuid,
+    title       text,
+    venue       text,
+    date        text,
+    description text
+)
+language plpgsql
+stable
+as $$
+begin
+    if sort_column not in ('date', 'title', 'venue') then
+        raise exception 'unsupported sort column: %', sort_column;
+    end if;
+
+    return query execute format(
+        'select c.id, c.title, c.venue, c.date, c.description
+           from concerts c
+          where $2 is null or (coalesce(c.%1$I, ''''), c.id) %2$s (coalesce($1, ''''), $2)
+          order by coalesce(c.%1$I, '''') %3$s, c.id %3$s
+          limit $3',
+        sort_column,
+        case when descending then '<' else '>' end,
+        case when descending then 'desc' else 'asc' end
+    )
+    using after_value, after_id, greatest(page_limit, 1);
+end;
+$$;
+
+-- 위 정렬·비교식 그대로의 색인 (006 의 (컬럼, id) 색인은 검색 정렬·날짜 범위용)
+create index if not exists concerts_date_keyset_idx  on concerts ((coalesce(date, '')), id);
+create index if not exists concerts_title_keyset_idx on concerts ((coalesce(title, '')), id);
+create index if not exists concerts_venue_keyset_idx on concerts ((coalesce(venue, '')), id);
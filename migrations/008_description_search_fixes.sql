@@ -0,0 +1,99 @@
+-- 008_description_search_fixes.sql
+-- 설명 검색: 특수 문자가 든 검색어 처리와 페이지 경계 정렬
+--
+-- 1) 001 의 description_tsquery 는 단어를 quote_literal 로 감싸는데, 역슬래시가 든 단어는
+--    E'…' 로 바뀌어 to_tsquery 가 해석하지 못하고 검색 RPC 가 오류를 냈다.
+--    따옴표·역슬래시와 tsquery 연산자 문자(& | ! ( ) : * < >)는 공백으로 바꿔 단어를 나누고
+--    빈 단어는 건너뛴다.
+--    ([[:alnum:]] 만 남기면 C 로캘 DB 에서 한글이 모두 지워지므로 제거할 문자를 명시한다.)
+-- 2) 005 의 search_track_descriptions 는 곡 id 에서 정렬이 끝나 한 곡의 설명 여러 개가
+--    같은 순위가 되면 OFFSET 페이지 사이에서 중복·누락될 수 있었다. 설명 id 를 마지막 기준으로 더한다.
+
+create or replace function description_tsquery(q text)
+returns tsquery
+language sql
+immutable
+as $$
+    select to_tsquery(
+        'simple',
+        coalesce(
+            string_agg(quote_literal(word) || ':*', ' & '),
+            ''
+        )
+    )
+    from regexp_split_to_table(
+        trim(regexp_replace(coalesce(q, ''), '[\\''&|!():*<>]', ' ', 'g')),
+        '\s+'
+    ) as word
+    where word <> ''
+$$;
+
+create or replace function search_track_descriptions(
+    q text,
+    page_limit integer default 10,
+    page_offset integer default 0
+)
+returns table (
+    concert_id    uuid,
+    concert_title text,
+    concert_date  text,
+    track_id      uuid,
+    track_title   text,
+    composer      text,
+    prompt_type   text,
+    snippet       text,
+    rank          real,
+    total_count   bigint
+)
+language sql
+stable
+as $$
+    with query as (
+        select description_tsquery(q) as tsq
+    ),
+    matches as (
+        select b.hash, b.body, ts_rank(b.search_vector, query.tsq) as rank
+        from description_bodies b
+        cross join query
+        where b.search_vector @@ query.tsq
+    ),
+    page as (
+        select
+            c.id          as concert_id,
+            c.title       as concert_title,
+            c.date        as concert_date,
+            t.id          as track_id,
+            t.track_title,
+            t.composer,
+            d.id          as description_id,
+            d.prompt_type,
+            m.body,
+            m.rank,
+            count(*) over () as total_count
+        from matches m
+        join track_descriptions d on d.body_hash = m.hash
+        join concert_tracks t on t.id = d.track_id
+        join concerts c on c.id = t.concert_id
+        order by m.rank desc, c.date desc, t.id, d.id
+        limit greatest(page_limit, 1)
+        offset greatest(page_offset, 0)
+    )
+    -- 발췌문(ts_headline)은 비용이 크므로 현재 페이지 행에만 계산한다
+    select
+        p.concert_id,
+        p.concert_title,
+        p.concert_date,
+        p.track_id,
+        p.track_title,
+        p.composer,
+        p.prompt_type,
+        ts_headline(
+            'simple', p.body, query.tsq,
+            'StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8, MaxFragments=1'
+        ),
+        p.rank,
+        p.total_count
+    from page p
+    cross join query
+    order by p.rank desc, p.concert_date desc, p.track_id, p.description_id
+$$;
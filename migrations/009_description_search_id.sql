@@ -0,0 +1,81 @@
+-- 009_description_search_id.sql
+-- 설명 검색 결과에 설명 id 포함
+--
+-- 한 곡에 같은 prompt_type 설명이 여럿이면 (곡 id, prompt_type) 이 겹쳐 화면에서 결과 행을
+-- 구분할 수 없었다 (Streamlit 버튼 key 중복). 결과에 description_id 를 더한다.
+-- 반환 형식이 바뀌므로 create or replace 대신 함수를 지우고 다시 만든다.
+-- 검색어 처리·정렬은 008 과 같다.
+
+drop function if exists search_track_descriptions(text, integer, integer);
+
+create function search_track_descriptions(
+    q text,
+    page_limit integer default 10,
+    page_offset integer default 0
+)
+returns table (
+    concert_id     uuid,
+    concert_title  text,
+    concert_date   text,
+    track_id       uuid,
+    track_title    text,
+    composer       text,
+    description_id uuid,
+    prompt_type    text,
+    snippet        text,
+    rank           real,
+    total_count    bigint
+)
+language sql
+stable
+as $$
+    with query as (
+        select description_tsquery(q) as tsq
+    ),
+    matches as (
+        select b.hash, b.body, ts_rank(b.search_vector, query.tsq) as rank
+        from description_bodies b
+        cross join query
+        where b.search_vector @@ query.tsq
+    ),
+    page as (
+        select
+            c.id          as concert_id,
+            c.title       as concert_title,
+            c.date        as concert_date,
+            t.id          as track_id,
+            t.track_title,
+            t.composer,
+            d.id          as description_id,
+            d.prompt_type,
+            m.body,
+            m.rank,
+            count(*) over () as total_count
+        from matches m
+        join track_descriptions d on d.body_hash = m.hash
+        join concert_tracks t on t.id = d.track_id
+        join concerts c on c.id = t.concert_id
+        order by m.rank desc, c.date desc, t.id, d.id
+        limit greatest(page_limit, 1)
+        offset greatest(page_offset, 0)
+    )
+    -- 발췌문(ts_headline)은 비용이 크므로 현재 페이지 행에만 계산한다
+    select
+        p.concert_id,
+        p.concert_title,
+        p.concert_date,
+        p.track_id,
+        p.track_title,
+        p.composer,
+        p.description_id,
+        p.prompt_type,
+        ts_headline(
+            'simple', p.body, query.tsq,
+            'StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8, MaxFragments=1'
+        ),
+        p.rank,
+        p.total_count
+    from page p
+    cross join query
+    order by p.rank desc, p.concert_date desc, p.track_id, p.description_id
+$$;
@@ -1,10 +1,13 @@
 import streamlit as st
-import uuid, os
+import uuid, os, io
 import logging
 from dotenv import load_dotenv
-from utils.supabase_client import get_sb_client
+from utils.data_backends import get_backend
 from utils.auth import require_login, sign_out
 from utils.ai import generate_classical_description, validate_api_key
+from utils.concerts import invalidate_concert
+from utils.templates import get_prompt_templates
+from utils.importer import import_file, detect_format
 
 st.set_page_config(page_title="공연 등록", layout="wide")
 
@@ -20,7 +23,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 load_dotenv()
-sb = get_sb_client(use_service=True)
+db = get_backend()
 
 # 로그인 상태 확인 및 권한 검증
 if "sb_user" not in st.session_state:
@@ -77,55 +80,136 @@ with col5:
 st.divider()
 
 # 곡 목록 관리 (폼 외부)
+# 곡명·작곡가 입력과 템플릿 선택은 fragment 로 분리해 입력할 때마다 해당 블록만 다시 실행한다.
+# 저장 버튼 활성화 조건이 바뀔 때만 전체 페이지를 다시 실행한다.
 st.markdown("### 🎵 곡 목록 관리")
 
 # 세션 상태에 곡 목록 초기화
 if "tracks" not in st.session_state:
     st.session_state.tracks = [{"title": "", "composer": ""}]
 
-# 곡 추가/제거 버튼
-col1, col2, col3 = st.columns([1, 1, 3])
-with col1:
-    if st.button("➕ 곡 추가"):
-        st.session_state.tracks.append({"title": "", "composer": ""})
+def rerun_if_changed(state_key: str, value) -> None:
+    """fragment 안에서 폼 밖 상태(저장 버튼 활성화)가 바뀌었을 때만 전체 페이지를 다시 그린다."""
+    previous = st.session_state.get(state_key)
+    st.session_state[state_key] = value
+    if previous is not None and previous != value:
         st.rerun()
 
-with col2:
-    if len(st.session_state.tracks) > 1:
-        if st.button("🗑️ 모든 곡 초기화"):
-            st.session_state.tracks = [{"title": "", "composer": ""}]
-            st.rerun()
-
-# 곡 입력 폼들 (폼 외부)
-for i, track in enumerate(st.session_state.tracks):
-    col1, col2, col3 = st.columns([3, 3, 1])
-    
+@st.fragment
+def render_track_editor():
+    # 곡 추가/제거 버튼
+    col1, col2, col3 = st.columns([1, 1, 3])
     with col1:
-        track_title = st.text_input(
-            f"곡명 {i+1}", 
-            value=track["title"],
-            key=f"track_title_{i}",
-            placeholder="곡 제목을 입력하세요"
-        )
-        st.session_state.tracks[i]["title"] = track_title
-    
+        if st.button("➕ 곡 추가"):
+            st.session_state.tracks.append({"title": "", "composer": ""})
+            st.rerun(scope="fragment")
+
     with col2:
-        composer = st.text_input(
-            f"작곡가 {i+1}", 
-            value=track["composer"],
-            key=f"composer_{i}",
-            placeholder="작곡가 이름을 입력하세요"
-        )
-        st.session_state.tracks[i]["composer"] = composer
-    
-    with col3:
         if len(st.session_state.tracks) > 1:
-            if st.button("❌", key=f"remove_{i}", help="이 곡 삭제"):
-                st.session_state.tracks.pop(i)
-                st.rerun()
+            if st.button("🗑️ 모든 곡 초기화"):
+                st.session_state.tracks = [{"title": "", "composer": ""}]
+                st.rerun(scope="fragment")
+
+    # 곡 입력 폼들 (폼 외부)
+    for i, track in enumerate(st.session_state.tracks):
+        col1, col2, col3 = st.columns([3, 3, 1])
+
+        with col1:
+            track_title = st.text_input(
+                f"곡명 {i+1}", 
+                value=track["title"],
+                key=f"track_title_{i}",
+                placeholder="곡 제목을 입력하세요"
+            )
+            st.session_state.tracks[i]["title"] = track_title
+
+        with col2:
+            composer = st.text_input(
+                f"작곡가 {i+1}", 
+                value=track["composer"],
+                key=f"composer_{i}",
+                placeholder="작곡가 이름을 입력하세요"
+            )
+            st.session_state.tracks[i]["composer"] = composer
+
+        with col3:
+            if len(st.session_state.tracks) > 1:
+                if st.button("❌", key=f"remove_{i}", help="이 곡 삭제"):
+                    st.session_state.tracks.pop(i)
+                    st.rerun(scope="fragment")
+
+    # 현재 입력된 곡 목록 표시 (읽기 전용)
+    st.markdown("#### 📋 현재 입력된 곡 목록")
+    valid_tracks_display = []
+    for i, track in enumerate(st.session_state.tracks):
+        if track["title"].strip() and track["composer"].strip():
+            valid_tracks_display.append(f"{i+1}. **{track['title']}** - {track['composer']}")
+
+    if valid_tracks_display:
+        for track_display in valid_tracks_display:
+            st.markdown(track_display)
+    elif st.session_state.tracks:
+        st.info("유효한 곡이 없습니다. 위에서 곡 정보를 입력해주세요.")
+    else:
+        st.info("곡이 없습니다. 위에서 곡을 추가해주세요.")
+
+    # 유효한 곡이 있는지 세션 상태에 저장
+    rerun_if_changed('valid_tracks', len(valid_tracks_display) > 0)
+
+@st.fragment
+def render_template_picker():
+    # 프롬프트 템플릿 선택 - 다중 선택 방식
+    st.markdown("#### 🤖 AI 설명 템플릿 선택")
+
+    try:
+        templates = get_prompt_templates()
+    except Exception as e:
+        st.error(f"템플릿 로드 실패: {str(e)}")
+        st.stop()
+
+    tpl_map = {t["name"]: t for t in templates}
+
+    # Session state에 template map 저장
+    st.session_state['tpl_map'] = tpl_map
+
+    if not tpl_map:
+        st.warning("⚠️ 사용 가능한 프롬프트 템플릿이 없습니다.")
+        st.info("시스템 관리자에게 문의하거나 데이터베이스를 확인해주세요.")
+        st.stop()
+
+    # 모든 템플릿을 다중 선택으로 제공
+    selected_templates = st.multiselect(
+        "생성할 AI 설명 타입들을 선택하세요 (1개 이상 필수)",
+        list(tpl_map.keys()),
+        default=[list(tpl_map.keys())[0]],  # 첫 번째 템플릿을 기본 선택
+        key="template_picker",
+        help="여러 개의 설명 타입을 선택하면 각 곡마다 선택한 모든 타입의 설명이 생성됩니다."
+    )
+
+    # Session state에 템플릿 선택 상태 저장
+    st.session_state['selected_templates'] = selected_templates
+
+    # 템플릿 선택 상태에 따른 경고 표시
+    if not selected_templates:
+        st.error("⚠️ 최소 1개의 템플릿을 선택해야 저장할 수 있습니다.")
+
+    # 선택된 템플릿들 미리보기
+    if selected_templates:
+        with st.expander("📝 선택된 템플릿 미리보기"):
+            for template_name in selected_templates:
+                template_data = tpl_map[template_name]
+                st.markdown(f"**{template_name}**")
+                st.code(template_data.get("template", "템플릿 내용 없음"), language="text")
+                st.divider()
+
+    rerun_if_changed('has_selected_templates', len(selected_templates) > 0)
+
+render_track_editor()
 
 st.divider()
 
+render_template_picker()
+
 # ───────────────────────────────
 # ① 공연 + 곡 입력 폼
 with st.form("concert_form", clear_on_submit=True):
@@ -161,73 +245,9 @@ with st.form("concert_form", clear_on_submit=True):
     with col2:
         description = st.text_area("공연 설명")
 
-    # 프롬프트 템플릿 선택 - 다중 선택 방식
-    st.markdown("#### 🤖 AI 설명 템플릿 선택")
-    
-    try:
-        templates = sb.table("prompt_templates").select("*").execute().data
-        tpl_map = {t["name"]: t for t in templates}
-        
-        # Session state에 template map 저장
-        st.session_state['tpl_map'] = tpl_map
-        
-        if not tpl_map:
-            st.warning("⚠️ 사용 가능한 프롬프트 템플릿이 없습니다.")
-            st.info("시스템 관리자에게 문의하거나 데이터베이스를 확인해주세요.")
-            st.stop()
-        
-        # 모든 템플릿을 다중 선택으로 제공
-        selected_templates = st.multiselect(
-            "생성할 AI 설명 타입들을 선택하세요 (1개 이상 필수)",
-            list(tpl_map.keys()),
-            default=[list(tpl_map.keys())[0]],  # 첫 번째 템플릿을 기본 선택
-            help="여러 개의 설명 타입을 선택하면 각 곡마다 선택한 모든 타입의 설명이 생성됩니다."
-        )
-        
-        # Session state에 템플릿 선택 상태 저장
-        st.session_state['selected_templates'] = selected_templates
-        
-        # 템플릿 선택 상태에 따른 경고 표시
-        submit_enabled = len(selected_templates) > 0
-        if not submit_enabled:
-            st.error("⚠️ 최소 1개의 템플릿을 선택해야 저장할 수 있습니다.")
-            
-        # 선택된 템플릿들 미리보기
-        if selected_templates:
-            with st.expander("📝 선택된 템플릿 미리보기"):
-                for template_name in selected_templates:
-                    template_data = tpl_map[template_name]
-                    st.markdown(f"**{template_name}**")
-                    st.code(template_data.get("template", "템플릿 내용 없음"), language="text")
-                    st.divider()
-        
-    except Exception as e:
-        st.error(f"템플릿 로드 실패: {str(e)}")
-        st.stop()
-    
-    # 현재 입력된 곡 목록 표시 (읽기 전용)
-    st.markdown("#### 📋 현재 입력된 곡 목록")
-    if st.session_state.tracks:
-        valid_tracks_display = []
-        for i, track in enumerate(st.session_state.tracks):
-            if track["title"].strip() and track["composer"].strip():
-                valid_tracks_display.append(f"{i+1}. **{track['title']}** - {track['composer']}")
-        
-        # 유효한 곡이 있는지 세션 상태에 저장
-        st.session_state['valid_tracks'] = len(valid_tracks_display) > 0
-        
-        if valid_tracks_display:
-            for track_display in valid_tracks_display:
-                st.markdown(track_display)
-        else:
-            st.info("유효한 곡이 없습니다. 위에서 곡 정보를 입력해주세요.")
-    else:
-        st.session_state['valid_tracks'] = False
-        st.info("곡이 없습니다. 위에서 곡을 추가해주세요.")
-    
     # 버튼 활성화 조건 확인
     has_valid_tracks = st.session_state.get('valid_tracks', False)
-    has_selected_templates = len(st.session_state.get('selected_templates', [])) > 0
+    has_selected_templates = st.session_state.get('has_selected_templates', False)
     
     submitted = st.form_submit_button(
         "🎼 공연 + 곡 저장",
@@ -251,7 +271,7 @@ if submitted:
         st.warning("최소 1개의 곡 정보(곡명, 작곡가)를 입력하세요.")
         st.stop()
     
-    if not selected_templates:
+    if not st.session_state.get('selected_templates'):
         st.warning("최소 1개의 AI 설명 템플릿을 선택하세요.")
         st.stop()
 
@@ -264,14 +284,14 @@ if submitted:
         date_str = str(start_date)
 
     # concerts INSERT
-    sb.table("concerts").insert({
+    db.insert_concert({
         "id": cid,
         "title": title,
         "venue": venue,
         "date": date_str,
         "description": description,
         "created_by": user.id,
-    }).execute()
+    })
 
     # 기본 템플릿 내용
     default_template = (
@@ -286,7 +306,7 @@ if submitted:
     for template_name in selected_templates:
         template_data = tpl_map.get(template_name, {})
         template_body = template_data.get("template", default_template)
-        all_templates.append((template_name, template_body))
+        all_templates.append((template_name, template_body, template_data.get("id"), template_data.get("version")))
 
     # 곡 데이터 먼저 저장
     track_rows = []
@@ -300,7 +320,8 @@ if submitted:
         })
 
     if track_rows:
-        sb.table("concert_tracks").insert(track_rows).execute()
+        db.insert_tracks(track_rows)
+        invalidate_concert(cid)
         
         # AI 설명 생성 및 저장
         description_rows = []
@@ -316,7 +337,7 @@ if submitted:
             current_progress = 0
             
             for track_idx, track_data in enumerate(track_rows):
-                for template_idx, (template_name, template_body) in enumerate(all_templates):
+                for template_idx, (template_name, template_body, template_id, template_version) in enumerate(all_templates):
                     status_text.text(f"🎵 {track_data['track_title']} - {template_name} 생성 중...")
                     
                     try:
@@ -330,6 +351,9 @@ if submitted:
                             "track_id": track_data["id"],
                             "prompt_type": template_name,
                             "description": ai_desc,
+                            # 생성에 쓴 템플릿 버전 (migrations/004_template_versions.sql)
+                            "template_id": template_id,
+                            "template_version": template_version,
                         })
                         
                         current_progress += 1
@@ -349,6 +373,8 @@ if submitted:
                             "track_id": track_data["id"],
                             "prompt_type": template_name,
                             "description": f"'{track_data['track_title']}' by {track_data['composer']} - AI 설명 생성에 실패했습니다. 나중에 다시 생성하거나 수동으로 편집해주세요.",
+                            "template_id": template_id,
+                            "template_version": template_version,
                         })
                         
                         current_progress += 1
@@ -362,7 +388,8 @@ if submitted:
         # 설명 데이터 일괄 저장
         if description_rows:
             try:
-                sb.table("track_descriptions").insert(description_rows).execute()
+                db.insert_descriptions(description_rows)
+                invalidate_concert(cid)
                 st.success(
                     f"✅ 저장 완료!\n"
                     f"- 곡: {len(track_rows)}개\n"
@@ -371,6 +398,7 @@ if submitted:
                 
                 # 성공 후 곡 목록 초기화
                 st.session_state.tracks = [{"title": "", "composer": ""}]
+                st.session_state['valid_tracks'] = False
                 
                 # 메인 페이지로 이동 옵션 제공
                 st.markdown("---")
@@ -390,4 +418,55 @@ if submitted:
                 # 곡 데이터는 저장되었으므로 롤백하지 않음
                 st.info("곡 정보는 저장되었습니다. 설명은 나중에 다시 생성할 수 있습니다.")
     else:
-        st.warning("저장할 곡이 없습니다.")
\ No newline at end of file
+        st.warning("저장할 곡이 없습니다.")
+
+# ───────────────────────────────
+# ② 시즌 일괄 등록 (CSV / JSONL)
+st.divider()
+st.subheader("📥 시즌 일괄 등록")
+st.caption(
+    "한 행에 곡 하나: 공연명, 공연장, 날짜(또는 시작일·종료일), 공연 소개, 곡명, 작곡가. "
+    "이미 등록된 공연은 건너뛰고, 파일 안의 중복 곡은 한 번만 저장합니다."
+)
+
+with st.form("import_form", clear_on_submit=True):
+    upload = st.file_uploader("CSV 또는 JSONL 파일", type=["csv", "jsonl", "ndjson", "json"])
+    import_tpl_map = st.session_state.get('tpl_map', {})
+    import_templates = st.multiselect(
+        "저장 후 생성할 AI 설명 타입 (선택하지 않으면 생성하지 않음)",
+        list(import_tpl_map.keys()),
+    )
+    dry_run = st.checkbox("검증만 하기 (저장하지 않음)")
+    import_submitted = st.form_submit_button("📥 가져오기")
+
+if import_submitted:
+    if not upload:
+        st.error("파일을 선택해주세요.")
+    else:
+        try:
+            with st.spinner("파일을 가져오는 중..."):
+                result = import_file(
+                    io.TextIOWrapper(upload, encoding="utf-8-sig", newline=""),
+                    detect_format(upload.name),
+                    created_by=user.id,
+                    templates=[import_tpl_map[name] for name in import_templates] or None,
+                    dry_run=dry_run,
+                )
+        except Exception as e:
+            logger.error(f"일괄 등록 실패: {str(e)}")
+            st.error(f"일괄 등록 실패: {str(e)}")
+        else:
+            st.success(
+                f"✅ {'검증 완료' if dry_run else '저장 완료'}\n"
+                f"- 공연: {result['concerts']}개\n"
+                f"- 곡: {result['tracks']}개\n"
+                f"- 이미 등록된 공연(건너뜀): {result['skipped_existing']}개\n"
+                f"- 중복 곡(건너뜀): {result['duplicate_tracks']}개"
+            )
+            if import_templates and not dry_run and result["tracks"]:
+                st.info(f"🤖 곡 {result['tracks']}개의 AI 설명을 백그라운드에서 생성합니다. 완료되면 공연 보기에 나타납니다.")
+            if result["error_count"]:
+                st.warning(f"⚠️ 오류로 건너뛴 행: {result['error_count']}개")
+                with st.expander("오류 목록"):
+                    for line_no, message in result["errors"]:
+                        st.markdown(f"- {line_no}행: {message}")
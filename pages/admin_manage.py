@@ -1,8 +1,15 @@
 # pages/admin_manage.py - 공연 관리 (삭제/편집)
 import streamlit as st
 import uuid
-from utils.supabase_client import get_sb_client
+from datetime import date
+from utils.data_backends import get_backend
 from utils.auth import require_login, get_current_user, sign_out
+from utils.cache import cached
+from utils.search import search_concerts
+from utils.concerts import (
+    LIST_TTL, get_concert, get_concert_tracks, get_concert_descriptions,
+    invalidate_concert, invalidate_concerts, invalidate_track, invalidate_descriptions,
+)
 
 st.set_page_config(page_title="공연 관리", layout="wide")
 
@@ -13,7 +20,7 @@ try:
 except FileNotFoundError:
     pass
 
-sb = get_sb_client(use_service=True)
+db = get_backend()
 
 # 로그인 상태 확인 및 권한 검증
 if "sb_user" not in st.session_state:
@@ -69,35 +76,73 @@ with col5:
 
 st.divider()
 
-# 공연 목록 조회
-@st.cache_data(ttl=60)
-def get_concerts():
+# 공연 선택 목록: 공연명 검색 + 페이지 단위 조회 (공용 캐시, 공연 추가·삭제 시 invalidate_concert 로 갱신)
+MANAGE_PAGE_SIZE = 50
+
+def get_concert_page(title: str, page: int) -> tuple[list[dict], int]:
     try:
-        concerts = sb.table("concerts").select("*").order("created_at", desc=True).execute().data
-        return concerts
+        return cached(
+            f"concerts:admin:{title}:{page}:{MANAGE_PAGE_SIZE}",
+            lambda: db.list_concerts(title or None, (page - 1) * MANAGE_PAGE_SIZE, MANAGE_PAGE_SIZE),
+            ttl=LIST_TTL,
+        )
     except Exception as e:
         st.error(f"공연 목록 조회 실패: {str(e)}")
-        return []
+        return [], 0
 
-concerts = get_concerts()
+def concert_label(concert: dict) -> str:
+    return f"{concert['title']} ({concert['venue']}, {concert['date']})"
 
-if not concerts:
+def reset_manage_page():
+    st.session_state["manage_page"] = 1
+
+st.subheader("🎫 공연 선택")
+col_search, col_page = st.columns([3, 1])
+with col_search:
+    search_title = st.text_input(
+        "공연명 검색", key="manage_search", on_change=reset_manage_page,
+        placeholder="공연명 일부를 입력하세요",
+    ).strip()
+
+# 검색어가 바뀌면 reset_manage_page 가 1페이지로 되돌린다
+page = st.session_state.get("manage_page", 1)
+page_concerts, total_concerts = get_concert_page(search_title, page)
+if not page_concerts and page > 1:
+    # 공연이 삭제되어 페이지가 줄었으면 첫 페이지로
+    st.session_state["manage_page"] = page = 1
+    page_concerts, total_concerts = get_concert_page(search_title, page)
+
+if not total_concerts and not search_title:
     st.info("📝 등록된 공연이 없습니다.")
     if st.button("➕ 첫 공연 등록하기"):
         st.switch_page("pages/admin_dashboard.py")
     st.stop()
 
-# 공연 선택
-st.subheader("🎫 공연 선택")
-selected_concert_id = st.selectbox(
-    "관리할 공연을 선택하세요",
-    options=[c["id"] for c in concerts],
-    format_func=lambda x: next((f"{c['title']} ({c['venue']}, {c['date']})" for c in concerts if c["id"] == x), x),
-    help="삭제하거나 편집할 공연을 선택해주세요"
-)
+total_pages = max((total_concerts + MANAGE_PAGE_SIZE - 1) // MANAGE_PAGE_SIZE, 1)
+with col_page:
+    st.number_input("페이지", min_value=1, max_value=total_pages, step=1, key="manage_page")
+
+selected_concert_id = None
+if not page_concerts:
+    st.info("🔍 검색 결과가 없습니다.")
+else:
+    # id → 표시 이름 (format_func 에서 목록을 다시 훑지 않도록)
+    concert_labels = {c["id"]: concert_label(c) for c in page_concerts}
+    selected_concert_id = st.selectbox(
+        "관리할 공연을 선택하세요",
+        options=list(concert_labels),
+        format_func=lambda x: concert_labels.get(x, x),
+        help="삭제하거나 편집할 공연을 선택해주세요"
+    )
+    first = (page - 1) * MANAGE_PAGE_SIZE + 1
+    st.caption(f"최근 등록순 · 전체 {total_concerts}개 중 {first}–{first + len(page_concerts) - 1}번째")
 
 if selected_concert_id:
-    selected_concert = next((c for c in concerts if c["id"] == selected_concert_id), None)
+    try:
+        selected_concert = get_concert(selected_concert_id)
+    except Exception as e:
+        st.error(f"공연 정보 조회 실패: {str(e)}")
+        selected_concert = None
     
     if selected_concert:
         # 선택된 공연 정보 표시
@@ -110,6 +155,11 @@ if selected_concert_id:
             st.markdown(f"**🏛️ 공연장:** {selected_concert['venue']}")
             st.markdown(f"**📅 일정:** {selected_concert['date']}")
             st.markdown(f"**📝 설명:** {selected_concert['description']}")
+            try:
+                stats = db.concert_stats([selected_concert_id])[selected_concert_id]
+                st.markdown(f"**📊 등록 현황:** 곡 {stats['tracks']}개 · AI 설명 {stats['descriptions']}개")
+            except Exception as e:
+                st.warning(f"등록 현황 조회 실패: {str(e)}")
         
         with col2:
             st.markdown("**⚠️ 위험 구역**")
@@ -124,23 +174,12 @@ if selected_concert_id:
                 with col_yes:
                     if st.button("🗑️ 예, 삭제합니다", type="primary"):
                         try:
-                            # 관련 데이터 삭제 (역순)
-                            # 1. track_descriptions 삭제
-                            tracks_result = sb.table("concert_tracks").select("id").eq("concert_id", selected_concert_id).execute()
-                            track_ids = [t["id"] for t in tracks_result.data]
-                            
-                            if track_ids:
-                                sb.table("track_descriptions").delete().in_("track_id", track_ids).execute()
-                            
-                            # 2. concert_tracks 삭제
-                            sb.table("concert_tracks").delete().eq("concert_id", selected_concert_id).execute()
-                            
-                            # 3. concerts 삭제
-                            sb.table("concerts").delete().eq("id", selected_concert_id).execute()
+                            # 곡·설명까지 함께 삭제
+                            db.delete_concert(selected_concert_id)
                             
                             st.success("✅ 공연이 완전히 삭제되었습니다.")
                             st.session_state['show_delete_confirm'] = False
-                            st.cache_data.clear()
+                            invalidate_concert(selected_concert_id)
                             st.rerun()
                             
                         except Exception as e:
@@ -157,11 +196,14 @@ if selected_concert_id:
         
         # 곡 목록 조회
         try:
-            tracks = sb.table("concert_tracks").select("*").eq("concert_id", selected_concert_id).execute().data
+            tracks = get_concert_tracks(selected_concert_id)
             
             if not tracks:
                 st.info("이 공연에 등록된 곡이 없습니다.")
             else:
+                # 공연의 AI 설명 전체를 한 번에 조회해 곡별로 묶음
+                descriptions_by_track = get_concert_descriptions(selected_concert_id, [t["id"] for t in tracks])
+
                 for i, track in enumerate(tracks):
                     with st.expander(f"🎼 {track['track_title']} - {track['composer']}", expanded=False):
                         col1, col2 = st.columns([3, 1])
@@ -171,7 +213,7 @@ if selected_concert_id:
                             st.markdown(f"**작곡가:** {track['composer']}")
                             
                             # 이 곡의 AI 설명들 조회
-                            descriptions = sb.table("track_descriptions").select("*").eq("track_id", track["id"]).execute().data
+                            descriptions = descriptions_by_track.get(track["id"], [])
                             
                             if descriptions:
                                 st.markdown("**🤖 AI 설명들:**")
@@ -185,17 +227,19 @@ if selected_concert_id:
                             
                             # 개별 설명 삭제
                             if descriptions:
+                                desc_labels = {"": "선택하세요", **{d["id"]: d["prompt_type"] for d in descriptions}}
                                 selected_desc = st.selectbox(
                                     "삭제할 설명 선택",
-                                    options=[""] + [d["id"] for d in descriptions],
-                                    format_func=lambda x: "선택하세요" if x == "" else next((d["prompt_type"] for d in descriptions if d["id"] == x), x),
+                                    options=list(desc_labels),
+                                    format_func=lambda x, labels=desc_labels: labels.get(x, x),
                                     key=f"desc_select_{track['id']}"
                                 )
                                 
                                 if selected_desc:
                                     if st.button(f"🗑️ 설명 삭제", key=f"del_desc_{selected_desc}"):
                                         try:
-                                            sb.table("track_descriptions").delete().eq("id", selected_desc).execute()
+                                            db.delete_description(selected_desc)
+                                            invalidate_descriptions(selected_concert_id, track["id"])
                                             st.success("✅ 설명이 삭제되었습니다.")
                                             st.rerun()
                                         except Exception as e:
@@ -204,10 +248,9 @@ if selected_concert_id:
                             # 곡 전체 삭제
                             if st.button(f"🗑️ 곡 삭제", key=f"del_track_{track['id']}", type="secondary"):
                                 try:
-                                    # 곡의 모든 설명 삭제
-                                    sb.table("track_descriptions").delete().eq("track_id", track["id"]).execute()
-                                    # 곡 삭제
-                                    sb.table("concert_tracks").delete().eq("id", track["id"]).execute()
+                                    # 곡과 곡의 모든 설명 삭제
+                                    db.delete_track(track["id"])
+                                    invalidate_track(selected_concert_id, track["id"])
                                     
                                     st.success("✅ 곡이 삭제되었습니다.")
                                     st.rerun()
@@ -217,11 +260,77 @@ if selected_concert_id:
         except Exception as e:
             st.error(f"곡 목록 조회 실패: {str(e)}")
 
+# 지난 공연 일괄 삭제
+st.markdown("---")
+st.subheader("🧹 지난 공연 일괄 삭제")
+
+def concert_end_date(concert: dict) -> str:
+    """'2024-03-01 ~ 2024-03-03' 형식이면 마지막 날짜."""
+    return (concert.get("date") or "").split("~")[-1].strip()
+
+def delete_concerts_in_bulk(concert_ids: list[str]) -> None:
+    # 버튼 콜백에서 실행해야 확인 체크박스를 해제할 수 있다
+    try:
+        # 한 번의 요청으로 곡·설명까지 함께 삭제
+        deleted = db.delete_concerts(concert_ids)
+        invalidate_concerts(concert_ids)
+        st.session_state["bulk_confirm"] = False
+        st.session_state["bulk_delete_result"] = (True, f"✅ 공연 {deleted}개가 삭제되었습니다.")
+    except Exception as e:
+        st.session_state["bulk_delete_result"] = (False, f"일괄 삭제 실패: {str(e)}")
+
+def get_past_concerts(cutoff: str) -> list[dict]:
+    """cutoff 이전에 끝난 공연 전체 (날짜 조건으로 페이지 단위 조회)."""
+    def load():
+        past, page = [], 1
+        while True:
+            rows, total = search_concerts(end_date=cutoff, sort="date_asc", page=page, page_size=200)
+            past.extend(c for c in rows if concert_end_date(c) and concert_end_date(c) < cutoff)
+            if not rows or page * 200 >= total:
+                return past
+            page += 1
+    return cached(f"concerts:admin:past:{cutoff}", load, ttl=LIST_TTL)
+
+cutoff = st.date_input("이 날짜 이전에 끝난 공연", value=date.today(), key="bulk_cutoff")
+try:
+    past_concerts = get_past_concerts(str(cutoff))
+except Exception as e:
+    st.error(f"지난 공연 조회 실패: {str(e)}")
+    past_concerts = []
+
+if not past_concerts:
+    st.info("해당 기간에 끝난 공연이 없습니다.")
+else:
+    past_labels = {c["id"]: concert_label(c) for c in past_concerts}
+    if st.checkbox(f"지난 공연 {len(past_concerts)}개 모두 선택", key="bulk_select_all"):
+        bulk_ids = list(past_labels)
+    else:
+        bulk_ids = st.multiselect(
+            "삭제할 공연",
+            options=list(past_labels),
+            format_func=lambda x: past_labels.get(x, x),
+        )
+
+    st.warning(f"선택한 공연 {len(bulk_ids)}개와 곡·AI 설명이 모두 삭제됩니다.")
+    confirmed = st.checkbox("되돌릴 수 없음을 확인했습니다", key="bulk_confirm")
+    st.button(
+        "🗑️ 선택한 공연 삭제",
+        type="primary",
+        disabled=not (bulk_ids and confirmed),
+        on_click=delete_concerts_in_bulk,
+        args=(bulk_ids,),
+    )
+
+if "bulk_delete_result" in st.session_state:
+    ok, message = st.session_state.pop("bulk_delete_result")
+    (st.success if ok else st.error)(message)
+
 st.markdown("---")
 st.markdown("### 💡 사용 안내")
 st.info("""
 **🎯 기능 설명:**
 - **전체 공연 삭제**: 공연과 관련된 모든 데이터(곡, AI 설명)를 완전히 삭제
+- **지난 공연 일괄 삭제**: 기준 날짜 이전에 끝난 공연들을 한 번에 삭제
 - **곡 삭제**: 특정 곡과 해당 곡의 모든 AI 설명 삭제
 - **설명 삭제**: 특정 곡의 특정 AI 설명만 삭제
 
@@ -1,10 +1,25 @@
 import streamlit as st
 import logging
-from utils.supabase_client import get_sb_client
 from utils.auth import get_current_user, get_role, sign_out
+from utils.search import search_descriptions, search_concerts, CONCERT_SORTS, DEFAULT_PAGE_SIZE
+from utils.concerts import (
+    get_paged_concerts, load_more_concerts, CONCERT_PAGE_SIZE,
+    get_track_descriptions,
+    prefetch_track_descriptions, DESCRIPTION_PREFETCH,
+)
+from utils.warmup import start_warmup
+from utils.repository import get_concert_with_tracks, get_tracks_by_concert, get_concerts_by_keyword
+from utils.markup import (
+    DIVIDER_HTML, NO_TRACKS_HTML, NO_DESCRIPTIONS_HTML,
+    concert_header_html, concert_intro_html, track_card_html, description_html, full_display_box,
+    snippet_html,
+)
 
 st.set_page_config(page_title="공연 상세", layout="wide")
 
+# QR 코드로 이 페이지에 바로 들어오는 경우에도 캐시 워밍업
+start_warmup()
+
 # CSS 스타일 로드
 try:
     with open("static/classical_styles.css", "r", encoding="utf-8") as f:
@@ -16,7 +31,6 @@ except FileNotFoundError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-sb = get_sb_client()
 
 # 로그인 상태 확인
 user = get_current_user()
@@ -72,72 +86,42 @@ st.divider()
 
 cid = st.query_params.get("concert_id")  # None or uuid
 
+# 정렬 선택지 라벨 → utils.search.CONCERT_SORTS 키
+SORT_OPTIONS = {
+    "📅 날짜순 (최신순)": "date_desc",
+    "📅 날짜순 (과거순)": "date_asc",
+    "🔤 제목순": "title",
+    "🏛️ 공연장순": "venue",
+}
+SORT_LABELS = list(SORT_OPTIONS.keys())
+
 def render_detail(concert_id: str):
     """선택된 공연의 AI 곡 설명을 보여준다."""
     if not concert_id:
         st.error("유효하지 않은 공연 ID입니다.")
         return
     
+    # 공연 정보와 곡 목록은 서로 독립적이므로 동시에 조회
     try:
-        concert = (
-            sb.table("concerts")
-              .select("*")
-              .eq("id", concert_id)
-              .single()
-              .execute()
-              .data
-        )
+        concert, tracks = get_concert_with_tracks(concert_id)
     except Exception as e:
         st.error(f"공연 정보를 불러올 수 없습니다: {str(e)}")
         return
-    
-    try:
-        tracks = (
-            sb.table("concert_tracks")
-              .select("*")
-              .eq("concert_id", concert_id)
-              .execute()
-              .data
-        )
-    except Exception as e:
-        st.error(f"곡 목록을 불러올 수 없습니다: {str(e)}")
+
+    if not concert:
+        st.error("공연을 찾을 수 없습니다.")
         return
 
-    st.markdown(
-        f"""
-        <div class="classical-header">
-            <h1>🎭 {concert["title"]}</h1>
-            <p>{concert["venue"]} │ {concert["date"]}</p>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    st.markdown(concert_header_html(concert), unsafe_allow_html=True)
     
     if concert.get("description"):
-        st.markdown(
-            f"""
-            <div class="info-box info-box-purple">
-                <h4>📖 공연 소개</h4>
-                <p>{concert["description"]}</p>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+        st.markdown(concert_intro_html(concert), unsafe_allow_html=True)
     
     st.divider()
     
     # 곡이 없는 경우 안내
     if not tracks:
-        st.markdown(
-            """
-            <div class="info-box info-box-gold">
-                <h3>🎵 곡 목록 준비 중</h3>
-                <p>이 공연의 곡 목록과 AI 해설이 곧 추가될 예정입니다.</p>
-                <p>조금만 기다려주시면 더 풍성한 정보를 제공해드리겠습니다!</p>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+        st.markdown(NO_TRACKS_HTML, unsafe_allow_html=True)
         return
 
     # 설명 표시 방식 선택을 더 보기 좋게
@@ -150,6 +134,14 @@ def render_detail(concert_id: str):
         unsafe_allow_html=True
     )
     
+    render_tracks(concert_id, tracks)
+
+@st.fragment
+def render_tracks(concert_id: str, tracks: list[dict]):
+    """
+    곡 목록 영역. 표시 방식을 바꾸면 이 영역만 다시 그린다
+    (CSS·로그인 복구·공연 조회 등 페이지 전체는 다시 실행되지 않음).
+    """
     display_mode = st.radio(
         "",  # 라벨은 위에서 처리
         ["탭으로 구분", "전체 표시", "타입별 필터"],
@@ -159,114 +151,138 @@ def render_detail(concert_id: str):
 
     st.markdown("---")
 
+    track_ids = [track["id"] for track in tracks]
     for i, track in enumerate(tracks):
-        # 곡 번호와 함께 표시
-        st.markdown(
-            f"""
-            <div class="track-card">
-                <div class="track-title">🎵 {i+1}. {track['track_title']}</div>
-                <div class="track-composer">작곡가: {track['composer']}</div>
-            </div>
-            """,
-            unsafe_allow_html=True
+        next_ids = track_ids[i + 1:i + 1 + DESCRIPTION_PREFETCH]
+        render_track(concert_id, i, track, display_mode, next_ids)
+
+@st.fragment
+def render_track(concert_id: str, i: int, track: dict, display_mode: str, next_ids: list[str]):
+    """
+    곡 하나의 카드와 설명. 설명 타입 선택은 이 곡 블록만 다시 그린다.
+
+    설명 본문은 곡을 펼쳤을 때만 조회·렌더링하고, 그때 다음 곡 몇 개(next_ids)의
+    설명을 백그라운드에서 미리 읽어 둔다. 곡이 많은 페스티벌 공연도 첫 화면은 곡 카드만 그린다.
+    """
+    # 곡 번호와 함께 표시
+    st.markdown(track_card_html(i, track), unsafe_allow_html=True)
+
+    # st.expander·st.tabs 는 열림 여부를 서버에 알리지 않으므로 토글로 펼친다
+    opened = st.toggle(
+        "📖 AI 설명 보기",
+        key=f"open_{track['id']}",
+        on_change=prefetch_track_descriptions,
+        args=(concert_id, next_ids),
+    )
+    if not opened:
+        st.markdown(DIVIDER_HTML, unsafe_allow_html=True)
+        return
+    
+    # 해당 곡의 모든 설명 조회
+    try:
+        descriptions = get_track_descriptions(concert_id, track["id"])
+    except Exception as e:
+        logger.error(f"곡 설명 조회 오류 - {track['track_title']}: {str(e)}")
+        descriptions = []
+    
+    if not descriptions:
+        st.markdown(NO_DESCRIPTIONS_HTML, unsafe_allow_html=True)
+        st.divider()
+        return
+    
+    # 설명 표시 방식에 따른 렌더링
+    if display_mode == "탭으로 구분" and len(descriptions) > 1:
+        # 탭 방식으로 표시
+        tab_names = [f"{desc['prompt_type']}" for desc in descriptions]
+        tabs = st.tabs(tab_names)
+        
+        for tab, desc in zip(tabs, descriptions):
+            with tab:
+                st.markdown(description_html(desc), unsafe_allow_html=True)
+                
+    elif display_mode == "타입별 필터" and len(descriptions) > 1:
+        # 필터링 방식
+        available_types = list(set(desc["prompt_type"] for desc in descriptions))
+        selected_type = st.selectbox(
+            f"💡 설명 타입 선택",
+            available_types,
+            key=f"filter_{track['id']}",
+            help="보고 싶은 설명 타입을 선택하세요"
         )
         
-        # 해당 곡의 모든 설명 조회
-        try:
-            descriptions = (
-                sb.table("track_descriptions")
-                  .select("*")
-                  .eq("track_id", track["id"])
-                  .execute()
-                  .data
-            )
-        except Exception as e:
-            logger.error(f"곡 설명 조회 오류 - {track['track_title']}: {str(e)}")
-            descriptions = []
+        selected_desc = next(
+            desc for desc in descriptions 
+            if desc["prompt_type"] == selected_type
+        )
         
-        if not descriptions:
-            st.markdown(
-                """
-                <div class="info-box info-box-pink">
-                    <h4>💭 AI 설명 준비 중</h4>
-                    <p>이 곡에 대한 AI 해설을 준비하고 있습니다. 곧 업데이트될 예정입니다!</p>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-            st.divider()
-            continue
+        st.markdown(description_html(selected_desc, "info-box-blue"), unsafe_allow_html=True)
         
-        # 설명 표시 방식에 따른 렌더링
-        if display_mode == "탭으로 구분" and len(descriptions) > 1:
-            # 탭 방식으로 표시
-            tab_names = [f"{desc['prompt_type']}" for desc in descriptions]
-            tabs = st.tabs(tab_names)
-            
-            for tab, desc in zip(tabs, descriptions):
-                with tab:
-                    st.markdown(
-                        f"""
-                        <div class="track-description">
-                            {desc['description']}
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
-                    
-        elif display_mode == "타입별 필터" and len(descriptions) > 1:
-            # 필터링 방식
-            available_types = list(set(desc["prompt_type"] for desc in descriptions))
-            selected_type = st.selectbox(
-                f"💡 설명 타입 선택",
-                available_types,
-                key=f"filter_{track['id']}",
-                help="보고 싶은 설명 타입을 선택하세요"
-            )
-            
-            selected_desc = next(
-                desc for desc in descriptions 
-                if desc["prompt_type"] == selected_type
-            )
-            
+    else:
+        # 전체 표시 방식 (기본)
+        box = full_display_box(descriptions)
+        for desc in descriptions:
+            st.markdown(description_html(desc, box), unsafe_allow_html=True)
+    
+    st.markdown(DIVIDER_HTML, unsafe_allow_html=True)
+
+def render_description_hits(search_term: str) -> int:
+    """곡 해설 본문에서 검색어가 나온 곡을 관련도순으로 보여준다. 전체 결과 수를 반환."""
+    # 검색어가 바뀌면 첫 페이지부터
+    if st.session_state.get("desc_search_term") != search_term:
+        st.session_state["desc_search_term"] = search_term
+        st.session_state["desc_search_page"] = 1
+    page = st.session_state.get("desc_search_page", 1)
+
+    try:
+        hits, total = search_descriptions(search_term, page=page)
+    except Exception as e:
+        logger.warning(f"곡 해설 검색 실패: {str(e)}")
+        return 0
+
+    if not hits:
+        return total
+
+    st.markdown(f"### 🎧 곡 해설에서 찾은 결과 ({total}건)")
+
+    for hit in hits:
+        col_info, col_btn = st.columns([4, 1])
+        with col_info:
             st.markdown(
                 f"""
-                <div class="info-box info-box-blue">
-                    <h4>📝 {selected_type}</h4>
-                    <div class="track-description">
-                        {selected_desc['description']}
-                    </div>
+                <div class="info-box info-box-purple">
+                    <h4>🎵 {hit['track_title']} - {hit['composer']}</h4>
+                    <p><strong>🎭 {hit['concert_title']}</strong> │ {hit['concert_date']} │ 📝 {hit['prompt_type']}</p>
+                    <div class="track-description">…{snippet_html(hit['snippet'])}…</div>
                 </div>
                 """,
                 unsafe_allow_html=True
             )
-            
-        else:
-            # 전체 표시 방식 (기본)
-            for desc in descriptions:
-                if len(descriptions) > 1:
-                    st.markdown(
-                        f"""
-                        <div class="info-box info-box-green">
-                            <h4>📝 {desc['prompt_type']}</h4>
-                            <div class="track-description">
-                                {desc['description']}
-                            </div>
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
-                else:
-                    st.markdown(
-                        f"""
-                        <div class="track-description">
-                            {desc['description']}
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
-        
-        st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
+        with col_btn:
+            if st.button(
+                "🎼 공연 보기",
+                key=f"desc_hit_{hit['description_id']}",
+                use_container_width=True
+            ):
+                st.query_params["concert_id"] = hit["concert_id"]
+                st.rerun()
+
+    # 페이지 이동
+    total_pages = (total + DEFAULT_PAGE_SIZE - 1) // DEFAULT_PAGE_SIZE
+    if total_pages > 1:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("◀ 이전", key="desc_prev", disabled=page <= 1):
+                st.session_state["desc_search_page"] = page - 1
+                st.rerun()
+        with col_page:
+            st.caption(f"{page} / {total_pages} 페이지")
+        with col_next:
+            if st.button("다음 ▶", key="desc_next", disabled=page >= total_pages):
+                st.session_state["desc_search_page"] = page + 1
+                st.rerun()
+
+    st.divider()
+    return total
 
 def render_concert_list():
     """공연 목록을 보여주고 선택할 수 있게 한다."""
@@ -298,7 +314,7 @@ def render_concert_list():
                 search_term = st.text_input(
                     "", 
                     placeholder="🎵 공연명, 🏛️ 공연장명, 👤 작곡가명으로 검색해보세요...",
-                    help="예: '베토벤', '예술의전당', '콘체르토', '모차르트' 등"
+                    help="예: '베토벤', '예술의전당', '잔잔한', '웅장한' 등"
                 )
             with col2:
                 clear_search = st.button("🗑️ 검색 초기화", use_container_width=True)
@@ -327,135 +343,63 @@ def render_concert_list():
     
     st.divider()
     
+    # 정렬 기준은 아래 선택 상자(key="concert_sort")의 값을 미리 읽어 쿼리에 전달
+    sort_key = SORT_OPTIONS[st.session_state.get("concert_sort", SORT_LABELS[0])]
+
     # 공연 목록 조회 (고급 검색 지원)
     try:
         # 검색 조건 적용
         if search_mode == "🔍 통합 검색" and search_term:
-            # 통합 검색: 공연명, 공연장, 설명으로 검색 (개별 쿼리 후 합치기)
-            concerts_basic = []
-            
-            # 제목으로 검색
-            title_results = (
-                sb.table("concerts")
-                .select("id,title,venue,date,description")
-                .ilike("title", f"%{search_term}%")
-                .execute()
-                .data
-            )
-            concerts_basic.extend(title_results)
-            
-            # 공연장으로 검색
-            venue_results = (
-                sb.table("concerts")
-                .select("id,title,venue,date,description")
-                .ilike("venue", f"%{search_term}%")
-                .execute()
-                .data
-            )
-            concerts_basic.extend(venue_results)
-            
-            # 설명으로 검색
-            desc_results = (
-                sb.table("concerts")
-                .select("id,title,venue,date,description")
-                .ilike("description", f"%{search_term}%")
-                .execute()
-                .data
-            )
-            concerts_basic.extend(desc_results)
-            
-            # 작곡가로도 검색
-            try:
-                composer_tracks = (
-                    sb.table("concert_tracks")
-                    .select("concert_id")
-                    .ilike("composer", f"%{search_term}%")
-                    .execute()
-                    .data
-                )
-                
-                composer_concert_ids = [track['concert_id'] for track in composer_tracks]
-                
-                if composer_concert_ids:
-                    concerts_by_composer = (
-                        sb.table("concerts")
-                        .select("id,title,venue,date,description")
-                        .in_("id", composer_concert_ids)
-                        .execute()
-                        .data
-                    )
-                else:
-                    concerts_by_composer = []
-                    
-            except Exception as e:
-                logger.warning(f"작곡가 검색 실패: {str(e)}")
-                concerts_by_composer = []
-            
-            # 결과 합치기 (중복 제거)
-            concert_ids = set()
-            concerts = []
-            
-            for concert_list in [concerts_basic, concerts_by_composer]:
-                for concert in concert_list:
-                    if concert['id'] not in concert_ids:
-                        concerts.append(concert)
-                        concert_ids.add(concert['id'])
+            # 통합 검색: 공연명, 공연장, 설명, 작곡가로 검색 (네 쿼리를 동시에 보낸 뒤 합치기)
+            concerts = get_concerts_by_keyword(search_term)
+            total_concerts = len(concerts)
                         
         elif search_mode == "🎼 고급 검색":
-            # 기본 쿼리 시작
-            query = sb.table("concerts").select("id,title,venue,date,description")
-            
-            # 각 조건별로 순차적으로 필터 적용
-            if title_search:
-                query = query.ilike("title", f"%{title_search}%")
-            if venue_search:
-                query = query.ilike("venue", f"%{venue_search}%")
-            if start_date:
-                query = query.gte("date", str(start_date))
-            if end_date:
-                query = query.lte("date", str(end_date))
-            
-            concerts = query.execute().data
-            
-            # 작곡가 검색이 있는 경우 추가 필터링
-            if composer_search:
-                try:
-                    composer_tracks = (
-                        sb.table("concert_tracks")
-                        .select("concert_id")
-                        .ilike("composer", f"%{composer_search}%")
-                        .execute()
-                        .data
-                    )
-                    
-                    valid_ids = [track['concert_id'] for track in composer_tracks]
-                    concerts = [c for c in concerts if c['id'] in valid_ids]
-                except Exception as e:
-                    logger.warning(f"고급 검색에서 작곡가 필터링 실패: {str(e)}")
-        else:
-            # 기본 조회 (검색 없음)
-            concerts = (
-                sb.table("concerts")
-                .select("id,title,venue,date,description")
-                .order("date", desc=True)
-                .execute()
-                .data
+            # 조건이 바뀌면 첫 페이지부터
+            adv_filters = (title_search, venue_search, composer_search, str(start_date), str(end_date), sort_key)
+            if st.session_state.get("adv_search_filters") != adv_filters:
+                st.session_state["adv_search_filters"] = adv_filters
+                st.session_state["adv_search_page"] = 1
+            adv_page = st.session_state.get("adv_search_page", 1)
+
+            # 필터·작곡가 세미조인·정렬·페이지 제한을 모두 DB 에서 처리
+            concerts, total_concerts = search_concerts(
+                title=title_search,
+                venue=venue_search,
+                composer=composer_search,
+                start_date=start_date,
+                end_date=end_date,
+                sort=sort_key,
+                page=adv_page,
+                page_size=CONCERT_PAGE_SIZE,
             )
+        else:
+            # 기본 조회 (검색 없음): 키셋 페이지네이션, "더 보기"로 다음 페이지만 이어 붙임
+            concert_pages = get_paged_concerts("concert_view", sort=sort_key)
+            concerts = concert_pages["rows"]
+            total_concerts = None
             
     except Exception as e:
         st.error(f"공연 목록을 불러오는 중 오류가 발생했습니다: {str(e)}")
         logger.error(f"공연 조회 오류: {str(e)}")
         return
-    
+
+    # 곡 해설 본문 검색 (분위기 단어 등)
+    description_hit_count = 0
+    if search_mode == "🔍 통합 검색" and search_term:
+        description_hit_count = render_description_hits(search_term)
+
     # 검색 결과 처리
     if not concerts:
         if search_mode == "🔍 통합 검색" and search_term:
+            if description_hit_count:
+                return
             st.markdown(
                 f"""
                 <div class="info-box info-box-blue">
                     <h3>🔍 '{search_term}'에 대한 검색 결과가 없습니다</h3>
                     <p>다른 키워드로 검색해보시거나 검색어를 줄여보세요.</p>
-                    <p>💡 팁: 공연명, 공연장명, 작곡가명으로 검색할 수 있습니다.</p>
+                    <p>💡 팁: 공연명, 공연장명, 작곡가명, 곡 해설 속 단어로 검색할 수 있습니다.</p>
                 </div>
                 """,
                 unsafe_allow_html=True
@@ -486,28 +430,25 @@ def render_concert_list():
     # 정렬 옵션
     col1, col2, col3 = st.columns([2, 2, 1])
     with col1:
-        st.markdown(f"**🎭 총 {len(concerts)}개의 공연**")
+        if total_concerts is None:
+            st.markdown(f"**🎭 {len(concerts)}개의 공연 표시 중**")
+        else:
+            st.markdown(f"**🎭 총 {total_concerts}개의 공연**")
     with col2:
-        sort_option = st.selectbox(
-            "정렬 기준",
-            ["📅 날짜순 (최신순)", "📅 날짜순 (과거순)", "🔤 제목순", "🏛️ 공연장순"],
-            index=0
-        )
+        st.selectbox("정렬 기준", SORT_LABELS, key="concert_sort")
     with col3:
         view_mode = st.selectbox("보기", ["카드뷰", "리스트뷰"], index=0)
     
-    # 정렬 적용
-    if sort_option == "📅 날짜순 (최신순)":
-        concerts.sort(key=lambda x: x['date'], reverse=True)
-    elif sort_option == "📅 날짜순 (과거순)":
-        concerts.sort(key=lambda x: x['date'])
-    elif sort_option == "🔤 제목순":
-        concerts.sort(key=lambda x: x['title'])
-    elif sort_option == "🏛️ 공연장순":
-        concerts.sort(key=lambda x: x['venue'])
+    # 통합 검색은 여러 쿼리 결과를 합친 것이므로 합친 뒤 정렬 (나머지는 DB 에서 정렬됨)
+    if search_mode == "🔍 통합 검색" and search_term:
+        sort_column, sort_desc = CONCERT_SORTS[sort_key]
+        concerts.sort(key=lambda x: x[sort_column] or "", reverse=sort_desc)
     
     st.divider()
 
+    # 카드마다 곡 수를 표시하므로 보이는 공연들의 곡 목록을 한 번에 동시 조회
+    tracks_by_concert = get_tracks_by_concert([concert["id"] for concert in concerts])
+
     # 뷰 모드에 따른 표시
     if view_mode == "카드뷰":
         # 기존 2열 카드 표시
@@ -546,26 +487,15 @@ def render_concert_list():
                 
                 with col_info:
                     try:
-                        track_count = (
-                            sb.table("concert_tracks")
-                              .select("id", count="exact")
-                              .eq("concert_id", concert["id"])
-                              .execute()
-                              .count
-                        )
+                        # 곡 수와 첫 곡 미리보기 모두 미리 조회한 곡 목록에서
+                        concert_tracks = tracks_by_concert[concert["id"]]
+                        track_count = len(concert_tracks)
                         
                         if track_count > 0:
                             st.markdown(f"**🎼 총 {track_count}곡**")
                             
                             # 첫 번째 곡 미리보기
-                            first_track = (
-                                sb.table("concert_tracks")
-                                  .select("track_title, composer")
-                                  .eq("concert_id", concert["id"])
-                                  .limit(1)
-                                  .execute()
-                                  .data
-                            )
+                            first_track = concert_tracks[:1]
                             if first_track:
                                 st.caption(f"♪ {first_track[0]['track_title']} - {first_track[0]['composer']}")
                                 if track_count > 1:
@@ -620,13 +550,7 @@ def render_concert_list():
                 
                 # 곡 수 표시
                 try:
-                    track_count = (
-                        sb.table("concert_tracks")
-                          .select("id", count="exact")
-                          .eq("concert_id", concert["id"])
-                          .execute()
-                          .count
-                    )
+                    track_count = len(tracks_by_concert[concert["id"]])
                     st.caption(f"🎼 {track_count}곡")
                 except:
                     st.caption("🎼 정보 없음")
@@ -644,6 +568,33 @@ def render_concert_list():
             if idx < len(concerts) - 1:
                 st.markdown("---")
 
+    # 기본 목록: 다음 페이지 이어 붙이기
+    if search_mode == "🔍 통합 검색" and not search_term and concert_pages["cursor"] is not None:
+        st.divider()
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col2:
+            if st.button("⬇️ 공연 더 보기", key="concert_view_more", use_container_width=True):
+                load_more_concerts("concert_view")
+                st.rerun()
+
+    # 고급 검색 페이지 이동 (현재 페이지만 조회됨)
+    if search_mode == "🎼 고급 검색":
+        total_pages = (total_concerts + CONCERT_PAGE_SIZE - 1) // CONCERT_PAGE_SIZE
+        if total_pages > 1:
+            adv_page = st.session_state.get("adv_search_page", 1)
+            st.divider()
+            col_prev, col_page, col_next = st.columns([1, 2, 1])
+            with col_prev:
+                if st.button("◀ 이전", key="adv_prev", disabled=adv_page <= 1):
+                    st.session_state["adv_search_page"] = adv_page - 1
+                    st.rerun()
+            with col_page:
+                st.caption(f"{adv_page} / {total_pages} 페이지")
+            with col_next:
+                if st.button("다음 ▶", key="adv_next", disabled=adv_page >= total_pages):
+                    st.session_state["adv_search_page"] = adv_page + 1
+                    st.rerun()
+
 # ────────────────────────────────
 # 메인 로직: 파라미터에 따른 페이지 렌더링
 # ────────────────────────────────
@@ -1,7 +1,8 @@
 # 프롬프트 관리 페이지
 import streamlit as st
-from utils.supabase_client import get_sb_client
+from utils.data_backends import get_backend
 from utils.auth import require_login, sign_out
+from utils.templates import get_prompt_templates, invalidate_templates
 
 st.set_page_config(page_title="프롬프트 관리", layout="wide")
 
@@ -12,7 +13,7 @@ try:
 except FileNotFoundError:
     pass
 
-sb = get_sb_client(use_service=True)
+db = get_backend()
 
 # 로그인 상태 확인 및 권한 검증
 if "sb_user" not in st.session_state:
@@ -68,11 +69,10 @@ with col5:
 
 st.divider()
 
-# 현재 저장된 프롬프트 조회 및 편집
-@st.cache_data(ttl=60)
+# 현재 저장된 프롬프트 조회 및 편집 (공용 캐시)
 def get_current_templates():
     try:
-        templates = sb.table("prompt_templates").select("*").execute().data
+        templates = get_prompt_templates()
         return templates
     except Exception as e:
         st.error(f"프롬프트 조회 실패: {str(e)}")
@@ -197,10 +197,12 @@ current_templates = get_current_templates()
 if current_templates:
     templates_dict = {template['name']: template['template'] for template in current_templates}
     template_ids = {template['name']: template['id'] for template in current_templates}
+    template_versions = {template['name']: template.get('version') for template in current_templates}
 else:
     # DB가 비어있으면 기본 템플릿 사용
     templates_dict = default_templates.copy()
     template_ids = {}
+    template_versions = {}
 
 st.subheader("프롬프트 템플릿 편집")
 
@@ -213,6 +215,8 @@ edited_templates = {}
 for i, (name, tab) in enumerate(zip(tab_names, tabs)):
     with tab:
         st.markdown(f"### {name}")
+        if template_versions.get(name):
+            st.caption(f"버전 {template_versions[name]}")
         
         # 현재 템플릿 내용을 텍스트 에리어로 편집
         edited_content = st.text_area(
@@ -241,42 +245,35 @@ with col1:
 with col2:
     if st.button("💾 템플릿 저장", type="primary"):
         try:
-            # 기존 템플릿들을 개별적으로 삭제
-            existing_templates = sb.table("prompt_templates").select("id").execute().data
-            for template in existing_templates:
-                sb.table("prompt_templates").delete().eq("id", template["id"]).execute()
-            
-            # 새로운 템플릿 삽입
-            template_data = []
-            for name, template in edited_templates.items():
-                template_data.append({
-                    "name": name,
-                    "template": template
-                })
-            
-            sb.table("prompt_templates").insert(template_data).execute()
-            
-            st.success("✅ 프롬프트 템플릿이 성공적으로 저장되었습니다!")
-            st.cache_data.clear()
-            st.rerun()
+            if current_templates and edited_templates == templates_dict:
+                st.info("변경된 템플릿이 없습니다.")
+            else:
+                template_data = []
+                for name, template in edited_templates.items():
+                    template_data.append({
+                        "name": name,
+                        "template": template
+                    })
+                
+                # 바뀐 템플릿만 갱신 (id 유지, version 증가) - 한 트랜잭션
+                db.save_templates(template_data)
+                
+                st.success("✅ 프롬프트 템플릿이 성공적으로 저장되었습니다!")
+                invalidate_templates()
+                st.rerun()
             
         except Exception as e:
             st.error(f"저장 실패: {str(e)}")
 
 with col3:
     if st.button("🔍 현재 DB 템플릿 새로고침"):
-        st.cache_data.clear()
+        invalidate_templates()
         st.rerun()
 
 # 초기화 처리
 if st.session_state.get('reset_templates', False):
     try:
-        # 기존 템플릿들을 개별적으로 삭제
-        existing_templates = sb.table("prompt_templates").select("id").execute().data
-        for template in existing_templates:
-            sb.table("prompt_templates").delete().eq("id", template["id"]).execute()
-        
-        # 기본 템플릿 삽입
+        # 기본 템플릿으로 교체 (목록에 없는 템플릿은 삭제)
         template_data = []
         for name, template in default_templates.items():
             template_data.append({
@@ -284,11 +281,11 @@ if st.session_state.get('reset_templates', False):
                 "template": template
             })
         
-        sb.table("prompt_templates").insert(template_data).execute()
+        db.save_templates(template_data)
         
         st.success("✅ 기본 템플릿으로 초기화되었습니다!")
         st.session_state.reset_templates = False
-        st.cache_data.clear()
+        invalidate_templates()
         st.rerun()
         
     except Exception as e:
@@ -1,16 +1,36 @@
 # utils/auth.py
 import os, streamlit as st
+import base64
+import json
+import logging
+import threading
+import time
 from dotenv import load_dotenv
-from utils.supabase_client import get_sb_client
+from utils.supabase_client import get_auth_client
 
 load_dotenv()
-sb = get_sb_client()
+logger = logging.getLogger(__name__)
+
+# access token 만료까지 이 시간(초)보다 적게 남으면 백그라운드에서 갱신을 시작한다
+REFRESH_WINDOW_SECONDS = int(os.getenv("AUTH_REFRESH_WINDOW_SECONDS", "300"))
+
+# 남은 시간이 이보다 짧으면 다음 rerun 을 기다리지 않고 바로 갱신한다
+MIN_TOKEN_LIFETIME_SECONDS = 30
+
+# 백그라운드 갱신 상태. 스레드에서는 st.session_state 에 쓸 수 없으므로
+# 결과를 refresh token 별로 여기에 두고 해당 세션의 다음 rerun 에서 가져간다.
+# (refresh token 은 한 번만 쓸 수 있으므로 같은 토큰으로 두 번 갱신하지 않는다)
+_refresh_lock = threading.Lock()
+_refresh_threads: dict[str, threading.Thread] = {}
+_refresh_results: dict[str, tuple[float, object]] = {}
+
+# 가져가지 않은 결과(창을 닫은 세션 등)를 보관하는 최대 시간 (초)
+_RESULT_MAX_AGE = 60 * 60
 
 # 1) 로그인 & 세션 저장
 def sign_in(email: str, password: str) -> None:
-    res = sb.auth.sign_in_with_password({"email": email, "password": password})
-    st.session_state["sb_session"] = res.session
-    st.session_state["sb_user"]    = res.user
+    res = get_auth_client().sign_in_with_password({"email": email, "password": password})
+    _store_session(res.session, res.user)
 
     # 오직 두 계정만 가정 → 이메일로 역할 직접 지정
     role = "admin" if email.lower() == "admin@test.com" else "user"
@@ -20,11 +40,86 @@ def sign_out() -> None:
     st.session_state.clear()
 
 # 2) 세션 복구 & 편의 함수
+def _token_expiry(access_token: str) -> float:
+    """JWT 의 exp 를 서명 검증 없이 읽는다 (검증은 요청을 받는 Supabase 가 한다). 읽을 수 없으면 0."""
+    try:
+        payload = access_token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0.0
+
+def _store_session(session, user) -> None:
+    st.session_state["sb_session"]    = session
+    st.session_state["sb_user"]       = user
+    st.session_state["sb_expires_at"] = _token_expiry(session.access_token)
+
+def _run_refresh(auth, refresh_token: str) -> None:
+    try:
+        result = auth.refresh_session(refresh_token)
+    except Exception as e:
+        result = e
+    now = time.time()
+    with _refresh_lock:
+        _refresh_threads.pop(refresh_token, None)
+        _refresh_results[refresh_token] = (now, result)
+        for token in [t for t, (at, _) in _refresh_results.items() if at < now - _RESULT_MAX_AGE]:
+            del _refresh_results[token]
+
+def _start_refresh(refresh_token: str) -> threading.Thread | None:
+    """이 토큰의 갱신이 진행 중이 아니고 결과도 없으면 백그라운드 갱신을 시작한다."""
+    auth = get_auth_client()
+    with _refresh_lock:
+        thread = _refresh_threads.get(refresh_token)
+        if thread is None and refresh_token not in _refresh_results:
+            thread = threading.Thread(
+                target=_run_refresh, args=(auth, refresh_token), name="auth-refresh", daemon=True
+            )
+            _refresh_threads[refresh_token] = thread
+            thread.start()
+    return thread
+
+def _apply_refresh_result(refresh_token: str) -> bool:
+    """끝난 갱신 결과가 있으면 세션에 반영한다. 새 세션을 받았으면 True."""
+    with _refresh_lock:
+        entry = _refresh_results.pop(refresh_token, None)
+    if entry is None:
+        return False
+    result = entry[1]
+    if isinstance(result, Exception) or not getattr(result, "session", None):
+        logger.warning(f"세션 갱신 실패: {result}")
+        return False
+    _store_session(result.session, result.user)
+    return True
+
 def _restore_session() -> None:
-    if "sb_session" in st.session_state:
-        at = st.session_state["sb_session"].access_token
-        rt = st.session_state["sb_session"].refresh_token
-        sb.auth.set_session(at, rt)
+    """
+    access token 이 충분히 남아 있으면 세션 상태 조회만 하고 끝난다.
+    만료가 가까우면 백그라운드에서 갱신하고, 거의 만료되었으면 갱신을 기다린다.
+    """
+    session = st.session_state.get("sb_session")
+    if session is None:
+        return
+
+    if _apply_refresh_result(session.refresh_token):
+        session = st.session_state["sb_session"]
+
+    if "sb_expires_at" not in st.session_state:
+        st.session_state["sb_expires_at"] = _token_expiry(session.access_token)
+    remaining = st.session_state["sb_expires_at"] - time.time()
+    if remaining > REFRESH_WINDOW_SECONDS:
+        return
+
+    thread = _start_refresh(session.refresh_token)
+    if remaining > MIN_TOKEN_LIFETIME_SECONDS:
+        return
+
+    if thread is not None:
+        thread.join(timeout=10)
+    if not _apply_refresh_result(session.refresh_token) and remaining <= 0:
+        # 만료된 토큰을 갱신하지 못했으면 다시 로그인하도록 한다
+        logger.warning("세션이 만료되어 로그아웃합니다.")
+        sign_out()
 
 def get_current_user():
     _restore_session()
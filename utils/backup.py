@@ -0,0 +1,219 @@
+# utils/backup.py
+"""
+공연·곡·설명·템플릿 백업과 복원.
+
+생성된 AI 설명은 다시 만들려면 비용이 드므로 주기적으로 받아 둔다. 각 테이블을 id 키셋으로
+BACKUP_PAGE_SIZE 행씩 읽어 바로 파일에 쓰므로 카탈로그 크기와 관계없이 메모리 사용량이 일정하다.
+
+    python -m utils.backup dump backup.jsonl.gz [--parquet 디렉터리]
+    python -m utils.backup restore backup.jsonl.gz
+    python -m utils.backup restore --parquet 디렉터리
+
+백업 파일은 gzip JSONL 이다. 첫 줄은 {"format": "classicue-backup", ...} 머리글,
+이후 한 줄에 {"table": 테이블, "row": {...}} 하나. --parquet 을 주면 테이블마다
+<테이블>.parquet 도 함께 쓴다 (pyarrow 필요, 분석용).
+
+복원은 외래 키 순서(템플릿 → 공연 → 곡 → 설명)로 id 를 그대로 넣고 이미 있는 id 는 건너뛰므로,
+중간에 실패해도 같은 명령을 다시 실행하면 이어서 복원된다.
+템플릿 이름은 고유하므로, 복원 대상 DB 에 같은 이름의 템플릿이 다른 id 로 이미 있으면
+백업의 템플릿은 넣지 않고 설명의 template_id 를 기존 템플릿 id 로 바꿔 넣는다.
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Iterator
+from utils.cache import invalidate
+from utils.data_backends import TABLES, TABLE_COLUMNS, get_backend
+
+logger = logging.getLogger(__name__)
+
+BACKUP_FORMAT = "classicue-backup"
+BACKUP_VERSION = 1
+
+# 한 번에 읽고 쓰는 행 수. Supabase 는 응답 행 수 상한(기본 1000)이 있어 이보다 크게 주어도
+# 페이지가 상한에서 잘리므로 iter_rows 는 빈 페이지에서만 끝낸다.
+BACKUP_PAGE_SIZE = int(os.getenv("BACKUP_PAGE_SIZE", "1000"))
+
+# Parquet 정수 컬럼 (나머지는 문자열)
+_INTEGER_COLUMNS = {"version", "template_version"}
+
+def iter_rows(table: str, page_size: int = BACKUP_PAGE_SIZE) -> Iterator[list[dict]]:
+    """table 의 모든 행을 id 순 페이지 단위로. 페이지는 page_size 보다 작을 수 있다."""
+    db = get_backend()
+    after_id = None
+    while True:
+        rows = db.scan(table, after_id, page_size)
+        if rows and rows[-1]["id"] == after_id:
+            # 커서가 나아가지 않으면 같은 페이지를 무한히 읽게 되므로 중단
+            raise RuntimeError(f"{table} 조회 커서가 반복됩니다: {after_id}")
+        if not rows:
+            return
+        yield rows
+        after_id = rows[-1]["id"]
+
+class _ParquetWriters:
+    """테이블별 Parquet 파일. 페이지마다 row group 하나를 쓴다."""
+
+    def __init__(self, out_dir: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet 로 내보내려면 pyarrow 를 설치하세요: pip install pyarrow") from e
+        self.pa, self.pq = pa, pq
+        self.out_dir = out_dir
+        self.writers = {}
+        os.makedirs(out_dir, exist_ok=True)
+
+    def schema(self, table: str):
+        pa = self.pa
+        return pa.schema([
+            (column, pa.int64() if column in _INTEGER_COLUMNS else pa.string())
+            for column in TABLE_COLUMNS[table]
+        ])
+
+    def write(self, table: str, rows: list[dict]) -> None:
+        writer = self.writers.get(table)
+        if writer is None:
+            schema = self.schema(table)
+            writer = self.writers[table] = self.pq.ParquetWriter(
+                os.path.join(self.out_dir, f"{table}.parquet"), schema, compression="zstd"
+            )
+        columns = {
+            column: [None if row.get(column) is None else
+                     (row[column] if column in _INTEGER_COLUMNS else str(row[column])) for row in rows]
+            for column in TABLE_COLUMNS[table]
+        }
+        writer.write_table(self.pa.table(columns, schema=writer.schema))
+
+    def close(self) -> None:
+        for writer in self.writers.values():
+            writer.close()
+
+def dump(path: str, parquet_dir: str | None = None, page_size: int = BACKUP_PAGE_SIZE) -> dict[str, int]:
+    """모든 테이블을 path(gzip JSONL) 로 내보낸다. 테이블별 행 수를 반환."""
+    parquet = _ParquetWriters(parquet_dir) if parquet_dir else None
+    counts = {}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "format": BACKUP_FORMAT,
+                "version": BACKUP_VERSION,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "tables": list(TABLES),
+            }) + "\n")
+            for table in TABLES:
+                counts[table] = 0
+                for rows in iter_rows(table, page_size):
+                    for row in rows:
+                        f.write(json.dumps({"table": table, "row": row}, ensure_ascii=False, default=str) + "\n")
+                    if parquet:
+                        parquet.write(table, rows)
+                    counts[table] += len(rows)
+                logger.info(f"백업 {table}: {counts[table]}행")
+        # 끝까지 쓴 뒤에만 기존 백업을 교체
+        os.replace(tmp_path, path)
+    finally:
+        if parquet:
+            parquet.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return counts
+
+def read_backup(path: str) -> Iterator[tuple[str, dict]]:
+    """백업 파일의 (테이블, 행) 을 하나씩."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != BACKUP_FORMAT:
+            raise ValueError(f"백업 파일이 아닙니다: {path}")
+        if header.get("version", 0) > BACKUP_VERSION:
+            raise ValueError(f"지원하지 않는 백업 버전: {header.get('version')}")
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield entry["table"], entry["row"]
+
+def read_parquet(parquet_dir: str, page_size: int = BACKUP_PAGE_SIZE) -> Iterator[tuple[str, dict]]:
+    """dump(parquet_dir=...) 로 만든 디렉터리의 (테이블, 행) 을 외래 키 순서대로."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet 백업을 읽으려면 pyarrow 를 설치하세요: pip install pyarrow") from e
+    for table in TABLES:
+        path = os.path.join(parquet_dir, f"{table}.parquet")
+        if not os.path.exists(path):
+            continue
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=page_size):
+            for row in batch.to_pylist():
+                yield table, row
+
+def restore(entries: Iterator[tuple[str, dict]], page_size: int = BACKUP_PAGE_SIZE) -> dict[str, int]:
+    """
+    (테이블, 행) 들을 page_size 행씩 넣는다. 테이블별 처리 행 수를 반환.
+    행은 외래 키 순서로 와야 한다 (dump 가 그 순서로 쓴다).
+    같은 이름의 템플릿이 다른 id 로 이미 있으면 그 템플릿을 쓴다 (처리 행 수에는 넣지 않음).
+    """
+    db = get_backend()
+    counts = {}
+    batch_table, batch = None, []
+    existing_templates = {t["name"]: t["id"] for t in db.list_templates()}
+    # 백업의 템플릿 id → 같은 이름의 기존 템플릿 id
+    template_ids: dict[str, str] = {}
+
+    def flush():
+        if batch:
+            db.restore_rows(batch_table, batch)
+            counts[batch_table] = counts.get(batch_table, 0) + len(batch)
+            batch.clear()
+
+    for table, row in entries:
+        if table not in TABLE_COLUMNS:
+            raise ValueError(f"알 수 없는 테이블: {table}")
+        if table == "prompt_templates":
+            existing_id = existing_templates.get(row.get("name"))
+            if existing_id is not None and existing_id != row["id"]:
+                template_ids[row["id"]] = existing_id
+                continue
+        elif table == "track_descriptions" and row.get("template_id") in template_ids:
+            row = {**row, "template_id": template_ids[row["template_id"]]}
+        if table != batch_table or len(batch) >= page_size:
+            flush()
+            batch_table = table
+        batch.append(row)
+    flush()
+
+    if template_ids:
+        logger.info(f"같은 이름의 기존 템플릿으로 연결: {len(template_ids)}개")
+    invalidate("concerts", "concert", "templates")
+    return counts
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="공연 데이터 백업·복원 (gzip JSONL / Parquet)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    dump_parser = sub.add_parser("dump", help="백업 파일 만들기")
+    dump_parser.add_argument("path", help="예: backup.jsonl.gz")
+    dump_parser.add_argument("--parquet", metavar="디렉터리", help="테이블별 Parquet 파일도 쓰기")
+
+    restore_parser = sub.add_parser("restore", help="백업에서 복원")
+    restore_parser.add_argument("path", nargs="?", help="dump 로 만든 .jsonl.gz")
+    restore_parser.add_argument("--parquet", metavar="디렉터리", help="Parquet 디렉터리에서 복원")
+
+    for p in (dump_parser, restore_parser):
+        p.add_argument("--page-size", type=int, default=BACKUP_PAGE_SIZE)
+    args = parser.parse_args()
+
+    if args.command == "dump":
+        counts = dump(args.path, args.parquet, args.page_size)
+    elif args.parquet:
+        counts = restore(read_parquet(args.parquet, args.page_size), args.page_size)
+    elif args.path:
+        counts = restore(read_backup(args.path), args.page_size)
+    else:
+        parser.error("복원할 파일 또는 --parquet 디렉터리를 지정하세요.")
+    print(", ".join(f"{table} {count}행" for table, count in counts.items()))
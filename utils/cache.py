@@ -0,0 +1,331 @@
+# utils/cache.py
+"""
+프로세스 공용 읽기 캐시 (read-through + TTL + 키 단위 무효화).
+
+st.cache_data 는 함수 단위로만 비울 수 있어 관리자 저장 한 번에 모든 캐시가
+사라졌다. 여기서는 엔티티별 키를 계층형 문자열로 관리한다.
+
+    concerts                         공연 목록 페이지들 (concerts:<정렬>:<커서>:<크기>)
+    concert:<id>                     공연 상세
+    concert:<id>:tracks              공연의 곡 목록
+    concert:<id>:descriptions:<tid>  곡 설명 목록
+    templates                        프롬프트 템플릿
+
+invalidate("concert:<id>") 는 그 키와 하위 키(concert:<id>:...)만 지운다.
+
+공연 당일에는 Supabase 가 느리거나 끊겨도 페이지가 떠야 하므로, swr=True 인 키는
+TTL 이 지나도 기존 값을 즉시 반환하고 백그라운드에서 갱신하며, snapshot=True 인 키는
+마지막으로 성공한 조회 결과를 로컬 디스크에 남겨 백엔드 오류 시 대신 사용한다.
+
+레플리카가 여럿이면 CLASSICUE_CACHE_BACKEND 로 공용 2차 캐시(L2)를 지정한다
+(utils/cache_backends.py). 이 모듈의 메모리 캐시는 그 앞단(L1)으로 동작한다.
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable
+from urllib.parse import quote, unquote
+from utils.cache_backends import create_backend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60
+
+# 같은 시각에 채워진 키들이 한꺼번에 만료되지 않도록 TTL 에 더하는 최대 비율
+TTL_JITTER = 0.1
+
+# TTL 이 지난 값을 swr 용으로 메모리에 보관하는 최대 시간 (초)
+STALE_MAX_AGE = 24 * 60 * 60
+
+# 메모리 캐시 최대 키 수. 넘으면 신선 기한이 가장 이른 키부터 10% 를 내보낸다
+MAX_ENTRIES = int(os.getenv("CLASSICUE_CACHE_MAX_ENTRIES", "10000"))
+
+# 보관 기한이 지난 키를 훑어 지우는 간격 (초)
+PRUNE_INTERVAL = 60
+
+# 마지막 정상 조회 결과(last-known-good) 저장 위치
+SNAPSHOT_DIR = os.getenv("CLASSICUE_SNAPSHOT_DIR", ".cache/snapshots")
+
+class TTLCache:
+    """스레드 안전한 메모리 캐시. 모든 세션이 같은 인스턴스를 공유한다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> (값, 신선 기한, 보관 기한)
+        self._entries: dict[str, tuple[Any, float, float]] = {}
+        self._versions: dict[str, int] = {}
+        # invalidate()·clear() 가 호출될 때마다 증가. 조회 도중 무효화된 결과를 저장하지 않기 위해 사용
+        self.generation = 0
+        self._next_prune = time.monotonic() + PRUNE_INTERVAL
+
+    def get(self, key: str, default=None):
+        value, fresh = self.get_stale(key, default)
+        return value if fresh else default
+
+    def get_stale(self, key: str, default=None) -> tuple[Any, bool]:
+        """(값, TTL 이내 여부). 보관 기한이 지났거나 없으면 (default, False)."""
+        with self._lock:
+            entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or entry[2] < now:
+            return default, False
+        return entry[0], entry[1] >= now
+
+    def set(self, key: str, value, ttl: float = DEFAULT_TTL, generation: int | None = None) -> None:
+        """generation 이 주어지면 그 사이 무효화가 없었을 때만 저장한다."""
+        now = time.monotonic()
+        fresh_until = now + ttl * (1 + random.uniform(0, TTL_JITTER))
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (value, fresh_until, fresh_until + STALE_MAX_AGE)
+            if now >= self._next_prune or len(self._entries) > MAX_ENTRIES:
+                self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """보관 기한이 지난 키를 지우고, 그래도 MAX_ENTRIES 를 넘으면 오래된 키부터 내보낸다. _lock 안에서 호출."""
+        self._next_prune = now + PRUNE_INTERVAL
+        for k in [k for k, entry in self._entries.items() if entry[2] < now]:
+            del self._entries[k]
+        if len(self._entries) > MAX_ENTRIES:
+            by_age = sorted(self._entries, key=lambda k: self._entries[k][1])
+            for k in by_age[:len(by_age) - MAX_ENTRIES * 9 // 10]:
+                del self._entries[k]
+
+    def invalidate(self, *keys: str) -> None:
+        """키와 그 하위 키를 삭제하고 각 키의 버전을 올린다."""
+        with self._lock:
+            for key in keys:
+                child_prefix = f"{key}:"
+                for k in [k for k in self._entries if k == key or k.startswith(child_prefix)]:
+                    del self._entries[k]
+                self._versions[key] = self._versions.get(key, 0) + 1
+            self.generation += 1
+
+    def version(self, key: str) -> int:
+        """invalidate(key) 가 호출된 횟수. 세션에 보관한 파생 데이터의 최신 여부 확인용."""
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출을 하나로 합친다.
+
+    첫 호출(리더)만 fn() 을 실행하고, 그동안 들어온 호출들은 리더가 끝나기를
+    기다렸다가 같은 결과(또는 같은 예외)를 받는다. 호출이 끝나면 키는 비워진다.
+    forget() 으로 떼어낸 호출에는 더 이상 합류하지 않고 다음 호출이 새 리더가 된다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def forget(self, *keys: str) -> None:
+        """키와 하위 키의 진행 중인 호출을 떼어낸다 (무효화 전에 시작된 조회 결과를 새 호출에 주지 않도록)."""
+        with self._lock:
+            for key in keys:
+                child_prefix = f"{key}:"
+                for k in [k for k in self._calls if k == key or k.startswith(child_prefix)]:
+                    del self._calls[k]
+
+    def do(self, key: str, fn: Callable[[], Any]):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                # forget() 후 다른 리더가 같은 키를 다시 등록했을 수 있다
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+# ──────────────────────────
+# last-known-good 스냅샷 (로컬 디스크)
+# ──────────────────────────
+def _snapshot_path(key: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, quote(key, safe="") + ".json")
+
+def save_snapshot(key: str, value) -> None:
+    """값을 JSON 으로 원자적으로 기록한다. 실패해도 조회 흐름은 막지 않는다."""
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        path = _snapshot_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"스냅샷 저장 실패 - {key}: {str(e)}")
+
+def load_snapshot(key: str, default=None):
+    try:
+        with open(_snapshot_path(key), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def delete_snapshots(*keys: str) -> None:
+    """키와 하위 키의 스냅샷을 지운다 (삭제된 공연이 장애 시 되살아나지 않도록)."""
+    try:
+        names = os.listdir(SNAPSHOT_DIR)
+    except OSError:
+        return
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        snap_key = unquote(name[:-len(".json")])
+        if any(snap_key == key or snap_key.startswith(f"{key}:") for key in keys):
+            try:
+                os.remove(os.path.join(SNAPSHOT_DIR, name))
+            except OSError:
+                pass
+
+_MISSING = object()
+_cache = TTLCache()
+_flight = SingleFlight()
+
+def _on_remote_invalidation(keys: list[str]) -> None:
+    """다른 레플리카에서 무효화한 키를 이 프로세스의 L1·스냅샷에서도 지운다."""
+    _cache.invalidate(*keys)
+    _flight.forget(*keys)
+    delete_snapshots(*keys)
+
+_shared = create_backend(os.getenv("CLASSICUE_CACHE_BACKEND"))
+if _shared is not None:
+    _shared.subscribe(_on_remote_invalidation)
+
+def _refresh_in_background(key: str, load: Callable[[], Any]) -> None:
+    """swr 갱신. 같은 키의 조회가 이미 진행 중이면 새로 시작하지 않는다."""
+    if _flight.in_flight(key):
+        return
+
+    def run():
+        try:
+            _flight.do(key, load)
+        except Exception as e:
+            logger.warning(f"백그라운드 갱신 실패, 이전 값 유지 - {key}: {str(e)}")
+
+    threading.Thread(target=run, name=f"cache-refresh:{key}", daemon=True).start()
+
+def cached(key: str,
+           loader: Callable[[], Any],
+           ttl: float = DEFAULT_TTL,
+           swr: bool = False,
+           snapshot: bool = False):
+    """
+    캐시에 값이 있으면 반환하고, 없거나 만료되었으면 loader() 결과를 저장 후 반환한다.
+    loader 가 예외를 던지면 캐시하지 않고 그대로 전파한다.
+    loader 가 None(찾는 항목 없음)을 반환하면 캐시·스냅샷에 남기지 않는다.
+    반환값은 모든 세션이 공유하는 객체이므로 호출 측에서 수정하지 않는다.
+
+    같은 키의 캐시 미스가 동시에 여러 세션에서 발생해도 loader 는 한 번만 실행된다
+    (QR 코드로 수백 명이 같은 공연 페이지를 여는 경우).
+
+    Args:
+        swr: TTL 이 지난 값이 남아 있으면 즉시 반환하고 백그라운드에서 갱신
+        snapshot: 조회 성공 시 디스크에 저장하고, 조회 실패 시 저장본을 대신 반환
+    """
+    value, fresh = _cache.get_stale(key, _MISSING)
+    if fresh:
+        return value
+
+    def load():
+        # 앞선 리더가 방금 채웠을 수 있으므로 다시 확인
+        value = _cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        generation = _cache.generation
+        shared_key = None
+        if _shared is not None:
+            # 다른 레플리카가 이미 채운 값이 있으면 그것을 사용
+            try:
+                shared_key = _shared.versioned_key(key)
+                entry = _shared.get(shared_key)
+            except Exception as e:
+                logger.warning(f"공용 캐시 사용 불가 - {key}: {str(e)}")
+                entry = None
+            if entry is not None and entry[1] >= time.time():
+                value = entry[0]
+                _cache.set(key, value, entry[1] - time.time(), generation=generation)
+                return value
+
+        value = loader()
+        if value is None:
+            # 아직 없는 항목을 TTL 동안 "없음" 으로 굳히지 않는다
+            return value
+        _cache.set(key, value, ttl, generation=generation)
+        if shared_key is not None:
+            # 조회 중 무효화되었다면 버전이 바뀌어 이 키는 더 이상 읽히지 않는다
+            now = time.time()
+            _shared.set(shared_key, value, now + ttl, now + ttl + STALE_MAX_AGE)
+        if snapshot:
+            save_snapshot(key, value)
+        return value
+
+    if swr and value is not _MISSING:
+        _refresh_in_background(key, load)
+        return value
+
+    try:
+        return _flight.do(key, load)
+    except Exception:
+        if snapshot:
+            saved = load_snapshot(key, _MISSING)
+            if saved is not _MISSING:
+                logger.warning(f"백엔드 조회 실패, 마지막 정상 스냅샷 사용 - {key}")
+                return saved
+        raise
+
+def single_flight(key: str, fn: Callable[[], Any]):
+    """캐시하지 않는 조회(검색 등)도 동시에 들어온 동일 요청은 한 번만 실행한다."""
+    return _flight.do(key, fn)
+
+def invalidate(*keys: str) -> None:
+    _cache.invalidate(*keys)
+    _flight.forget(*keys)
+    delete_snapshots(*keys)
+    if _shared is not None:
+        try:
+            _shared.invalidate(list(keys))
+        except Exception as e:
+            logger.error(f"공용 캐시 무효화 실패 - {keys}: {str(e)}")
+
+def version(key: str) -> int:
+    return _cache.version(key)
+
+def clear() -> None:
+    _cache.clear()
@@ -0,0 +1,250 @@
+# utils/cache_backends.py
+"""
+여러 Streamlit 레플리카가 함께 쓰는 2차(L2) 캐시 저장소.
+
+utils/cache.py 의 메모리 캐시(L1)는 프로세스마다 따로라서, 레플리카를 늘리면
+각자 캐시를 데우고 관리자 무효화도 관리자가 붙은 레플리카에만 반영됐다.
+CLASSICUE_CACHE_BACKEND 환경변수로 공용 저장소를 지정한다.
+
+    (미지정) / memory://        L2 없음 (단일 프로세스)
+    sqlite:///경로/cache.db     같은 호스트의 레플리카끼리 공유
+    redis://호스트:6379/0       여러 호스트에서 공유 (redis 패키지 필요)
+
+저장 키에는 조상 키들의 버전이 붙는다 (버전 키 방식).
+
+    concert:<id>:tracks  →  concert:<id>:tracks#3.1.0
+
+invalidate("concert:<id>") 는 "concert:<id>" 의 버전만 올리므로 하위 키들을
+찾아 지울 필요 없이 한 번의 INCR 로 모두 무효화되고, 옛 항목은 만료 시 사라진다.
+다른 레플리카의 L1 은 publish_invalidation() 방송을 받아 비운다.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# 이 프로세스가 보낸 방송을 구분하기 위한 id
+INSTANCE_ID = uuid.uuid4().hex
+
+def _ancestors(key: str) -> list[str]:
+    """'concert:a:tracks' → ['concert', 'concert:a', 'concert:a:tracks']"""
+    parts = key.split(":")
+    return [":".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+class CacheBackend:
+    """
+    L2 저장소 공통부. 하위 클래스는 _get/_set/_incr/_mget 과 방송 두 가지만 구현한다.
+    값은 JSON 으로 저장하며 시각은 레플리카 간 비교를 위해 벽시계(time.time) 기준이다.
+    """
+
+    # ── 하위 클래스 구현부 ──
+    def _get(self, raw_key: str) -> str | None:
+        raise NotImplementedError
+
+    def _set(self, raw_key: str, payload: str, expire_seconds: float) -> None:
+        raise NotImplementedError
+
+    def _incr(self, version_key: str) -> None:
+        raise NotImplementedError
+
+    def _mget(self, version_keys: list[str]) -> list[int]:
+        raise NotImplementedError
+
+    def publish_invalidation(self, keys: list[str]) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, callback: Callable[[list[str]], None]) -> None:
+        """다른 레플리카의 무효화 방송을 받으면 callback(keys) 를 호출한다."""
+        raise NotImplementedError
+
+    # ── 공통 ──
+    def versioned_key(self, key: str) -> str:
+        versions = self._mget([f"v:{a}" for a in _ancestors(key)])
+        return f"{key}#{'.'.join(str(v) for v in versions)}"
+
+    def get(self, versioned_key: str) -> tuple[Any, float, float] | None:
+        """(값, 신선 기한, 보관 기한) 또는 None."""
+        try:
+            payload = self._get(versioned_key)
+        except Exception as e:
+            logger.warning(f"공용 캐시 조회 실패 - {versioned_key}: {str(e)}")
+            return None
+        if payload is None:
+            return None
+        entry = json.loads(payload)
+        if entry["e"] < time.time():
+            return None
+        return entry["v"], entry["f"], entry["e"]
+
+    def set(self, versioned_key: str, value, fresh_until: float, expires_at: float) -> None:
+        payload = json.dumps({"v": value, "f": fresh_until, "e": expires_at},
+                             ensure_ascii=False, default=str)
+        try:
+            self._set(versioned_key, payload, max(expires_at - time.time(), 1))
+        except Exception as e:
+            logger.warning(f"공용 캐시 저장 실패 - {versioned_key}: {str(e)}")
+
+    def invalidate(self, keys: list[str]) -> None:
+        for key in keys:
+            self._incr(f"v:{key}")
+        self.publish_invalidation(keys)
+
+class SQLiteBackend(CacheBackend):
+    """같은 호스트의 여러 프로세스가 파일 하나를 공유한다 (WAL 모드)."""
+
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, path: str):
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("pragma journal_mode=wal")
+        conn.executescript(
+            """
+            create table if not exists cache_entries (
+                key        text primary key,
+                payload    text not null,
+                expires_at real not null
+            );
+            create table if not exists cache_versions (
+                key     text primary key,
+                version integer not null
+            );
+            create table if not exists cache_invalidations (
+                id         integer primary key autoincrement,
+                origin     text not null,
+                keys       text not null,
+                created_at real not null
+            );
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간 공유하지 않는다
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        return conn
+
+    def _get(self, raw_key):
+        row = self._conn().execute(
+            "select payload from cache_entries where key = ? and expires_at >= ?",
+            (raw_key, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, raw_key, payload, expire_seconds):
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "insert or replace into cache_entries (key, payload, expires_at) values (?, ?, ?)",
+            (raw_key, payload, now + expire_seconds),
+        )
+        # 버전이 바뀌어 고아가 된 항목 정리
+        conn.execute("delete from cache_entries where expires_at < ?", (now,))
+
+    def _incr(self, version_key):
+        self._conn().execute(
+            "insert into cache_versions (key, version) values (?, 1) "
+            "on conflict(key) do update set version = version + 1",
+            (version_key,),
+        )
+
+    def _mget(self, version_keys):
+        placeholders = ",".join("?" for _ in version_keys)
+        rows = dict(self._conn().execute(
+            f"select key, version from cache_versions where key in ({placeholders})",
+            version_keys,
+        ).fetchall())
+        return [rows.get(k, 0) for k in version_keys]
+
+    def publish_invalidation(self, keys):
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "insert into cache_invalidations (origin, keys, created_at) values (?, ?, ?)",
+            (INSTANCE_ID, json.dumps(keys, ensure_ascii=False), now),
+        )
+        conn.execute("delete from cache_invalidations where created_at < ?", (now - 3600,))
+
+    def subscribe(self, callback):
+        last_id = self._conn().execute(
+            "select coalesce(max(id), 0) from cache_invalidations"
+        ).fetchone()[0]
+
+        def poll():
+            nonlocal last_id
+            while True:
+                time.sleep(self.POLL_INTERVAL)
+                try:
+                    rows = self._conn().execute(
+                        "select id, origin, keys from cache_invalidations where id > ? order by id",
+                        (last_id,),
+                    ).fetchall()
+                except Exception as e:
+                    logger.warning(f"무효화 로그 조회 실패: {str(e)}")
+                    continue
+                for row_id, origin, keys in rows:
+                    last_id = row_id
+                    if origin != INSTANCE_ID:
+                        callback(json.loads(keys))
+
+        threading.Thread(target=poll, name="cache-invalidation-poll", daemon=True).start()
+
+class RedisBackend(CacheBackend):
+    """Redis 프로토콜 서버(Redis, Valkey, KeyDB 등)를 공유 저장소로 사용한다."""
+
+    PREFIX = "classicue:"
+    CHANNEL = "classicue:invalidate"
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("Redis 캐시를 사용하려면 redis 패키지를 설치하세요: pip install redis") from e
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    def _get(self, raw_key):
+        return self.client.get(self.PREFIX + raw_key)
+
+    def _set(self, raw_key, payload, expire_seconds):
+        self.client.set(self.PREFIX + raw_key, payload, ex=int(expire_seconds) + 1)
+
+    def _incr(self, version_key):
+        self.client.incr(self.PREFIX + version_key)
+
+    def _mget(self, version_keys):
+        values = self.client.mget([self.PREFIX + k for k in version_keys])
+        return [int(v) if v else 0 for v in values]
+
+    def publish_invalidation(self, keys):
+        self.client.publish(self.CHANNEL, json.dumps({"origin": INSTANCE_ID, "keys": keys}, ensure_ascii=False))
+
+    def subscribe(self, callback):
+        def handle(message):
+            data = json.loads(message["data"])
+            if data["origin"] != INSTANCE_ID:
+                callback(data["keys"])
+
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.CHANNEL: handle})
+        pubsub.run_in_thread(sleep_time=0.5, daemon=True)
+
+def create_backend(url: str | None) -> CacheBackend | None:
+    """CLASSICUE_CACHE_BACKEND 값으로 L2 저장소를 만든다. 메모리 전용이면 None."""
+    if not url or url.startswith("memory://"):
+        return None
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"지원하지 않는 캐시 백엔드: {url}")
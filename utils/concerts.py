@@ -0,0 +1,203 @@
+# utils/concerts.py
+import logging
+import os
+import threading
+import uuid
+import streamlit as st
+from utils.data_backends import get_backend
+from utils.search import CONCERT_SORTS
+from utils.cache import cached, invalidate, version
+
+logger = logging.getLogger(__name__)
+
+# 목록 한 번에 가져올 공연 수 (환경변수로 조정 가능)
+CONCERT_PAGE_SIZE = int(os.getenv("CONCERT_PAGE_SIZE", "20"))
+
+# 엔티티별 캐시 TTL (초). 관객용 조회는 TTL 이 지나도 이전 값을 먼저 보여주고(swr)
+# 백엔드 장애 시 디스크 스냅샷으로 대신한다 (utils/cache.py 참고).
+LIST_TTL   = 60
+DETAIL_TTL = 300
+
+# 곡 설명을 펼쳤을 때 백그라운드로 미리 읽어 둘 다음 곡 수
+DESCRIPTION_PREFETCH = int(os.getenv("DESCRIPTION_PREFETCH_TRACKS", "3"))
+
+def list_concerts_page(sort: str = "date_desc",
+                       cursor: tuple | None = None,
+                       page_size: int = CONCERT_PAGE_SIZE) -> tuple[list[dict], tuple | None]:
+    """
+    (정렬 컬럼, id) 키셋으로 공연 목록 한 페이지를 조회한다.
+
+    Args:
+        sort: utils.search.CONCERT_SORTS 의 키
+        cursor: 이전 페이지 마지막 행의 (정렬 값, id). None 이면 첫 페이지.
+            정렬 값이 NULL 인 행은 '' 로 정렬되며 커서에도 '' 로 담긴다.
+        page_size: 페이지당 공연 수
+
+    Returns:
+        (공연 목록, 다음 페이지 커서 — 더 없으면 None)
+    """
+    column, desc = CONCERT_SORTS.get(sort, CONCERT_SORTS["date_desc"])
+    after_value, after_id = cursor if cursor else (None, None)
+
+    # 한 행 더 받아 다음 페이지 존재 여부를 판단
+    rows = cached(
+        f"concerts:{sort}:{after_value}:{after_id}:{page_size}",
+        lambda: get_backend().list_concerts_page(column, desc, after_value, after_id, page_size + 1),
+        ttl=LIST_TTL,
+        swr=True,
+        snapshot=True,
+    )
+
+    if len(rows) <= page_size:
+        return list(rows), None
+
+    rows = rows[:page_size]
+    return rows, (rows[-1][column] or "", rows[-1]["id"])
+
+def get_paged_concerts(state_key: str,
+                       sort: str = "date_desc",
+                       page_size: int = CONCERT_PAGE_SIZE) -> dict:
+    """
+    세션에 누적된 공연 목록을 반환한다. 처음에는 첫 페이지만 조회한다.
+
+    반환값은 {"rows": [...], "cursor": 다음 커서, ...} 이며,
+    load_more_concerts() 로 다음 페이지를 이어 붙인다.
+    """
+    pages = st.session_state.setdefault("concert_pages", {})
+    entry = pages.get(state_key)
+
+    # 관리자가 공연을 추가·삭제하면 (invalidate("concerts")) 처음부터 다시 구성
+    catalog_version = version("concerts")
+    if (entry is None or entry["sort"] != sort or entry["page_size"] != page_size
+            or entry["version"] != catalog_version):
+        rows, cursor = list_concerts_page(sort, None, page_size)
+        entry = pages[state_key] = {
+            "sort": sort,
+            "page_size": page_size,
+            "version": catalog_version,
+            "rows": rows,
+            "cursor": cursor,
+        }
+    return entry
+
+def load_more_concerts(state_key: str) -> None:
+    """다음 페이지만 조회해 기존 목록 뒤에 붙인다 (앞 페이지는 다시 조회하지 않음)."""
+    entry = st.session_state.get("concert_pages", {}).get(state_key)
+    if not entry or entry["cursor"] is None:
+        return
+
+    rows, cursor = list_concerts_page(entry["sort"], entry["cursor"], entry["page_size"])
+    entry["rows"].extend(rows)
+    entry["cursor"] = cursor
+
+def is_concert_id(value) -> bool:
+    """공연 id(uuid) 형식인지. 형식 오류를 백엔드마다 다른 예외 대신 '없음' 으로 다루기 위해 먼저 확인한다."""
+    try:
+        uuid.UUID(str(value))
+    except ValueError:
+        return False
+    return True
+
+def get_concert(concert_id: str) -> dict | None:
+    """공연 한 건 (없거나 id 형식이 아니면 None)."""
+    if not is_concert_id(concert_id):
+        return None
+    return cached(
+        f"concert:{concert_id}",
+        lambda: get_backend().get_concert(concert_id),
+        ttl=DETAIL_TTL,
+        swr=True,
+        snapshot=True,
+    )
+
+def get_concert_tracks(concert_id: str) -> list[dict]:
+    """공연의 곡 목록."""
+    return cached(
+        f"concert:{concert_id}:tracks",
+        lambda: get_backend().get_tracks(concert_id),
+        ttl=DETAIL_TTL,
+        swr=True,
+        snapshot=True,
+    )
+
+def get_track_descriptions(concert_id: str, track_id: str) -> list[dict]:
+    """곡의 AI 설명 목록. 공연 단위로 함께 무효화되도록 공연 키 아래에 둔다."""
+    return cached(
+        f"concert:{concert_id}:descriptions:{track_id}",
+        lambda: get_backend().get_descriptions(track_id),
+        ttl=DETAIL_TTL,
+        swr=True,
+        snapshot=True,
+    )
+
+def get_concert_descriptions(concert_id: str, track_ids: list[str]) -> dict[str, list[dict]]:
+    """공연의 곡 설명 전체를 한 번의 조회로 받아 곡 id 별로 묶는다 (관리 화면용)."""
+    def load():
+        grouped = {track_id: [] for track_id in track_ids}
+        for desc in get_backend().get_descriptions_for_tracks(track_ids):
+            grouped.setdefault(desc["track_id"], []).append(desc)
+        return grouped
+
+    # 곡 추가·삭제(invalidate_track)와 설명 변경(invalidate_descriptions) 시 함께 비운다
+    return cached(
+        f"concert:{concert_id}:descriptions_by_track",
+        load,
+        ttl=DETAIL_TTL,
+    )
+
+def prefetch_track_descriptions(concert_id: str, track_ids: list[str]) -> None:
+    """
+    곡 설명들을 백그라운드 스레드에서 캐시에 미리 채운다.
+    이미 캐시된 곡은 조회하지 않으며, 같은 곡을 화면에서 동시에 열면 진행 중인 조회를 함께 기다린다.
+    """
+    if not track_ids:
+        return
+
+    def run():
+        for track_id in track_ids:
+            try:
+                get_track_descriptions(concert_id, track_id)
+            except Exception as e:
+                logger.warning(f"곡 설명 미리 읽기 실패 - {track_id}: {str(e)}")
+
+    threading.Thread(target=run, name=f"prefetch:{concert_id}", daemon=True).start()
+
+def _export_static(concert_id: str | None) -> None:
+    """정적 HTML 을 내보내는 배포라면 바뀐 공연 파일만 다시 만든다 (utils/static_export.py)."""
+    if concert_id:
+        from utils.static_export import schedule_export
+        schedule_export(concert_id)
+
+def invalidate_concert(concert_id: str | None = None) -> None:
+    """
+    공연 목록 캐시와 (지정 시) 해당 공연의 상세·곡·설명 캐시만 비운다.
+    다른 공연과 템플릿 캐시는 그대로 유지된다.
+    """
+    keys = ["concerts"]
+    if concert_id:
+        keys.append(f"concert:{concert_id}")
+    invalidate(*keys)
+    _export_static(concert_id)
+
+def invalidate_concerts(concert_ids: list[str]) -> None:
+    """공연 여러 개를 삭제한 뒤: 목록 캐시와 각 공연의 상세 캐시를 한 번에 비운다."""
+    invalidate("concerts", *(f"concert:{cid}" for cid in concert_ids))
+    for concert_id in concert_ids:
+        _export_static(concert_id)
+
+def invalidate_track(concert_id: str, track_id: str) -> None:
+    """곡 추가·삭제 시: 공연의 곡 목록과 해당 곡 설명 캐시만 비운다."""
+    invalidate(
+        f"concert:{concert_id}:tracks",
+        f"concert:{concert_id}:descriptions:{track_id}",
+        f"concert:{concert_id}:descriptions_by_track",
+    )
+    _export_static(concert_id)
+
+def invalidate_descriptions(concert_id: str, track_id: str) -> None:
+    """설명 추가·삭제·재생성 시: 해당 곡 설명 캐시만 비운다."""
+    invalidate(
+        f"concert:{concert_id}:descriptions:{track_id}",
+        f"concert:{concert_id}:descriptions_by_track",
+    )
+    _export_static(concert_id)
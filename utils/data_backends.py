@@ -0,0 +1,1040 @@
+# utils/data_backends.py
+"""
+공연 데이터 저장소 (concerts, concert_tracks, track_descriptions, prompt_templates).
+
+페이지와 utils 모듈은 Supabase 클라이언트 대신 get_backend() 의 메서드로 읽고 쓴다.
+CLASSICUE_DATA_BACKEND 환경변수로 구현을 고른다.
+
+    (미지정) / supabase://     Supabase (PostgREST) — 운영
+    sqlite:///경로/data.db     로컬 SQLite 파일
+    memory://                  프로세스 메모리 SQLite
+    postgresql://...           Postgres 직접 연결 (psycopg, 일괄 작업용)
+
+SQLite 구현은 비어 있으면 CLASSICUE_FIXTURES 디렉터리(기본 fixtures/)의
+<테이블>.json 을 읽어 채운다. Supabase 프로젝트 없이 페이지를 띄우거나
+같은 데이터로 반복 가능한 성능 측정을 할 때 사용한다.
+
+설명 본문은 description_bodies(hash, body) 에 한 번만 저장되고 track_descriptions 는
+body_hash 로 가리킨다 (migrations/005_description_bodies.sql). 저장소 메서드는 여전히
+{"description": 본문} 형태로 주고받으며 본문 분리·조인은 각 구현이 맡는다.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from postgrest.types import ReturnMethod
+from utils.supabase_client import get_sb_client
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.getenv("CLASSICUE_FIXTURES", "fixtures")
+
+# Postgres 직접 연결 백엔드의 최대 연결 수
+PG_POOL_SIZE = int(os.getenv("CLASSICUE_PG_POOL_SIZE", "10"))
+
+# 목록·검색에서 반환하는 공연 컬럼
+CONCERT_COLUMNS = ("id", "title", "venue", "date", "description")
+
+# 외래 키 순서 (track_descriptions.template_id → prompt_templates)
+TABLES = ("prompt_templates", "concerts", "concert_tracks", "track_descriptions")
+
+# 테이블별 컬럼 (백업·복원, COPY 에 사용. 생성 컬럼 search_vector 등은 제외).
+# track_descriptions 의 description 은 description_bodies 에서 조인한 본문이다.
+TABLE_COLUMNS = {
+    "concerts": ("id", "title", "venue", "date", "description", "created_by", "created_at"),
+    "concert_tracks": ("id", "concert_id", "track_title", "composer"),
+    "track_descriptions": ("id", "track_id", "prompt_type", "description", "template_id", "template_version"),
+    "prompt_templates": ("id", "name", "template", "version", "updated_at"),
+}
+
+# track_descriptions 를 본문과 함께 읽는 SELECT (SQLite·Postgres 공용)
+_DESCRIPTION_SELECT = """
+    select d.id, d.track_id, d.prompt_type, b.body as description, d.template_id, d.template_version
+    from track_descriptions d
+    left join description_bodies b on b.hash = d.body_hash
+"""
+
+def description_hash(body: str) -> str:
+    """설명 본문의 내용 주소: UTF-8 바이트의 sha256 hex (SQL 함수 description_hash 와 같은 값)."""
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+def _split_descriptions(rows: list[dict]) -> tuple[dict[str, str], list[dict]]:
+    """설명 행들을 ({해시: 본문}, description 대신 body_hash 를 담은 행들) 로 나눈다."""
+    bodies, split = {}, []
+    for row in rows:
+        row = dict(row)
+        body = row.pop("description", None)
+        row["body_hash"] = None
+        if body is not None:
+            row["body_hash"] = description_hash(body)
+            bodies[row["body_hash"]] = body
+        split.append(row)
+    return bodies, split
+
+def _scan_select(table: str) -> str:
+    """백업용 SELECT (별칭 d). track_descriptions 는 본문을 조인한다."""
+    if table == "track_descriptions":
+        return _DESCRIPTION_SELECT
+    return f"select {','.join(TABLE_COLUMNS[table])} from {table} d"
+
+class DataBackend:
+    """저장소 공통 인터페이스. 행은 컬럼명 → 값 dict 로 주고받는다."""
+
+    # ── concerts ──
+    def list_concerts_page(self, sort_column: str, descending: bool,
+                           after_value: str | None, after_id: str | None, limit: int) -> list[dict]:
+        """
+        (sort_column, id) 키셋 페이지. after_id 가 None 이면 첫 페이지.
+        NULL 정렬 값은 빈 문자열로 취급한다 (after_value 의 None 도 '').
+        """
+        raise NotImplementedError
+
+    def list_concerts(self, title: str | None, offset: int, limit: int) -> tuple[list[dict], int]:
+        """
+        관리 화면 공연 선택용: 최근 등록순 한 페이지 (id, title, venue, date).
+        title 을 주면 공연명에 포함된 공연만. (현재 페이지, 조건에 맞는 전체 수)
+        """
+        raise NotImplementedError
+
+    def upcoming_concerts(self, from_date: str, limit: int) -> list[dict]:
+        raise NotImplementedError
+
+    def get_concert(self, concert_id: str) -> dict | None:
+        raise NotImplementedError
+
+    def get_concerts(self, concert_ids: list[str]) -> list[dict]:
+        raise NotImplementedError
+
+    def find_concerts(self, column: str, term: str) -> list[dict]:
+        """column 에 term 이 포함된 공연 (대소문자 무시)."""
+        raise NotImplementedError
+
+    def concert_ids_by_composer(self, term: str) -> list[str]:
+        raise NotImplementedError
+
+    def search_concerts(self, title: str | None, venue: str | None, composer: str | None,
+                        start_date: str | None, end_date: str | None,
+                        sort_column: str, descending: bool,
+                        offset: int, limit: int) -> tuple[list[dict], int]:
+        """고급 검색. (현재 페이지 공연 목록, 조건에 맞는 전체 수)"""
+        raise NotImplementedError
+
+    def concert_stats(self, concert_ids: list[str]) -> dict[str, dict]:
+        """공연 id → {"tracks": 곡 수, "descriptions": 설명 수}."""
+        raise NotImplementedError
+
+    def insert_concerts(self, rows: list[dict]) -> None:
+        raise NotImplementedError
+
+    def insert_concert(self, row: dict) -> None:
+        self.insert_concerts([row])
+
+    def delete_concerts(self, concert_ids: list[str]) -> int:
+        """공연들과 그 곡·설명을 한 트랜잭션에서 모두 삭제하고 삭제된 공연 수를 반환한다."""
+        raise NotImplementedError
+
+    def delete_concert(self, concert_id: str) -> None:
+        self.delete_concerts([concert_id])
+
+    # ── concert_tracks ──
+    def get_tracks(self, concert_id: str) -> list[dict]:
+        raise NotImplementedError
+
+    def insert_tracks(self, rows: list[dict]) -> None:
+        raise NotImplementedError
+
+    def delete_track(self, track_id: str) -> None:
+        """곡과 그 설명을 삭제한다."""
+        raise NotImplementedError
+
+    # ── track_descriptions ──
+    def get_descriptions(self, track_id: str) -> list[dict]:
+        raise NotImplementedError
+
+    def get_descriptions_for_tracks(self, track_ids: list[str]) -> list[dict]:
+        """여러 곡의 설명을 한 번에."""
+        raise NotImplementedError
+
+    def insert_descriptions(self, rows: list[dict]) -> None:
+        """설명을 저장한다. 본문은 해시가 같은 행이 이미 있으면 새로 저장하지 않는다."""
+        raise NotImplementedError
+
+    def delete_description(self, description_id: str) -> None:
+        raise NotImplementedError
+
+    def search_descriptions(self, query: str, limit: int, offset: int) -> list[dict]:
+        """
+        설명 본문 검색. 행마다 concert_id, concert_title, concert_date, track_id, track_title,
+        composer, description_id, prompt_type, snippet(<mark> 강조), rank, total_count 를 담는다.
+        """
+        raise NotImplementedError
+
+    # ── prompt_templates ──
+    def list_templates(self) -> list[dict]:
+        raise NotImplementedError
+
+    def save_templates(self, rows: list[dict]) -> list[dict]:
+        """
+        rows({"name", "template"}) 를 현재 템플릿 전체로 만든다 (한 트랜잭션).
+        이름이 같은 템플릿은 id 를 유지하고 내용이 바뀐 경우에만 version 을 올리며,
+        rows 에 없는 이름은 삭제한다. 추가·변경된 행을 반환한다.
+        """
+        raise NotImplementedError
+
+    # ── 백업·복원 ──
+    def scan(self, table: str, after_id: str | None, limit: int) -> list[dict]:
+        """table 의 TABLE_COLUMNS 를 id 순으로 after_id 다음부터 limit 행."""
+        raise NotImplementedError
+
+    def restore_rows(self, table: str, rows: list[dict]) -> None:
+        """백업 행을 id 그대로 넣는다. 이미 있는 id 는 건너뛴다 (중단된 복원을 이어서 실행 가능)."""
+        raise NotImplementedError
+
+class SupabaseBackend(DataBackend):
+    """
+    Supabase PostgREST. 읽기는 anon 키, 쓰기는 service 키 클라이언트를 쓴다.
+    목록·검색은 migrations/ 의 RPC 를 호출한다.
+    """
+
+    @staticmethod
+    def _read():
+        return get_sb_client()
+
+    @staticmethod
+    def _write():
+        return get_sb_client(use_service=True)
+
+    def list_concerts_page(self, sort_column, descending, after_value, after_id, limit):
+        return self._read().rpc("list_concerts_page", {
+            "sort_column": sort_column,
+            "descending": descending,
+            "after_value": after_value,
+            "after_id": after_id,
+            "page_limit": limit,
+        }).execute().data or []
+
+    def list_concerts(self, title, offset, limit):
+        query = self._read().table("concerts").select("id,title,venue,date", count="exact")
+        if title:
+            query = query.ilike("title", f"%{title}%")
+        res = query.order("created_at.desc,id").range(offset, offset + limit).execute()
+        return res.data or [], res.count or 0
+
+    def upcoming_concerts(self, from_date, limit):
+        return (
+            self._read().table("concerts").select("*")
+            .gte("date", from_date).order("date").limit(limit)
+            .execute().data
+        ) or []
+
+    def get_concert(self, concert_id):
+        rows = self._read().table("concerts").select("*").eq("id", concert_id).limit(1).execute().data
+        return rows[0] if rows else None
+
+    def get_concerts(self, concert_ids):
+        if not concert_ids:
+            return []
+        return self._read().table("concerts").select(",".join(CONCERT_COLUMNS)).in_("id", concert_ids).execute().data or []
+
+    def find_concerts(self, column, term):
+        return (
+            self._read().table("concerts").select(",".join(CONCERT_COLUMNS))
+            .ilike(column, f"%{term}%").execute().data
+        ) or []
+
+    def concert_ids_by_composer(self, term):
+        rows = self._read().table("concert_tracks").select("concert_id").ilike("composer", f"%{term}%").execute().data
+        return list({row["concert_id"] for row in rows or []})
+
+    def search_concerts(self, title, venue, composer, start_date, end_date,
+                        sort_column, descending, offset, limit):
+        columns = ",".join(CONCERT_COLUMNS)
+        # 작곡가 조건은 concert_tracks 를 !inner 로 임베드해 서버 측 세미조인으로 거른다
+        if composer:
+            columns += ",concert_tracks!inner(id)"
+
+        query = self._read().table("concerts").select(columns, count="exact")
+        if title:
+            query = query.ilike("title", f"%{title}%")
+        if venue:
+            query = query.ilike("venue", f"%{venue}%")
+        if composer:
+            query = query.ilike("concert_tracks.composer", f"%{composer}%")
+        if start_date:
+            query = query.gte("date", start_date)
+        if end_date:
+            query = query.lte("date", end_date)
+
+        # postgrest-py 는 order 를 여러 번 호출하면 파라미터가 중복되므로 한 번에 지정
+        res = (
+            query.order(f"{sort_column}.{'desc' if descending else 'asc'},id")
+            .range(offset, offset + limit)
+            .execute()
+        )
+        concerts = [
+            {k: v for k, v in concert.items() if k != "concert_tracks"}
+            for concert in res.data or []
+        ]
+        return concerts, res.count or 0
+
+    def concert_stats(self, concert_ids):
+        stats = {cid: {"tracks": 0, "descriptions": 0} for cid in concert_ids}
+        if not concert_ids:
+            return stats
+        # PostgREST 1.0 클라이언트에는 집계가 없어 곡 행과 설명 id 만 받아 센다
+        rows = (
+            self._read().table("concert_tracks")
+            .select("concert_id,track_descriptions(id)")
+            .in_("concert_id", concert_ids)
+            .execute().data
+        ) or []
+        for row in rows:
+            entry = stats[row["concert_id"]]
+            entry["tracks"] += 1
+            entry["descriptions"] += len(row.get("track_descriptions") or [])
+        return stats
+
+    def insert_concerts(self, rows):
+        if rows:
+            self._write().table("concerts").insert(rows).execute()
+
+    def delete_concerts(self, concert_ids):
+        if not concert_ids:
+            return 0
+        # migrations/003_cascade_delete.sql — 곡·설명은 외래 키 ON DELETE CASCADE 로 함께 삭제
+        return self._write().rpc("delete_concerts", {"concert_ids": list(concert_ids)}).execute().data or 0
+
+    def get_tracks(self, concert_id):
+        return self._read().table("concert_tracks").select("*").eq("concert_id", concert_id).execute().data or []
+
+    def insert_tracks(self, rows):
+        if rows:
+            self._write().table("concert_tracks").insert(rows).execute()
+
+    def delete_track(self, track_id):
+        # 설명은 외래 키 ON DELETE CASCADE 로 함께 삭제 (migrations/003_cascade_delete.sql)
+        self._write().table("concert_tracks").delete().eq("id", track_id).execute()
+
+    # 본문은 body_hash 외래 키로 임베드해 받는다
+    DESCRIPTION_SELECT = "id,track_id,prompt_type,template_id,template_version,description_bodies(body)"
+
+    @staticmethod
+    def _with_body(rows: list[dict]) -> list[dict]:
+        for row in rows:
+            row["description"] = (row.pop("description_bodies", None) or {}).get("body")
+        return rows
+
+    def get_descriptions(self, track_id):
+        res = self._read().table("track_descriptions").select(self.DESCRIPTION_SELECT).eq("track_id", track_id).execute()
+        return self._with_body(res.data or [])
+
+    def get_descriptions_for_tracks(self, track_ids):
+        if not track_ids:
+            return []
+        res = self._read().table("track_descriptions").select(self.DESCRIPTION_SELECT).in_("track_id", track_ids).execute()
+        return self._with_body(res.data or [])
+
+    def insert_descriptions(self, rows):
+        # migrations/005_description_bodies.sql: 본문 저장과 설명 연결을 한 트랜잭션으로
+        if rows:
+            self._write().rpc("insert_track_descriptions", {"rows": rows}).execute()
+
+    def delete_description(self, description_id):
+        self._write().table("track_descriptions").delete().eq("id", description_id).execute()
+
+    def search_descriptions(self, query, limit, offset):
+        # migrations/009_description_search_id.sql
+        return self._read().rpc("search_track_descriptions", {
+            "q": query,
+            "page_limit": limit,
+            "page_offset": offset,
+        }).execute().data or []
+
+    def list_templates(self):
+        return self._read().table("prompt_templates").select("*").execute().data or []
+
+    def save_templates(self, rows):
+        # migrations/004_template_versions.sql
+        templates = [{"name": row["name"], "template": row["template"]} for row in rows]
+        return self._write().rpc("save_prompt_templates", {"templates": templates}).execute().data or []
+
+    def scan(self, table, after_id, limit):
+        if table == "track_descriptions":
+            query = self._read().table(table).select(self.DESCRIPTION_SELECT)
+        else:
+            query = self._read().table(table).select(",".join(TABLE_COLUMNS[table]))
+        if after_id is not None:
+            query = query.gt("id", after_id)
+        rows = query.order("id").limit(limit).execute().data or []
+        return self._with_body(rows) if table == "track_descriptions" else rows
+
+    def restore_rows(self, table, rows):
+        if table == "track_descriptions":
+            # 이미 있는 id 는 insert_track_descriptions 가 건너뛴다
+            self.insert_descriptions(rows)
+        elif rows:
+            self._write().table(table).upsert(
+                rows, ignore_duplicates=True, on_conflict="id", returning=ReturnMethod.minimal
+            ).execute()
+
+class SQLiteBackend(DataBackend):
+    """
+    로컬 SQLite. 스키마는 Supabase 테이블과 같은 컬럼을 가지며 외래 키는 ON DELETE CASCADE.
+    path 가 None 이면 프로세스 메모리 DB (연결 간 공유).
+    """
+
+    SCHEMA = """
+        create table if not exists concerts (
+            id          text primary key,
+            title       text not null,
+            venue       text,
+            date        text,
+            description text,
+            created_by  text,
+            created_at  text default current_timestamp
+        );
+        create table if not exists concert_tracks (
+            id          text primary key,
+            concert_id  text references concerts(id) on delete cascade,
+            track_title text,
+            composer    text
+        );
+        create index if not exists concert_tracks_concert_id_idx on concert_tracks (concert_id);
+        create table if not exists description_bodies (
+            hash       text primary key,
+            body       text not null,
+            created_at text default current_timestamp
+        );
+        create table if not exists track_descriptions (
+            id               text primary key,
+            track_id         text references concert_tracks(id) on delete cascade,
+            prompt_type      text,
+            body_hash        text references description_bodies(hash),
+            template_id      text references prompt_templates(id) on delete set null,
+            template_version integer
+        );
+        create index if not exists track_descriptions_track_id_idx on track_descriptions (track_id);
+        create index if not exists track_descriptions_body_hash_idx on track_descriptions (body_hash);
+        create table if not exists prompt_templates (
+            id         text primary key,
+            name       text unique,
+            template   text,
+            version    integer not null default 1,
+            updated_at text default current_timestamp
+        );
+    """
+
+    # 스니펫 앞뒤로 보여줄 글자 수
+    SNIPPET_CONTEXT = 40
+
+    def __init__(self, path: str | None = None, fixtures_dir: str | None = FIXTURES_DIR):
+        if path:
+            dirname = os.path.dirname(path)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            self._dsn = path
+        else:
+            # 같은 이름의 공유 캐시 메모리 DB 는 연결이 하나라도 열려 있는 동안 유지된다
+            self._dsn = f"file:classicue-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self._local = threading.local()
+        self._keepalive = self._conn()
+        self._upgrade_descriptions()
+        self._keepalive.executescript(self.SCHEMA)
+        if fixtures_dir and self._is_empty():
+            self.load_fixtures(fixtures_dir)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간 공유하지 않는다
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._dsn, uri=self._dsn.startswith("file:"), timeout=5, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("pragma foreign_keys = on")
+            conn.create_function("description_hash", 1, description_hash, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    def _all(self, sql: str, params=()) -> list[dict]:
+        return [dict(row) for row in self._conn().execute(sql, params).fetchall()]
+
+    def _upgrade_descriptions(self) -> None:
+        """본문을 track_descriptions.description 에 두던 이전 DB 파일을 description_bodies 로 옮긴다."""
+        conn = self._conn()
+        columns = [row["name"] for row in conn.execute("pragma table_info(track_descriptions)")]
+        if "description" not in columns:
+            return
+        conn.execute("begin")
+        try:
+            conn.execute(
+                "create table if not exists description_bodies "
+                "(hash text primary key, body text not null, created_at text default current_timestamp)"
+            )
+            conn.execute(
+                "insert or ignore into description_bodies (hash, body) "
+                "select distinct description_hash(description), description from track_descriptions "
+                "where description is not null"
+            )
+            conn.execute("alter table track_descriptions add column body_hash text references description_bodies(hash)")
+            conn.execute("update track_descriptions set body_hash = description_hash(description)")
+            conn.execute("alter table track_descriptions drop column description")
+            conn.execute("commit")
+        except Exception:
+            conn.execute("rollback")
+            raise
+        logger.info("설명 본문을 description_bodies 로 옮겼습니다.")
+
+    def _insert(self, table: str, rows: list[dict], ignore_existing: bool = False) -> None:
+        if not rows:
+            return
+        conn = self._conn()
+        verb = "insert or ignore" if ignore_existing else "insert"
+        bodies = {}
+        if table == "track_descriptions":
+            bodies, rows = _split_descriptions(rows)
+        conn.execute("begin")
+        try:
+            conn.executemany("insert or ignore into description_bodies (hash, body) values (?, ?)", bodies.items())
+            for row in rows:
+                row = {"id": str(uuid.uuid4()), **row}
+                columns = ",".join(row)
+                placeholders = ",".join("?" for _ in row)
+                conn.execute(f"{verb} into {table} ({columns}) values ({placeholders})", list(row.values()))
+            conn.execute("commit")
+        except Exception:
+            conn.execute("rollback")
+            raise
+
+    def _is_empty(self) -> bool:
+        return self._conn().execute("select count(*) from concerts").fetchone()[0] == 0
+
+    def load_fixtures(self, fixtures_dir: str) -> None:
+        """<fixtures_dir>/<테이블>.json (행 배열) 을 외래 키 순서대로 넣는다."""
+        for table in TABLES:
+            path = os.path.join(fixtures_dir, f"{table}.json")
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                self._insert(table, json.load(f))
+        logger.info(f"픽스처 로드 완료: {fixtures_dir}")
+
+    # ── concerts ──
+    def list_concerts_page(self, sort_column, descending, after_value, after_id, limit):
+        if sort_column not in ("date", "title", "venue"):
+            raise ValueError(f"지원하지 않는 정렬 컬럼: {sort_column}")
+        direction = "desc" if descending else "asc"
+        # NULL 정렬 값은 '' 로 비교 (migrations/007_keyset_nulls.sql 과 같은 순서)
+        sort_key = f"coalesce({sort_column}, '')"
+        where, params = "", []
+        if after_id is not None:
+            where = f"where ({sort_key}, id) {'<' if descending else '>'} (?, ?)"
+            params = [after_value or "", after_id]
+        return self._all(
+            f"select * from concerts {where} order by {sort_key} {direction}, id {direction} limit ?",
+            [*params, limit],
+        )
+
+    def list_concerts(self, title, offset, limit):
+        where, params = "", []
+        if title:
+            where, params = "where title like ?", [f"%{title}%"]
+        total = self._conn().execute(f"select count(*) from concerts {where}", params).fetchone()[0]
+        rows = self._all(
+            f"select id, title, venue, date from concerts {where} order by created_at desc, id limit ? offset ?",
+            [*params, limit, offset],
+        )
+        return rows, total
+
+    def upcoming_concerts(self, from_date, limit):
+        return self._all("select * from concerts where date >= ? order by date limit ?", (from_date, limit))
+
+    def get_concert(self, concert_id):
+        rows = self._all("select * from concerts where id = ?", (concert_id,))
+        return rows[0] if rows else None
+
+    def get_concerts(self, concert_ids):
+        if not concert_ids:
+            return []
+        placeholders = ",".join("?" for _ in concert_ids)
+        return self._all(f"select {','.join(CONCERT_COLUMNS)} from concerts where id in ({placeholders})", concert_ids)
+
+    def find_concerts(self, column, term):
+        if column not in CONCERT_COLUMNS:
+            raise ValueError(f"검색할 수 없는 컬럼: {column}")
+        return self._all(
+            f"select {','.join(CONCERT_COLUMNS)} from concerts where {column} like ?",
+            (f"%{term}%",),
+        )
+
+    def concert_ids_by_composer(self, term):
+        rows = self._all("select distinct concert_id from concert_tracks where composer like ?", (f"%{term}%",))
+        return [row["concert_id"] for row in rows]
+
+    def search_concerts(self, title, venue, composer, start_date, end_date,
+                        sort_column, descending, offset, limit):
+        if sort_column not in ("date", "title", "venue"):
+            raise ValueError(f"지원하지 않는 정렬 컬럼: {sort_column}")
+        conditions, params = [], []
+        if title:
+            conditions.append("title like ?")
+            params.append(f"%{title}%")
+        if venue:
+            conditions.append("venue like ?")
+            params.append(f"%{venue}%")
+        if composer:
+            conditions.append(
+                "exists (select 1 from concert_tracks t where t.concert_id = concerts.id and t.composer like ?)"
+            )
+            params.append(f"%{composer}%")
+        if start_date:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("date <= ?")
+            params.append(end_date)
+        where = f"where {' and '.join(conditions)}" if conditions else ""
+
+        total = self._conn().execute(f"select count(*) from concerts {where}", params).fetchone()[0]
+        rows = self._all(
+            f"select {','.join(CONCERT_COLUMNS)} from concerts {where} "
+            f"order by {sort_column} {'desc' if descending else 'asc'}, id limit ? offset ?",
+            [*params, limit, offset],
+        )
+        return rows, total
+
+    def concert_stats(self, concert_ids):
+        stats = {cid: {"tracks": 0, "descriptions": 0} for cid in concert_ids}
+        if not concert_ids:
+            return stats
+        placeholders = ",".join("?" for _ in concert_ids)
+        rows = self._all(
+            f"""
+            select t.concert_id, count(distinct t.id) as tracks, count(d.id) as descriptions
+            from concert_tracks t
+            left join track_descriptions d on d.track_id = t.id
+            where t.concert_id in ({placeholders})
+            group by t.concert_id
+            """,
+            concert_ids,
+        )
+        for row in rows:
+            stats[row["concert_id"]] = {"tracks": row["tracks"], "descriptions": row["descriptions"]}
+        return stats
+
+    def insert_concerts(self, rows):
+        self._insert("concerts", rows)
+
+    def delete_concerts(self, concert_ids):
+        if not concert_ids:
+            return 0
+        placeholders = ",".join("?" for _ in concert_ids)
+        return self._conn().execute(f"delete from concerts where id in ({placeholders})", list(concert_ids)).rowcount
+
+    # ── concert_tracks ──
+    def get_tracks(self, concert_id):
+        return self._all("select * from concert_tracks where concert_id = ? order by rowid", (concert_id,))
+
+    def insert_tracks(self, rows):
+        self._insert("concert_tracks", rows)
+
+    def delete_track(self, track_id):
+        self._conn().execute("delete from concert_tracks where id = ?", (track_id,))
+
+    # ── track_descriptions ──
+    def get_descriptions(self, track_id):
+        return self._all(f"{_DESCRIPTION_SELECT} where d.track_id = ? order by d.rowid", (track_id,))
+
+    def get_descriptions_for_tracks(self, track_ids):
+        if not track_ids:
+            return []
+        placeholders = ",".join("?" for _ in track_ids)
+        return self._all(
+            f"{_DESCRIPTION_SELECT} where d.track_id in ({placeholders}) order by d.rowid",
+            list(track_ids),
+        )
+
+    def insert_descriptions(self, rows):
+        self._insert("track_descriptions", rows)
+
+    def delete_description(self, description_id):
+        self._conn().execute("delete from track_descriptions where id = ?", (description_id,))
+
+    def _snippet(self, text: str, words: list[str]) -> str:
+        lowered = text.lower()
+        first = min((i for i in (lowered.find(w.lower()) for w in words) if i >= 0), default=0)
+        start = max(first - self.SNIPPET_CONTEXT, 0)
+        snippet = text[start:first + self.SNIPPET_CONTEXT * 2]
+        pattern = re.compile("|".join(re.escape(w) for w in words), re.IGNORECASE)
+        return pattern.sub(lambda m: f"<mark>{m.group(0)}</mark>", snippet)
+
+    def search_descriptions(self, query, limit, offset):
+        words = query.split()
+        if not words:
+            return []
+        where = " and ".join("b.body like ?" for _ in words)
+        rows = self._all(
+            f"""
+            select c.id as concert_id, c.title as concert_title, c.date as concert_date,
+                   t.id as track_id, t.track_title, t.composer, d.id as description_id, d.prompt_type,
+                   b.body as description,
+                   count(*) over () as total_count
+            from description_bodies b
+            join track_descriptions d on d.body_hash = b.hash
+            join concert_tracks t on t.id = d.track_id
+            join concerts c on c.id = t.concert_id
+            where {where}
+            order by c.date desc, t.id, d.prompt_type, d.id
+            limit ? offset ?
+            """,
+            [*(f"%{w}%" for w in words), limit, offset],
+        )
+        for row in rows:
+            description = row.pop("description")
+            row["snippet"] = self._snippet(description, words)
+            row["rank"] = sum(description.lower().count(w.lower()) for w in words)
+        return rows
+
+    # ── prompt_templates ──
+    def list_templates(self):
+        return self._all("select * from prompt_templates order by rowid")
+
+    def save_templates(self, rows):
+        conn = self._conn()
+        names = [row["name"] for row in rows]
+        conn.execute("begin")
+        try:
+            conn.execute(
+                f"delete from prompt_templates where name not in ({','.join('?' for _ in names)})",
+                names,
+            )
+            changed = []
+            for row in rows:
+                changed += [dict(r) for r in conn.execute(
+                    """
+                    insert into prompt_templates (id, name, template) values (?, ?, ?)
+                    on conflict (name) do update
+                       set template = excluded.template,
+                           version = version + 1,
+                           updated_at = current_timestamp
+                     where template is not excluded.template
+                    returning *
+                    """,
+                    (str(uuid.uuid4()), row["name"], row["template"]),
+                ).fetchall()]
+            conn.execute("commit")
+        except Exception:
+            conn.execute("rollback")
+            raise
+        return changed
+
+    # ── 백업·복원 ──
+    def scan(self, table, after_id, limit):
+        select = _scan_select(table)
+        if after_id is None:
+            return self._all(f"{select} order by d.id limit ?", (limit,))
+        return self._all(f"{select} where d.id > ? order by d.id limit ?", (after_id, limit))
+
+    def restore_rows(self, table, rows):
+        columns = TABLE_COLUMNS[table]
+        self._insert(table, [{c: row.get(c) for c in columns} for row in rows], ignore_existing=True)
+
+class PostgresBackend(DataBackend):
+    """
+    Postgres 직접 연결 (psycopg 3 + psycopg_pool 연결 풀).
+
+    곡·설명 일괄 저장은 COPY, 공연 삭제는 한 트랜잭션의 집합 삭제, 통계는 GROUP BY 로
+    처리해 PostgREST 를 거치는 행 단위 HTTP 요청을 없앤다. 시즌 단위 가져오기·정리 작업용이다.
+    목록·검색은 migrations/ 의 함수를 그대로 호출하므로 마이그레이션이 적용된 DB 여야 한다
+    (python -m utils.migrate).
+
+    Supabase 의 직접 연결(5432) 문자열을 쓰면 RLS 를 거치지 않으므로 관리 작업에만 사용한다.
+    """
+
+    def __init__(self, dsn: str, pool_size: int = PG_POOL_SIZE):
+        try:
+            from psycopg.rows import dict_row
+            from psycopg.types.string import TextLoader
+            from psycopg_pool import ConnectionPool
+        except ImportError as e:
+            raise RuntimeError(
+                "Postgres 백엔드를 사용하려면 psycopg 를 설치하세요: pip install -r requirements.txt"
+            ) from e
+
+        def configure(conn):
+            # Supabase 응답과 같이 uuid·시각은 문자열로 받는다
+            for type_name in ("uuid", "timestamptz"):
+                conn.adapters.register_loader(type_name, TextLoader)
+
+        self.pool = ConnectionPool(
+            dsn,
+            min_size=1,
+            max_size=pool_size,
+            kwargs={"row_factory": dict_row, "autocommit": True},
+            configure=configure,
+            name="classicue-data",
+        )
+
+    def _all(self, sql: str, params=()) -> list[dict]:
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def _execute(self, sql: str, params=()) -> None:
+        with self.pool.connection() as conn:
+            conn.execute(sql, params)
+
+    def _copy_rows(self, conn, table: str, rows: list[dict], target: str | None = None) -> None:
+        # 어느 행에도 없는 컬럼은 빼서 DB 기본값(created_at 등)이 적용되게 한다. id 는 없으면 새로 만든다.
+        columns = [c for c in TABLE_COLUMNS[table] if c == "id" or any(c in row for row in rows)]
+        copy_sql = f"copy {target or table} ({','.join(columns)}) from stdin"
+        with conn.cursor() as cur, cur.copy(copy_sql) as copy:
+            for row in rows:
+                row = {"id": str(uuid.uuid4()), **row}
+                copy.write_row([row.get(column) for column in columns])
+
+    def _copy(self, table: str, rows: list[dict]) -> None:
+        if not rows:
+            return
+        with self.pool.connection() as conn, conn.transaction():
+            self._copy_rows(conn, table, rows)
+
+    # ── concerts ──
+    def list_concerts_page(self, sort_column, descending, after_value, after_id, limit):
+        # migrations/007_keyset_nulls.sql
+        return self._all(
+            "select * from list_concerts_page(%s, %s, %s, %s, %s)",
+            (sort_column, descending, after_value, after_id, limit),
+        )
+
+    def list_concerts(self, title, offset, limit):
+        where, params = "", []
+        if title:
+            where, params = "where title ilike %s", [f"%{title}%"]
+        rows = self._all(
+            f"select id, title, venue, date, count(*) over () as total_count from concerts {where} "
+            "order by created_at desc, id limit %s offset %s",
+            [*params, limit, offset],
+        )
+        if not rows and offset:
+            # 마지막 페이지를 넘어서면 창 함수 결과가 없으므로 따로 센다
+            total = self._all(f"select count(*) as n from concerts {where}", params)[0]["n"]
+            return [], total
+        total = rows[0]["total_count"] if rows else 0
+        for row in rows:
+            row.pop("total_count")
+        return rows, total
+
+    def upcoming_concerts(self, from_date, limit):
+        return self._all("select * from concerts where date >= %s order by date limit %s", (from_date, limit))
+
+    def get_concert(self, concert_id):
+        rows = self._all("select * from concerts where id = %s", (concert_id,))
+        return rows[0] if rows else None
+
+    def get_concerts(self, concert_ids):
+        if not concert_ids:
+            return []
+        return self._all(
+            f"select {','.join(CONCERT_COLUMNS)} from concerts where id = any(%s::uuid[])",
+            (list(concert_ids),),
+        )
+
+    def find_concerts(self, column, term):
+        if column not in CONCERT_COLUMNS:
+            raise ValueError(f"검색할 수 없는 컬럼: {column}")
+        return self._all(
+            f"select {','.join(CONCERT_COLUMNS)} from concerts where {column} ilike %s",
+            (f"%{term}%",),
+        )
+
+    def concert_ids_by_composer(self, term):
+        rows = self._all("select distinct concert_id from concert_tracks where composer ilike %s", (f"%{term}%",))
+        return [row["concert_id"] for row in rows]
+
+    def search_concerts(self, title, venue, composer, start_date, end_date,
+                        sort_column, descending, offset, limit):
+        if sort_column not in ("date", "title", "venue"):
+            raise ValueError(f"지원하지 않는 정렬 컬럼: {sort_column}")
+        conditions, params = [], []
+        if title:
+            conditions.append("title ilike %s")
+            params.append(f"%{title}%")
+        if venue:
+            conditions.append("venue ilike %s")
+            params.append(f"%{venue}%")
+        if composer:
+            conditions.append(
+                "exists (select 1 from concert_tracks t where t.concert_id = concerts.id and t.composer ilike %s)"
+            )
+            params.append(f"%{composer}%")
+        if start_date:
+            conditions.append("date >= %s")
+            params.append(start_date)
+        if end_date:
+            conditions.append("date <= %s")
+            params.append(end_date)
+        where = f"where {' and '.join(conditions)}" if conditions else ""
+
+        rows = self._all(
+            f"select {','.join(CONCERT_COLUMNS)}, count(*) over () as total_count from concerts {where} "
+            f"order by {sort_column} {'desc' if descending else 'asc'}, id limit %s offset %s",
+            [*params, limit, offset],
+        )
+        total = rows[0]["total_count"] if rows else 0
+        for row in rows:
+            row.pop("total_count")
+        return rows, total
+
+    def concert_stats(self, concert_ids):
+        stats = {cid: {"tracks": 0, "descriptions": 0} for cid in concert_ids}
+        if not concert_ids:
+            return stats
+        rows = self._all(
+            """
+            select t.concert_id, count(distinct t.id) as tracks, count(d.id) as descriptions
+            from concert_tracks t
+            left join track_descriptions d on d.track_id = t.id
+            where t.concert_id = any(%s::uuid[])
+            group by t.concert_id
+            """,
+            (list(concert_ids),),
+        )
+        for row in rows:
+            stats[row["concert_id"]] = {"tracks": row["tracks"], "descriptions": row["descriptions"]}
+        return stats
+
+    def insert_concerts(self, rows):
+        self._copy("concerts", rows)
+
+    def delete_concerts(self, concert_ids):
+        if not concert_ids:
+            return 0
+        ids = list(concert_ids)
+        # 외래 키에 ON DELETE CASCADE 가 없는 DB 에서도 되도록 자식부터 한 트랜잭션에서 지운다
+        with self.pool.connection() as conn, conn.transaction():
+            conn.execute(
+                "delete from track_descriptions where track_id in "
+                "(select id from concert_tracks where concert_id = any(%s::uuid[]))",
+                (ids,),
+            )
+            conn.execute("delete from concert_tracks where concert_id = any(%s::uuid[])", (ids,))
+            return conn.execute("delete from concerts where id = any(%s::uuid[])", (ids,)).rowcount
+
+    # ── concert_tracks ──
+    def get_tracks(self, concert_id):
+        # SQLite 의 rowid 처럼 넣은 순서 (곡·설명 행은 수정하지 않으므로 ctid 순서가 곧 저장 순서)
+        return self._all("select * from concert_tracks where concert_id = %s order by ctid", (concert_id,))
+
+    def insert_tracks(self, rows):
+        self._copy("concert_tracks", rows)
+
+    def delete_track(self, track_id):
+        with self.pool.connection() as conn, conn.transaction():
+            conn.execute("delete from track_descriptions where track_id = %s", (track_id,))
+            conn.execute("delete from concert_tracks where id = %s", (track_id,))
+
+    # ── track_descriptions ──
+    def get_descriptions(self, track_id):
+        return self._all(f"{_DESCRIPTION_SELECT} where d.track_id = %s order by d.ctid", (track_id,))
+
+    def get_descriptions_for_tracks(self, track_ids):
+        if not track_ids:
+            return []
+        return self._all(
+            f"{_DESCRIPTION_SELECT} where d.track_id = any(%s::uuid[]) order by d.ctid",
+            (list(track_ids),),
+        )
+
+    def insert_descriptions(self, rows):
+        # migrations/005_description_bodies.sql 의 insert_track_descriptions 와 같은 처리를 COPY 로:
+        # 본문·설명을 임시 테이블에 COPY 한 뒤 한 트랜잭션에서 이미 있는 해시·id 는 건너뛰며 옮긴다
+        if not rows:
+            return
+        bodies, split = _split_descriptions(rows)
+        columns = ("id", "track_id", "prompt_type", "body_hash", "template_id", "template_version")
+        column_list = ",".join(columns)
+        with self.pool.connection() as conn, conn.transaction():
+            conn.execute("create temp table bodies_in (hash text, body text) on commit drop")
+            conn.execute("create temp table descriptions_in (like track_descriptions including defaults) on commit drop")
+            with conn.cursor() as cur:
+                with cur.copy("copy bodies_in (hash, body) from stdin") as copy:
+                    for item in bodies.items():
+                        copy.write_row(item)
+                with cur.copy(f"copy descriptions_in ({column_list}) from stdin") as copy:
+                    for row in split:
+                        row = {"id": str(uuid.uuid4()), **row}
+                        copy.write_row([row.get(column) for column in columns])
+            conn.execute(
+                "insert into description_bodies (hash, body) select hash, body from bodies_in on conflict (hash) do nothing"
+            )
+            conn.execute(
+                f"insert into track_descriptions ({column_list}) select {column_list} from descriptions_in "
+                "on conflict (id) do nothing"
+            )
+
+    def delete_description(self, description_id):
+        self._execute("delete from track_descriptions where id = %s", (description_id,))
+
+    def search_descriptions(self, query, limit, offset):
+        # migrations/009_description_search_id.sql
+        return self._all("select * from search_track_descriptions(%s, %s, %s)", (query, limit, offset))
+
+    # ── prompt_templates ──
+    def list_templates(self):
+        return self._all("select * from prompt_templates")
+
+    def save_templates(self, rows):
+        from psycopg.types.json import Jsonb
+
+        # migrations/004_template_versions.sql
+        templates = [{"name": row["name"], "template": row["template"]} for row in rows]
+        return self._all("select * from save_prompt_templates(%s)", (Jsonb(templates),))
+
+    # ── 백업·복원 ──
+    def scan(self, table, after_id, limit):
+        select = _scan_select(table)
+        if after_id is None:
+            return self._all(f"{select} order by d.id limit %s", (limit,))
+        return self._all(f"{select} where d.id > %s order by d.id limit %s", (after_id, limit))
+
+    def restore_rows(self, table, rows):
+        if table == "track_descriptions":
+            # 이미 있는 id 는 insert_descriptions 가 건너뛴다
+            self.insert_descriptions(rows)
+            return
+        if not rows:
+            return
+        columns = ",".join(TABLE_COLUMNS[table])
+        # COPY 는 충돌을 건너뛸 수 없으므로 임시 테이블에 COPY 한 뒤 한 번에 옮긴다
+        with self.pool.connection() as conn, conn.transaction():
+            conn.execute(f"create temp table restore_rows (like {table} including defaults) on commit drop")
+            self._copy_rows(conn, table, rows, target="restore_rows")
+            conn.execute(
+                f"insert into {table} ({columns}) select {columns} from restore_rows on conflict do nothing"
+            )
+
+def create_backend(url: str | None) -> DataBackend:
+    """CLASSICUE_DATA_BACKEND 값으로 저장소를 만든다."""
+    if not url or url.startswith("supabase://"):
+        return SupabaseBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith("memory://"):
+        return SQLiteBackend(None)
+    if url.startswith(("postgresql://", "postgres://")):
+        return PostgresBackend(url)
+    raise ValueError(f"지원하지 않는 데이터 백엔드: {url}")
+
+_lock = threading.Lock()
+_backend: DataBackend | None = None
+
+def get_backend() -> DataBackend:
+    """프로세스 공용 저장소 (처음 호출 시 생성)."""
+    global _backend
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _backend = create_backend(os.getenv("CLASSICUE_DATA_BACKEND"))
+    return _backend
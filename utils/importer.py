@@ -0,0 +1,313 @@
+# utils/importer.py
+"""
+시즌 일괄 등록: CSV / JSONL 파일의 공연·곡을 한 번에 가져온다.
+
+한 행이 곡 하나이며, 공연 정보(공연명·공연장·날짜)가 같은 행들은 같은 공연의 곡이 된다.
+
+    title,venue,date,description,track_title,composer
+    신년 음악회,예술의전당,2025-01-03,,교향곡 9번,드보르자크
+
+    - 날짜는 date 한 칸("2025-01-03" 또는 "2025-01-03 ~ 2025-01-05") 이나
+      start_date / end_date 두 칸으로 쓴다. 2025.1.3, 2025/01/03 도 허용.
+    - 한글 머리글(공연명, 공연장, 날짜, 시작일, 종료일, 공연 소개, 곡명, 작곡가)도 쓸 수 있다.
+    - JSONL 은 같은 키의 객체이며, 곡을 "tracks": [{"track_title", "composer"}, ...] 로 묶어도 된다.
+
+파일은 한 행씩 읽어 IMPORT_BATCH_SIZE 곡마다 여러 행 INSERT 로 저장하고 저장한 행은 버리므로
+곡이 수만 개여도 메모리에는 중복 확인용 키만 남는다. 이미 등록된 공연(공연명·공연장·날짜가 같은 공연)은 건너뛰고,
+파일 안에서 중복된 곡은 한 번만 저장한다. templates 를 주면 저장된 곡의 AI 설명 생성을
+백그라운드 작업으로 넘긴다.
+
+    python -m utils.importer season.csv [--generate 기본 설명 감상 가이드] [--dry-run]
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, TextIO
+from utils.backup import iter_rows
+from utils.cache import invalidate
+from utils.data_backends import get_backend
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 저장할 곡 수
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+
+# AI 설명을 동시에 생성할 곡 수
+DESCRIPTION_WORKERS = int(os.getenv("DESCRIPTION_WORKERS", "4"))
+
+# 결과에 남길 오류 메시지 수 (나머지는 개수만 센다)
+MAX_REPORTED_ERRORS = 100
+
+# 한글 머리글 → 컬럼
+COLUMN_ALIASES = {
+    "공연명": "title",
+    "공연장": "venue",
+    "날짜": "date",
+    "일정": "date",
+    "시작일": "start_date",
+    "종료일": "end_date",
+    "공연 소개": "description",
+    "설명": "description",
+    "곡명": "track_title",
+    "작곡가": "composer",
+}
+
+_DATE_RE = re.compile(r"^(\d{4})[-./](\d{1,2})[-./](\d{1,2})\.?$")
+
+_executor = ThreadPoolExecutor(max_workers=DESCRIPTION_WORKERS, thread_name_prefix="describe")
+
+class RowError(ValueError):
+    """가져올 수 없는 행 (검증 실패)."""
+
+def _clean(value) -> str:
+    return re.sub(r"\s+", " ", str(value or "")).strip()
+
+def _normalize_date(value: str) -> str:
+    match = _DATE_RE.match(_clean(value))
+    if not match:
+        raise RowError(f"날짜 형식 오류: '{value}' (예: 2025-01-03)")
+    year, month, day = (int(part) for part in match.groups())
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        raise RowError(f"날짜 형식 오류: '{value}'")
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+def _concert_date(record: dict) -> str:
+    if record.get("start_date"):
+        start = _normalize_date(record["start_date"])
+        end = _normalize_date(record["end_date"]) if record.get("end_date") else None
+    else:
+        parts = str(record.get("date") or "").split("~")
+        if not parts[0].strip():
+            raise RowError("날짜가 없습니다.")
+        start = _normalize_date(parts[0])
+        end = _normalize_date(parts[1]) if len(parts) > 1 else None
+    if end and end < start:
+        raise RowError("종료 날짜가 시작 날짜보다 빠릅니다.")
+    # 관리자 화면(pages/admin_dashboard.py)과 같은 형식
+    return f"{start} ~ {end}" if end and end != start else start
+
+def normalize_record(record: dict) -> tuple[dict, list[dict]]:
+    """원본 행 → (공연, 곡 목록). 검증 실패 시 RowError."""
+    record = {COLUMN_ALIASES.get(_clean(k), _clean(k)): v for k, v in record.items() if k}
+
+    concert = {
+        "title": _clean(record.get("title")),
+        "venue": _clean(record.get("venue")),
+        "date": _concert_date(record),
+        "description": str(record.get("description") or "").strip(),
+    }
+    if not concert["title"]:
+        raise RowError("공연명이 없습니다.")
+
+    raw_tracks = record.get("tracks")
+    if raw_tracks is None:
+        raw_tracks = [record]
+    elif not isinstance(raw_tracks, list):
+        raise RowError("tracks 는 목록이어야 합니다.")
+
+    tracks = []
+    for raw in raw_tracks:
+        if not isinstance(raw, dict):
+            raise RowError("tracks 의 각 항목은 곡명·작곡가를 담은 객체여야 합니다.")
+        track_title, composer = _clean(raw.get("track_title")), _clean(raw.get("composer"))
+        if not track_title and not composer:
+            continue
+        if not track_title or not composer:
+            raise RowError("곡명과 작곡가를 모두 입력해야 합니다.")
+        tracks.append({"track_title": track_title, "composer": composer})
+    return concert, tracks
+
+def _concert_key(concert: dict) -> tuple:
+    return (concert["title"].casefold(), (concert.get("venue") or "").casefold(), concert["date"])
+
+def _track_key(track: dict) -> tuple:
+    return (track["track_title"].casefold(), track["composer"].casefold())
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """(행 번호, 원본 행, 파싱 오류) 를 하나씩 돌려준다. fmt: 'csv' 또는 'jsonl'."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record, None
+    elif fmt == "jsonl":
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, None, f"JSON 형식 오류: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "JSON 객체가 아닙니다."
+                continue
+            yield line_no, record, None
+    else:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+
+def detect_format(filename: str) -> str:
+    return "jsonl" if filename.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+def _existing_concert_keys() -> set[tuple]:
+    """등록된 공연의 (공연명, 공연장, 날짜) — id 순으로 나눠 읽는다 (날짜는 NULL 일 수 있음)."""
+    keys = set()
+    for rows in iter_rows("concerts"):
+        keys.update(_concert_key(row) for row in rows if row.get("date"))
+    return keys
+
+def resolve_templates(names: Iterable[str]) -> list[dict]:
+    """템플릿 이름 → prompt_templates 행. 없는 이름이 있으면 ValueError."""
+    from utils.templates import get_prompt_templates
+
+    by_name = {t["name"]: t for t in get_prompt_templates()}
+    missing = [name for name in names if name not in by_name]
+    if missing:
+        raise ValueError(f"없는 템플릿: {', '.join(missing)}")
+    return [by_name[name] for name in names]
+
+def _describe_track(track: dict, templates: list[dict]) -> None:
+    from utils.ai import generate_classical_description
+    from utils.concerts import invalidate_descriptions
+
+    try:
+        rows = [{
+            "track_id": track["id"],
+            "prompt_type": template["name"],
+            "description": generate_classical_description(
+                template["template"], track["track_title"], track["composer"]
+            ),
+            "template_id": template.get("id"),
+            "template_version": template.get("version"),
+        } for template in templates]
+        get_backend().insert_descriptions(rows)
+        invalidate_descriptions(track["concert_id"], track["id"])
+    except Exception as e:
+        logger.error(f"AI 설명 생성 실패 - {track['track_title']}: {str(e)}")
+
+def enqueue_descriptions(tracks: list[dict], templates: list[dict]) -> None:
+    """곡들의 AI 설명 생성을 백그라운드 작업으로 넘긴다 (곡마다 선택한 템플릿 수만큼)."""
+    for track in tracks:
+        _executor.submit(_describe_track, track, templates)
+
+def wait_for_descriptions() -> None:
+    """넘긴 설명 생성 작업이 모두 끝날 때까지 기다린다 (CLI 종료 전)."""
+    _executor.shutdown(wait=True)
+
+def import_records(records: Iterable[tuple[int, dict | None, str | None]],
+                   created_by: str | None = None,
+                   templates: list[dict] | None = None,
+                   batch_size: int = IMPORT_BATCH_SIZE,
+                   dry_run: bool = False) -> dict:
+    """
+    read_records() 의 행들을 검증·정규화해 저장한다.
+
+    Returns:
+        {"concerts", "tracks", "skipped_existing", "duplicate_tracks", "error_count", "errors"}
+        errors 는 (행 번호, 메시지) 목록 (최대 MAX_REPORTED_ERRORS 개)
+    """
+    db = get_backend()
+    existing = _existing_concert_keys()
+    result = {"concerts": 0, "tracks": 0, "skipped_existing": 0,
+              "duplicate_tracks": 0, "error_count": 0, "errors": []}
+
+    # 이번 가져오기에서 만든 공연 id 와 공연별 곡 키 (행 자체는 배치마다 비운다)
+    concert_ids: dict[tuple, str] = {}
+    track_keys: dict[str, set] = {}
+    skipped: set[tuple] = set()
+    pending_concerts: list[dict] = []
+    pending_tracks: list[dict] = []
+
+    def flush():
+        if not dry_run:
+            # 공연을 먼저 저장해야 곡의 외래 키가 맞는다
+            db.insert_concerts(pending_concerts)
+            db.insert_tracks(pending_tracks)
+            # 다음 배치에서 실패해 중단되더라도 이미 저장한 공연은 목록에 보이도록 배치마다 무효화
+            if pending_concerts:
+                invalidate("concerts")
+            if templates:
+                enqueue_descriptions(list(pending_tracks), templates)
+        result["concerts"] += len(pending_concerts)
+        result["tracks"] += len(pending_tracks)
+        pending_concerts.clear()
+        pending_tracks.clear()
+
+    def error(line_no: int, message: str):
+        result["error_count"] += 1
+        if len(result["errors"]) < MAX_REPORTED_ERRORS:
+            result["errors"].append((line_no, message))
+
+    for line_no, record, parse_error in records:
+        if parse_error:
+            error(line_no, parse_error)
+            continue
+        try:
+            concert, tracks = normalize_record(record)
+        except RowError as e:
+            error(line_no, str(e))
+            continue
+
+        key = _concert_key(concert)
+        if key in existing:
+            if key not in skipped:
+                skipped.add(key)
+                result["skipped_existing"] += 1
+            continue
+
+        concert_id = concert_ids.get(key)
+        if concert_id is None:
+            concert_id = concert_ids[key] = str(uuid.uuid4())
+            track_keys[concert_id] = set()
+            pending_concerts.append({"id": concert_id, "created_by": created_by, **concert})
+
+        for track in tracks:
+            track_key = _track_key(track)
+            if track_key in track_keys[concert_id]:
+                result["duplicate_tracks"] += 1
+                continue
+            track_keys[concert_id].add(track_key)
+            pending_tracks.append({"id": str(uuid.uuid4()), "concert_id": concert_id, **track})
+
+        if len(pending_tracks) >= batch_size or len(pending_concerts) >= batch_size:
+            flush()
+
+    flush()
+    return result
+
+def import_file(stream: TextIO, fmt: str, **kwargs) -> dict:
+    return import_records(read_records(stream, fmt), **kwargs)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="공연·곡 일괄 등록 (CSV / JSONL)")
+    parser.add_argument("path", help="가져올 파일")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="기본: 확장자로 판단")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--generate", nargs="*", metavar="템플릿", help="저장한 곡의 AI 설명을 이 템플릿들로 생성")
+    parser.add_argument("--dry-run", action="store_true", help="검증만 하고 저장하지 않기")
+    args = parser.parse_args()
+
+    with open(args.path, "r", encoding="utf-8-sig", newline="") as f:
+        result = import_file(
+            f,
+            args.format or detect_format(args.path),
+            templates=resolve_templates(args.generate) if args.generate else None,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+        )
+    if args.generate and not args.dry_run:
+        print(f"AI 설명 생성 중... ({result['tracks']}곡)")
+        wait_for_descriptions()
+
+    for line_no, message in result["errors"]:
+        print(f"{line_no}행: {message}")
+    print(
+        f"공연 {result['concerts']}개, 곡 {result['tracks']}개 저장"
+        f"{' (dry-run)' if args.dry_run else ''} · 이미 등록된 공연 {result['skipped_existing']}개 · "
+        f"중복 곡 {result['duplicate_tracks']}개 · 오류 {result['error_count']}행"
+    )
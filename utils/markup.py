@@ -0,0 +1,80 @@
+# utils/markup.py
+"""
+공연 상세 화면의 HTML 조각 (static/classical_styles.css 클래스 사용).
+Streamlit 페이지(pages/concert_view.py)와 정적 HTML 내보내기(utils/static_export.py)가 함께 쓴다.
+"""
+import html
+import re
+
+DIVIDER_HTML = '<hr class="custom-divider">'
+
+NO_TRACKS_HTML = """
+<div class="info-box info-box-gold">
+    <h3>🎵 곡 목록 준비 중</h3>
+    <p>이 공연의 곡 목록과 AI 해설이 곧 추가될 예정입니다.</p>
+    <p>조금만 기다려주시면 더 풍성한 정보를 제공해드리겠습니다!</p>
+</div>
+"""
+
+NO_DESCRIPTIONS_HTML = """
+<div class="info-box info-box-pink">
+    <h4>💭 AI 설명 준비 중</h4>
+    <p>이 곡에 대한 AI 해설을 준비하고 있습니다. 곧 업데이트될 예정입니다!</p>
+</div>
+"""
+
+def concert_header_html(concert: dict) -> str:
+    return f"""
+<div class="classical-header">
+    <h1>🎭 {concert["title"]}</h1>
+    <p>{concert["venue"]} │ {concert["date"]}</p>
+</div>
+"""
+
+def concert_intro_html(concert: dict) -> str:
+    """공연 소개 박스. 소개가 없으면 빈 문자열."""
+    if not concert.get("description"):
+        return ""
+    return f"""
+<div class="info-box info-box-purple">
+    <h4>📖 공연 소개</h4>
+    <p>{concert["description"]}</p>
+</div>
+"""
+
+def track_card_html(i: int, track: dict) -> str:
+    return f"""
+<div class="track-card">
+    <div class="track-title">🎵 {i+1}. {track['track_title']}</div>
+    <div class="track-composer">작곡가: {track['composer']}</div>
+</div>
+"""
+
+def description_html(desc: dict, box: str | None = None) -> str:
+    """
+    설명 본문. box 를 주면 설명 타입 제목이 붙은 info-box 로 감싼다
+    (전체 표시: info-box-green, 타입별 필터: info-box-blue).
+    """
+    body = f"""<div class="track-description">
+    {desc['description']}
+</div>"""
+    if box is None:
+        return body
+    return f"""<div class="info-box {box}">
+    <h4>📝 {desc['prompt_type']}</h4>
+    {body}
+</div>"""
+
+def full_display_box(descriptions: list[dict]) -> str | None:
+    """'전체 표시' 방식: 설명이 여럿이면 타입별 박스로 감싸고, 하나면 본문만 보인다."""
+    return "info-box-green" if len(descriptions) > 1 else None
+
+# 검색 발췌문의 강조 태그 (utils.data_backends 의 search_descriptions 가 붙인다)
+_MARK_TAGS = re.compile(r"(</?mark>)")
+
+def snippet_html(snippet: str) -> str:
+    """검색 발췌문. 설명 본문은 그대로 HTML 로 출력되지 않도록 이스케이프하고 <mark> 강조만 남긴다."""
+    return "".join(
+        part if _MARK_TAGS.fullmatch(part) else html.escape(part)
+        for part in _MARK_TAGS.split(snippet or "")
+    )
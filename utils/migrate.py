@@ -0,0 +1,139 @@
+# utils/migrate.py
+"""
+migrations/*.sql 적용.
+
+    python -m utils.migrate                      # 아직 적용하지 않은 마이그레이션 실행
+    python -m utils.migrate --list               # 적용 여부만 출력
+    python -m utils.migrate --baseline 004       # 004 까지는 이미 적용된 것으로 기록만
+
+파일 이름의 숫자 접두사(000, 001, ...)가 버전이다. 적용한 버전은 schema_migrations 에
+파일 sha256 과 함께 기록하고, 빠진 버전만 순서대로 파일 하나당 한 트랜잭션으로 실행한다.
+여러 곳에서 동시에 실행해도 advisory lock 으로 한 번만 적용된다.
+적용된 파일이 나중에 바뀌면 경고만 남긴다 (고치지 말고 새 마이그레이션을 추가한다).
+
+Supabase SQL 편집기로 이미 손으로 적용한 DB 는 --baseline 으로 그 버전까지를 기록만 한다.
+
+접속 문자열은 --dsn, CLASSICUE_DATABASE_URL, postgres 로 시작하는 CLASSICUE_DATA_BACKEND
+순서로 찾는다. Supabase 는 프로젝트 설정의 직접 연결(5432) 문자열을 쓴다.
+로컬 Postgres 에 빈 DB 를 만들어 실행하면 전체 스키마를 처음부터 확인할 수 있다.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.getenv("CLASSICUE_MIGRATIONS", "migrations")
+
+# pg_advisory_lock 키 (다른 작업의 잠금과 겹치지 않는 임의의 값)
+_LOCK_KEY = 7_140_221_001
+
+_FILENAME = re.compile(r"^(\d+)_.+\.sql$")
+
+def discover(directory: str = MIGRATIONS_DIR) -> list[tuple[str, str]]:
+    """(버전, 파일 경로) 를 버전 순서로."""
+    migrations = {}
+    for filename in os.listdir(directory):
+        match = _FILENAME.match(filename)
+        if not match:
+            continue
+        version = match.group(1)
+        if version in migrations:
+            raise ValueError(f"버전이 겹치는 마이그레이션: {migrations[version]}, {filename}")
+        migrations[version] = os.path.join(directory, filename)
+    return sorted(migrations.items(), key=lambda item: int(item[0]))
+
+def _checksum(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _dsn_from_env() -> str | None:
+    dsn = os.getenv("CLASSICUE_DATABASE_URL")
+    if dsn:
+        return dsn
+    backend = os.getenv("CLASSICUE_DATA_BACKEND", "")
+    return backend if backend.startswith(("postgresql://", "postgres://")) else None
+
+def _connect(dsn: str):
+    try:
+        import psycopg
+    except ImportError as e:
+        raise RuntimeError("마이그레이션을 실행하려면 psycopg 를 설치하세요: pip install -r requirements.txt") from e
+    return psycopg.connect(dsn, autocommit=True)
+
+def _applied(conn) -> dict[str, str]:
+    conn.execute(
+        """
+        create table if not exists schema_migrations (
+            version    text primary key,
+            filename   text not null,
+            checksum   text not null,
+            applied_at timestamptz not null default now()
+        )
+        """
+    )
+    return dict(conn.execute("select version, checksum from schema_migrations").fetchall())
+
+def _record(conn, version: str, path: str) -> None:
+    conn.execute(
+        "insert into schema_migrations (version, filename, checksum) values (%s, %s, %s)",
+        (version, os.path.basename(path), _checksum(path)),
+    )
+
+def status(dsn: str, directory: str = MIGRATIONS_DIR) -> list[tuple[str, str, bool]]:
+    """(버전, 파일 이름, 적용 여부) 목록."""
+    with _connect(dsn) as conn:
+        applied = _applied(conn)
+    return [(version, os.path.basename(path), version in applied) for version, path in discover(directory)]
+
+def migrate(dsn: str, directory: str = MIGRATIONS_DIR, baseline: str | None = None) -> list[str]:
+    """
+    적용하지 않은 마이그레이션을 버전 순으로 실행하고 실행한 파일 이름을 반환한다.
+    baseline 을 주면 그 버전 이하는 실행하지 않고 적용된 것으로 기록만 한다.
+    """
+    migrations = discover(directory)
+    done = []
+    with _connect(dsn) as conn:
+        conn.execute("select pg_advisory_lock(%s)", (_LOCK_KEY,))
+        try:
+            applied = _applied(conn)
+            for version, path in migrations:
+                filename = os.path.basename(path)
+                if version in applied:
+                    if applied[version] != _checksum(path):
+                        logger.warning(f"적용 후 내용이 바뀐 마이그레이션: {filename}")
+                    continue
+                if baseline is not None and int(version) <= int(baseline):
+                    _record(conn, version, path)
+                    logger.info(f"기록만 함 (baseline): {filename}")
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    sql = f.read()
+                with conn.transaction():
+                    conn.execute(sql)
+                    _record(conn, version, path)
+                logger.info(f"적용: {filename}")
+                done.append(filename)
+        finally:
+            conn.execute("select pg_advisory_unlock(%s)", (_LOCK_KEY,))
+    return done
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="migrations/*.sql 을 Postgres 에 적용")
+    parser.add_argument("--dsn", default=_dsn_from_env(), help="Postgres 접속 문자열")
+    parser.add_argument("--dir", default=MIGRATIONS_DIR, help="마이그레이션 디렉터리")
+    parser.add_argument("--list", action="store_true", help="적용 여부만 출력")
+    parser.add_argument("--baseline", metavar="버전", help="이 버전까지는 적용된 것으로 기록만")
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("--dsn 또는 CLASSICUE_DATABASE_URL 을 지정하세요.")
+    if args.list:
+        for version, filename, applied in status(args.dsn, args.dir):
+            print(f"{'✓' if applied else ' '} {filename}")
+    else:
+        applied = migrate(args.dsn, args.dir, args.baseline)
+        print(f"{len(applied)}개 적용" + (f": {', '.join(applied)}" if applied else ""))
@@ -0,0 +1,122 @@
+# utils/repository.py
+"""
+서로 독립적인 조회를 동시에 보내고 모아 받는 비동기 조회 계층.
+
+저장소(utils/data_backends.py)는 동기식이므로 각 조회는 공용 스레드 풀에서 실행하고
+asyncio.gather 로 기다린다. 공연 + 곡 목록, 여러 공연의 곡 목록처럼 서로 기다릴 필요가
+없는 조회를 한 번에 보내 페이지 지연이 조회 시간의 합이 아니라 가장 느린 조회에 가까워진다.
+
+    - async 함수(fetch_*): ASGI(api.py) 등 이벤트 루프 안에서 await
+    - 동기 함수(get_*): Streamlit 페이지용. 내부에서 run() 으로 코루틴을 실행
+
+각 조회는 utils.concerts 의 캐시된 함수를 그대로 쓰므로 캐시·single-flight 동작은 같다.
+"""
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from utils.data_backends import get_backend
+from utils.concerts import get_concert, get_concert_tracks, get_track_descriptions
+
+logger = logging.getLogger(__name__)
+
+# 동시에 진행할 조회 수 (utils.supabase_client.HTTP_POOL_SIZE 이하로)
+REPOSITORY_WORKERS = int(os.getenv("REPOSITORY_WORKERS", "16"))
+
+_executor = ThreadPoolExecutor(max_workers=REPOSITORY_WORKERS, thread_name_prefix="repository")
+
+async def _call(fn: Callable[..., Any], *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+def run(coro):
+    """이벤트 루프가 없는 스레드(Streamlit 스크립트 등)에서 코루틴을 실행하고 결과를 반환한다."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    coro.close()
+    raise RuntimeError("이벤트 루프 안에서는 fetch_* 함수를 await 하세요.")
+
+# ──────────────────────────
+# 비동기 조회
+# ──────────────────────────
+async def fetch_concert_with_tracks(concert_id: str) -> tuple[dict, list[dict]]:
+    """공연 한 건과 곡 목록을 동시에 조회한다."""
+    concert, tracks = await asyncio.gather(
+        _call(get_concert, concert_id),
+        _call(get_concert_tracks, concert_id),
+    )
+    return concert, tracks
+
+async def fetch_tracks_by_concert(concert_ids: list[str]) -> dict[str, list[dict]]:
+    """
+    여러 공연의 곡 목록을 동시에 조회한다 (목록 카드의 곡 수·첫 곡 미리보기).
+    조회에 실패한 공연은 결과에서 빠지므로 호출 측에서 '정보 없음'으로 처리한다.
+    """
+    results = await asyncio.gather(
+        *(_call(get_concert_tracks, cid) for cid in concert_ids),
+        return_exceptions=True,
+    )
+    return {
+        cid: tracks
+        for cid, tracks in zip(concert_ids, results)
+        if not isinstance(tracks, BaseException)
+    }
+
+async def fetch_descriptions_by_track(concert_id: str, track_ids: list[str]) -> dict[str, list[dict]]:
+    """한 공연의 여러 곡 설명을 동시에 조회한다. 하나라도 실패하면 예외를 전파한다."""
+    results = await asyncio.gather(
+        *(_call(get_track_descriptions, concert_id, tid) for tid in track_ids)
+    )
+    return dict(zip(track_ids, results))
+
+async def fetch_concerts_by_keyword(search_term: str) -> list[dict]:
+    """
+    통합 검색: 공연명·공연장·설명·작곡가 중 하나라도 검색어를 포함하는 공연 (중복 제거).
+    네 조회를 동시에 보내고, 작곡가로 찾은 공연 id 만 이어서 조회한다.
+    """
+    backend = get_backend()
+
+    def by_composer() -> list[dict]:
+        return backend.get_concerts(backend.concert_ids_by_composer(search_term))
+
+    title_results, venue_results, desc_results, composer_results = await asyncio.gather(
+        _call(backend.find_concerts, "title", search_term),
+        _call(backend.find_concerts, "venue", search_term),
+        _call(backend.find_concerts, "description", search_term),
+        _call(by_composer),
+        return_exceptions=True,
+    )
+    # 작곡가 검색 실패는 나머지 결과만으로 보여준다 (기존 동작)
+    for results in (title_results, venue_results, desc_results):
+        if isinstance(results, BaseException):
+            raise results
+    if isinstance(composer_results, BaseException):
+        logger.warning(f"작곡가 검색 실패: {str(composer_results)}")
+        composer_results = []
+
+    concert_ids = set()
+    concerts = []
+    for concert in [*title_results, *venue_results, *desc_results, *composer_results]:
+        if concert["id"] not in concert_ids:
+            concerts.append(concert)
+            concert_ids.add(concert["id"])
+    return concerts
+
+# ──────────────────────────
+# 동기 창구 (Streamlit 페이지용)
+# ──────────────────────────
+def get_concert_with_tracks(concert_id: str) -> tuple[dict, list[dict]]:
+    return run(fetch_concert_with_tracks(concert_id))
+
+def get_tracks_by_concert(concert_ids: list[str]) -> dict[str, list[dict]]:
+    return run(fetch_tracks_by_concert(concert_ids))
+
+def get_descriptions_by_track(concert_id: str, track_ids: list[str]) -> dict[str, list[dict]]:
+    return run(fetch_descriptions_by_track(concert_id, track_ids))
+
+def get_concerts_by_keyword(search_term: str) -> list[dict]:
+    return run(fetch_concerts_by_keyword(search_term))
@@ -0,0 +1,75 @@
+# utils/search.py
+import logging
+from utils.data_backends import get_backend
+from utils.cache import single_flight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 10
+
+def search_descriptions(query: str,
+                        page: int = 1,
+                        page_size: int = DEFAULT_PAGE_SIZE) -> tuple[list[dict], int]:
+    """
+    곡 설명 본문(description_bodies.body) 전문 검색.
+
+    Supabase 에서는 migrations/009_description_search_id.sql 의 search_track_descriptions RPC 를
+    호출하며 (같은 본문은 한 번만 색인), 결과는 관련도순으로 정렬된 (공연, 곡, 발췌문) 목록이다.
+
+    Args:
+        query: 검색어 (공백으로 구분된 단어는 모두 포함되어야 함)
+        page: 1부터 시작하는 페이지 번호
+        page_size: 페이지당 결과 수
+
+    Returns:
+        (현재 페이지 결과 목록, 전체 결과 수)
+    """
+    query = (query or "").strip()
+    if not query:
+        return [], 0
+
+    page = max(page, 1)
+    hits = single_flight(
+        f"search:descriptions:{query}:{page}:{page_size}",
+        lambda: get_backend().search_descriptions(query, page_size, (page - 1) * page_size),
+    )
+
+    total = hits[0]["total_count"] if hits else 0
+    return hits, total
+
+# 정렬 키 → (컬럼, 내림차순 여부). 동순위는 id 로 고정해 페이지 경계가 흔들리지 않게 한다.
+CONCERT_SORTS = {
+    "date_desc": ("date", True),
+    "date_asc":  ("date", False),
+    "title":     ("title", False),
+    "venue":     ("venue", False),
+}
+
+def search_concerts(title: str | None = None,
+                    venue: str | None = None,
+                    composer: str | None = None,
+                    start_date=None,
+                    end_date=None,
+                    sort: str = "date_desc",
+                    page: int = 1,
+                    page_size: int = DEFAULT_PAGE_SIZE) -> tuple[list[dict], int]:
+    """
+    고급 검색: 필터·정렬·페이지 제한을 모두 DB 에서 처리한다.
+
+    작곡가 조건은 저장소에서 세미조인으로 걸러내므로 곡 목록 전체를 받아와
+    파이썬에서 비교하지 않는다 (utils/data_backends.py).
+
+    Returns:
+        (현재 페이지 공연 목록, 조건에 맞는 전체 공연 수)
+    """
+    column, desc = CONCERT_SORTS.get(sort, CONCERT_SORTS["date_desc"])
+    start = (max(page, 1) - 1) * page_size
+
+    # 동일 조건 동시 요청은 한 번만 조회 (결과는 호출자들이 공유)
+    flight_key = f"search:concerts:{title}:{venue}:{composer}:{start_date}:{end_date}:{sort}:{page}:{page_size}"
+    return single_flight(flight_key, lambda: get_backend().search_concerts(
+        title, venue, composer,
+        str(start_date) if start_date else None,
+        str(end_date) if end_date else None,
+        column, desc, start, page_size,
+    ))
@@ -0,0 +1,162 @@
+# utils/static_export.py
+"""
+공연 상세를 정적 HTML 파일로 내보내기.
+
+공연 당일 관객 트래픽은 Streamlit 세션 대신 정적 파일 서버(nginx, CDN 등)가 받도록
+공연마다 concerts/<id>.html 을 만든다. 화면 구성은 utils/markup.py 의 조각과
+static/classical_styles.css 를 그대로 쓴다 (설명은 '전체 표시' 방식).
+
+    - STATIC_EXPORT_DIR 이 설정되어 있으면 관리자 화면에서 공연·곡·설명을 바꿀 때마다
+      (utils.concerts.invalidate_*) 해당 공연 파일만 백그라운드에서 다시 만든다.
+    - 전체 재생성: python -m utils.static_export [--out 경로] [--concert 공연ID ...]
+
+내용이 같으면 파일을 다시 쓰지 않으므로 정적 서버의 ETag/Last-Modified 도 유지된다.
+"""
+import argparse
+import logging
+import os
+import threading
+from utils.backup import iter_rows
+from utils.repository import get_concert_with_tracks, get_descriptions_by_track
+from utils.markup import (
+    DIVIDER_HTML, NO_TRACKS_HTML, NO_DESCRIPTIONS_HTML,
+    concert_header_html, concert_intro_html, track_card_html, description_html, full_display_box,
+)
+
+logger = logging.getLogger(__name__)
+
+# 내보낼 위치. 비어 있으면 관리자 저장 시 자동 내보내기를 하지 않는다.
+STATIC_EXPORT_DIR = os.getenv("STATIC_EXPORT_DIR", "")
+
+CSS_PATH = "static/classical_styles.css"
+CSS_NAME = "classical_styles.css"
+
+# 같은 공연 파일을 여러 스레드가 동시에 쓰지 않도록
+_lock = threading.Lock()
+
+def render_concert_page(concert: dict, tracks: list[dict], descriptions: dict[str, list[dict]]) -> str:
+    """공연 상세 HTML 문서. descriptions 는 곡 id → 설명 목록."""
+    parts = [concert_header_html(concert), concert_intro_html(concert)]
+
+    if not tracks:
+        parts.append(NO_TRACKS_HTML)
+
+    for i, track in enumerate(tracks):
+        parts.append(track_card_html(i, track))
+        track_descriptions = descriptions.get(track["id"], [])
+        if not track_descriptions:
+            parts.append(NO_DESCRIPTIONS_HTML)
+        box = full_display_box(track_descriptions)
+        for desc in track_descriptions:
+            parts.append(description_html(desc, box))
+        parts.append(DIVIDER_HTML)
+
+    body = "\n".join(p for p in parts if p)
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{concert["title"]}</title>
+<link rel="stylesheet" href="../{CSS_NAME}">
+</head>
+<body>
+<main class="block-container">
+{body}
+</main>
+</body>
+</html>
+"""
+
+def _concert_path(out_dir: str, concert_id: str) -> str:
+    return os.path.join(out_dir, "concerts", f"{concert_id}.html")
+
+def _write_if_changed(path: str, content: str) -> bool:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+def _copy_css(out_dir: str) -> None:
+    try:
+        with open(CSS_PATH, "r", encoding="utf-8") as f:
+            _write_if_changed(os.path.join(out_dir, CSS_NAME), f.read())
+    except FileNotFoundError:
+        logger.warning(f"CSS 파일이 없어 스타일 없이 내보냅니다: {CSS_PATH}")
+
+def export_concert(concert_id: str, out_dir: str = STATIC_EXPORT_DIR) -> bool:
+    """
+    공연 하나를 내보낸다. 내용이 바뀌어 파일을 쓰거나 지웠으면 True.
+    공연이 삭제되었으면 파일도 지운다. 조회 오류 시에는 기존 파일을 그대로 둔다.
+    """
+    path = _concert_path(out_dir, concert_id)
+    concert, tracks = get_concert_with_tracks(concert_id)
+
+    with _lock:
+        if not concert:
+            if os.path.exists(path):
+                os.remove(path)
+                logger.info(f"삭제된 공연의 정적 파일 제거: {path}")
+                return True
+            return False
+
+        descriptions = get_descriptions_by_track(concert_id, [t["id"] for t in tracks])
+        _copy_css(out_dir)
+        changed = _write_if_changed(path, render_concert_page(concert, tracks, descriptions))
+    if changed:
+        logger.info(f"정적 파일 갱신: {path}")
+    return changed
+
+def export_all(out_dir: str = STATIC_EXPORT_DIR) -> int:
+    """모든 공연을 내보내고 사라진 공연의 파일을 지운다. 바뀐 파일 수를 반환."""
+    # 정렬 값(NULL 가능) 대신 id 로만 나눠 읽는다
+    concert_ids = [row["id"] for rows in iter_rows("concerts") for row in rows]
+
+    changed = 0
+    for concert_id in concert_ids:
+        try:
+            changed += export_concert(concert_id, out_dir)
+        except Exception as e:
+            logger.error(f"정적 내보내기 실패 - {concert_id}: {str(e)}")
+
+    concerts_dir = os.path.join(out_dir, "concerts")
+    existing = set(concert_ids)
+    for name in os.listdir(concerts_dir) if os.path.isdir(concerts_dir) else []:
+        if name.endswith(".html") and name[:-len(".html")] not in existing:
+            os.remove(os.path.join(concerts_dir, name))
+            changed += 1
+    return changed
+
+def schedule_export(concert_id: str) -> None:
+    """STATIC_EXPORT_DIR 이 설정된 경우 공연 파일을 백그라운드에서 다시 만든다."""
+    if not STATIC_EXPORT_DIR or not concert_id:
+        return
+
+    def run():
+        try:
+            export_concert(concert_id, STATIC_EXPORT_DIR)
+        except Exception as e:
+            logger.error(f"정적 내보내기 실패 - {concert_id}: {str(e)}")
+
+    threading.Thread(target=run, name=f"static-export:{concert_id}", daemon=True).start()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="공연 상세 정적 HTML 내보내기")
+    parser.add_argument("--out", default=STATIC_EXPORT_DIR or "public", help="내보낼 디렉터리")
+    parser.add_argument("--concert", nargs="*", help="이 공연들만 내보내기 (기본: 전체)")
+    args = parser.parse_args()
+
+    if args.concert:
+        for cid in args.concert:
+            export_concert(cid, args.out)
+    else:
+        print(f"{export_all(args.out)}개 파일 갱신: {args.out}")
@@ -1,5 +1,12 @@
 import os, streamlit as st
-from supabase import create_client, Client
+import threading
+import httpx
+from supabase import Client
+from supabase.lib.auth_client import SupabaseAuthClient
+from supabase.lib.client_options import ClientOptions
+from gotrue import SyncMemoryStorage
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,7 +15,90 @@ SUPABASE_URL         = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY    = os.getenv("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 
-@st.cache_resource(ttl=300)
+# 프로세스 전체가 공유하는 keep-alive 연결 수
+HTTP_POOL_SIZE = int(os.getenv("SUPABASE_HTTP_POOL_SIZE", "20"))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("SUPABASE_HTTP_KEEPALIVE_SECONDS", "60"))
+
+# 프로세스 공용 객체. 프리페치·워밍업·병렬 조회 스레드에서도 호출되므로
+# (ScriptRunContext 가 없는 스레드에서 경고를 남기는) st.cache_resource 대신 모듈에 보관한다.
+# 클라이언트 생성 중에 연결 풀을 만들므로 잠금을 따로 둔다 (같은 잠금을 다시 잡으면 멈춤).
+_lock = threading.Lock()
+_transport_lock = threading.Lock()
+_transport: httpx.HTTPTransport | None = None
+_clients: dict[bool, Client] = {}
+
+def _http_transport() -> httpx.HTTPTransport:
+    """
+    모든 Supabase 클라이언트(공용 조회용, 세션별 인증용)가 함께 쓰는 연결 풀.
+    클라이언트마다 TCP/TLS 연결을 새로 맺지 않고 keep-alive 연결을 재사용한다.
+    """
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = httpx.HTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=HTTP_POOL_SIZE,
+                        max_keepalive_connections=HTTP_POOL_SIZE,
+                        keepalive_expiry=HTTP_KEEPALIVE_SECONDS,
+                    )
+                )
+    return _transport
+
+class _PooledPostgrestClient(SyncPostgrestClient):
+    def create_session(self, base_url, headers, timeout) -> SyncClient:
+        return SyncClient(base_url=base_url, headers=headers, timeout=timeout, transport=_http_transport())
+
+def _auth_client(headers: dict) -> SupabaseAuthClient:
+    # 자동 갱신 타이머와 공유 기본 저장소(SyncMemoryStorage 기본 인자)를 쓰지 않는다
+    return SupabaseAuthClient(
+        url=f"{SUPABASE_URL}/auth/v1",
+        headers=headers,
+        auto_refresh_token=False,
+        persist_session=False,
+        storage=SyncMemoryStorage(),
+        http_client=SyncClient(transport=_http_transport()),
+    )
+
+class PooledClient(Client):
+    """HTTP 연결을 _http_transport() 풀에서 빌려 쓰는 Supabase 클라이언트."""
+
+    @staticmethod
+    def _init_supabase_auth_client(auth_url, client_options) -> SupabaseAuthClient:
+        return _auth_client(client_options.headers)
+
+    @staticmethod
+    def _init_postgrest_client(rest_url, supabase_key, headers, schema, timeout) -> SyncPostgrestClient:
+        client = _PooledPostgrestClient(rest_url, headers=headers, schema=schema, timeout=timeout)
+        client.auth(token=supabase_key)
+        return client
+
 def get_sb_client(use_service: bool = False) -> Client:
-    key = SUPABASE_SERVICE_KEY if use_service else SUPABASE_ANON_KEY
-    return create_client(SUPABASE_URL, key)
+    """
+    조회·저장용 공용 클라이언트 (프로세스당 키별 하나).
+    로그인 상태를 담지 않으므로 세션 간에 공유해도 안전하다. 로그인은 get_auth_client() 사용.
+    """
+    client = _clients.get(use_service)
+    if client is None:
+        _http_transport()
+        with _lock:
+            client = _clients.get(use_service)
+            if client is None:
+                key = SUPABASE_SERVICE_KEY if use_service else SUPABASE_ANON_KEY
+                # ClientOptions() 기본 인자는 헤더 dict 를 클라이언트끼리 공유하므로 새로 만든다
+                client = _clients[use_service] = PooledClient(SUPABASE_URL, key, ClientOptions())
+    return client
+
+def get_auth_client() -> SupabaseAuthClient:
+    """
+    현재 Streamlit 세션 전용 인증 클라이언트.
+    로그인·세션 복구가 다른 사용자의 인증 상태를 덮어쓰지 않도록 세션마다 따로 두고,
+    HTTP 연결만 공용 풀을 쓴다.
+    """
+    auth = st.session_state.get("sb_auth")
+    if auth is None:
+        auth = st.session_state["sb_auth"] = _auth_client({
+            "apiKey": SUPABASE_ANON_KEY,
+            "Authorization": f"Bearer {SUPABASE_ANON_KEY}",
+        })
+    return auth
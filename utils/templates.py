@@ -0,0 +1,16 @@
+# utils/templates.py
+from utils.data_backends import get_backend
+from utils.cache import cached, invalidate
+
+TEMPLATES_TTL = 600
+
+def get_prompt_templates() -> list[dict]:
+    """프롬프트 템플릿 전체 (공용 캐시)."""
+    return cached(
+        "templates",
+        lambda: get_backend().list_templates(),
+        ttl=TEMPLATES_TTL,
+    )
+
+def invalidate_templates() -> None:
+    invalidate("templates")
@@ -0,0 +1,89 @@
+# utils/warmup.py
+"""
+서버 시작 직후 캐시 데우기.
+
+배포 직후 첫 방문자들이 모든 페이지에서 빈 캐시 조회 비용을 치르지 않도록
+공연 목록 첫 페이지, 다가오는 공연 N개의 상세(곡·설명), 프롬프트 템플릿을 미리 읽는다.
+
+    - 페이지에서: start_warmup() — 프로세스당 한 번 백그라운드로 시작하고
+      프로세스의 첫 호출만 최대 WARMUP_BUDGET_SECONDS 만큼 기다린다.
+    - 배포 스크립트에서: python -m utils.warmup — 공용 캐시(L2)를 쓰는 경우
+      트래픽 전환 전에 미리 채울 수 있다.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import date
+import streamlit as st
+from utils.data_backends import get_backend
+from utils.concerts import (
+    list_concerts_page, get_concert, get_concert_tracks, get_track_descriptions,
+)
+from utils.templates import get_prompt_templates
+
+logger = logging.getLogger(__name__)
+
+# 상세까지 미리 읽을 다가오는 공연 수
+WARMUP_UPCOMING = int(os.getenv("WARMUP_UPCOMING_CONCERTS", "5"))
+
+# 첫 요청이 워밍업을 기다리는 최대 시간 (초). 넘으면 워밍업은 백그라운드에서 계속된다.
+WARMUP_BUDGET_SECONDS = float(os.getenv("WARMUP_BUDGET_SECONDS", "3"))
+
+def _timed(label: str, fn):
+    started = time.perf_counter()
+    try:
+        return fn()
+    except Exception as e:
+        logger.warning(f"워밍업 실패 - {label}: {str(e)}")
+        return None
+    finally:
+        logger.info(f"워밍업 {label}: {(time.perf_counter() - started) * 1000:.0f}ms")
+
+def warm_cache(upcoming: int = WARMUP_UPCOMING) -> None:
+    """캐시에 자주 쓰는 데이터를 미리 채운다. 개별 실패는 로그만 남기고 계속한다."""
+    started = time.perf_counter()
+
+    # 메인 페이지(날짜 오름차순)와 공연 보기(최신순) 첫 페이지
+    _timed("공연 목록 (메인)", lambda: list_concerts_page("date_asc"))
+    _timed("공연 목록 (공연 보기)", lambda: list_concerts_page("date_desc"))
+    _timed("프롬프트 템플릿", get_prompt_templates)
+
+    upcoming_concerts = _timed(
+        f"다가오는 공연 {upcoming}개 조회",
+        lambda: get_backend().upcoming_concerts(str(date.today()), upcoming),
+    ) or []
+
+    for concert in upcoming_concerts:
+        concert_id = concert["id"]
+
+        def warm_detail():
+            get_concert(concert_id)
+            for track in get_concert_tracks(concert_id):
+                get_track_descriptions(concert_id, track["id"])
+
+        _timed(f"공연 상세 {concert_id}", warm_detail)
+
+    logger.info(f"캐시 워밍업 완료: {(time.perf_counter() - started) * 1000:.0f}ms")
+
+@st.cache_resource(show_spinner=False)
+def _start_warmup_thread() -> dict:
+    thread = threading.Thread(target=warm_cache, name="cache-warmup", daemon=True)
+    thread.start()
+    # waited: 이미 한 번 기다렸는지 (이후 재실행·다른 세션은 기다리지 않는다)
+    return {"thread": thread, "waited": False}
+
+def start_warmup(budget: float = WARMUP_BUDGET_SECONDS) -> None:
+    """
+    프로세스당 한 번 워밍업을 시작하고, 프로세스의 첫 호출에서만 budget 초까지 기다린다.
+    매 재실행마다 호출되므로 이후 호출은 기다리지 않는다 (워밍업이 늦어지면 그 조회는 캐시 미스로 처리된다).
+    """
+    state = _start_warmup_thread()
+    if state["waited"]:
+        return
+    state["waited"] = True
+    state["thread"].join(timeout=budget)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    warm_cache()